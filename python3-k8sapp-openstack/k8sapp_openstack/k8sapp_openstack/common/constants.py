@@ -80,6 +80,41 @@ FLUXCD_HELMRELEASE_RABBITMQ = 'rabbitmq'
 FLUXCD_HELMRELEASE_SWIFT = 'ceph-rgw'
 FLUXCD_HELMRELEASE_DCDBSYNC = 'dcdbsync'
 
+# Dependencies each HelmRelease actually needs to be deployed, used instead of
+# the dependsOn chain of the manifests when the parallel HelmRelease waves are
+# enabled. The HelmReleases not listed keep the dependencies of the manifests.
+FLUXCD_HELMRELEASE_WAVE_DEPENDENCIES = {
+    FLUXCD_HELMRELEASE_KEYSTONE: [FLUXCD_HELMRELEASE_MARIADB,
+                                  FLUXCD_HELMRELEASE_MEMCACHED,
+                                  FLUXCD_HELMRELEASE_RABBITMQ],
+    FLUXCD_HELMRELEASE_BARBICAN: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_GLANCE: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_CINDER: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_SWIFT: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_DCDBSYNC: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_PLACEMENT: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_NOVA: [FLUXCD_HELMRELEASE_PLACEMENT,
+                              FLUXCD_HELMRELEASE_GLANCE,
+                              FLUXCD_HELMRELEASE_CINDER],
+    FLUXCD_HELMRELEASE_IRONIC: [FLUXCD_HELMRELEASE_GLANCE,
+                                FLUXCD_HELMRELEASE_NEUTRON],
+    FLUXCD_HELMRELEASE_HEAT: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_FM_REST_API: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_HORIZON: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_CLIENTS: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_GNOCCHI: [FLUXCD_HELMRELEASE_KEYSTONE],
+    FLUXCD_HELMRELEASE_CEILOMETER: [FLUXCD_HELMRELEASE_GNOCCHI,
+                                    FLUXCD_HELMRELEASE_NOVA,
+                                    FLUXCD_HELMRELEASE_NEUTRON],
+    FLUXCD_HELMRELEASE_AODH: [FLUXCD_HELMRELEASE_GNOCCHI],
+    FLUXCD_HELMRELEASE_PROMETHEUS_OPENSTACK_EXPORTER: [FLUXCD_HELMRELEASE_NOVA,
+                                                       FLUXCD_HELMRELEASE_NEUTRON],
+}
+# Duration, in seconds, assumed for the HelmReleases never deployed
+FLUXCD_HELMRELEASE_DEFAULT_DURATION = 120
+# Maximum number of HelmReleases reconciled at once when forcing a reconciliation
+FLUXCD_RECONCILIATION_MAX_WORKERS = 8
+
 # Nova PCI Alias types and names
 # NOTE: Generic GPU and QAT definitions reside in sysinv/common/constants.py
 # and are required by sysinv-agent and puppet for PCI devices inventory.
@@ -115,6 +150,12 @@ CEPH_ROOK_RBD_DRIVER = 'rook-ceph.rbd.csi.ceph.com'
 CEPH_RBD_SECRET_NAME = 'ceph-pool-kube-rbd'
 CEPH_RBD_DRIVER = 'rbd.csi.ceph.com'
 CEPH_RBD_SNAPSHOT_PREFIX = 'rbd-snap-'
+# Time, in seconds, to wait for PVC snapshots to be ready to use, and
+# between checks of their status
+PVC_SNAPSHOT_READY_TIMEOUT = 300
+PVC_SNAPSHOT_POLL_INTERVAL = 2
+# Time, in seconds, to wait for the PVCs restored from snapshots to be bound
+PVC_SNAPSHOT_RESTORE_TIMEOUT = 300
 
 CEPH_RBD_POOL_USER_CINDER = "cinder"
 CEPH_RBD_POOL_USER_GLANCE = 'images'
@@ -187,6 +228,16 @@ STRICT_BACKEND_NAMES = {
     NETAPP_FC_BACKEND_NAME,
 }
 
+# Time, in seconds, to wait for the strict backend availability probes
+# (NetApp discovery, Ceph fsid and Rook Ceph manager API), run concurrently
+STRICT_BACKEND_PROBE_TIMEOUT = 40
+
+# ConfigMap recording the pre-apply semantic checks that passed, with the
+# fingerprint of their inputs, so automatic reapplies can skip them. A pass
+# is only reused for SEMANTIC_CHECK_PASS_TTL seconds.
+SEMANTIC_CHECK_PASSES_CONFIGMAP = "stx-openstack-semantic-check-passes"
+SEMANTIC_CHECK_PASS_TTL = 3600
+
 NETAPP_BACKEND_TO_OPENSTACK_PROTOCOL = {
     NETAPP_NFS_BACKEND_NAME: NFS_OPENSTACK_PROTOCOL,
     NETAPP_ISCSI_BACKEND_NAME: NETAPP_ISCSI_OPENSTACK_PROTOCOL,
@@ -290,6 +341,23 @@ GLANCE_BACKEND_TO_IMAGE_STORE = {
     GLANCE_BACKEND_CINDER: GLANCE_IMAGE_STORE_CINDER,
 }
 
+# Residual image cleanup: number of images removed per crictl call, and time,
+# in seconds, to wait between calls
+IMAGE_CLEANUP_BATCH_SIZE = 20
+IMAGE_CLEANUP_BATCH_INTERVAL = 1
+# Cluster-wide residual image cleanup, run by a one-shot Job on each of the
+# other OpenStack nodes, opt-in as the Jobs remove images through the
+# container runtime of the hosts, with the crictl of the hosts. The Jobs are
+# given up on after the timeout, and removed by Kubernetes after the TTL
+# (both in seconds).
+CLUSTER_IMAGE_CLEANUP = False
+IMAGE_CLEANUP_NAME = "stx-openstack-image-cleanup"
+IMAGE_CLEANUP_HOST_CRICTL = "/usr/bin/crictl"
+IMAGE_CLEANUP_CRI_SOCKET = "/var/run/containerd/containerd.sock"
+IMAGE_CLEANUP_JOB_TIMEOUT = 1800
+IMAGE_CLEANUP_JOB_TTL = 3600
+IMAGE_CLEANUP_POLL_INTERVAL = 10
+
 # VM recovery
 NOVA_SERVER_ACTIVE = "ACTIVE"
 NOVA_SERVER_SHUTOFF = "SHUTOFF"
@@ -297,14 +365,43 @@ NOVA_SERVER_ERROR = "ERROR"
 NOVA_SERVER_SHELVED_OFFLOADED = "SHELVED_OFFLOADED"
 NOVA_SERVER_STATUS_TIMEOUT = 120
 NOVA_SERVER_STATUS_INTERVAL = 5
+# Margin, in seconds, of the changes-since filter of the server status polls,
+# against clock skew between the conductor and nova-api
+NOVA_CHANGES_SINCE_MARGIN = 30
 NOVA_SESSION_TIMEOUT = 10
 NOVA_RECOVERY_MAX_WORKERS = 4
+# Maximum number of servers recovered at once on a compute host and on a
+# storage backend, and number of attempts of each recovery action
+NOVA_RECOVERY_MAX_PER_HOST = 2
+NOVA_RECOVERY_MAX_PER_BACKEND = 8
+NOVA_RECOVERY_MAX_ATTEMPTS = 3
+# nova-api latency, in seconds, above which the recovery slows down: fewer
+# actions are sent at once and the status is polled less often, up to the
+# maximum interval
+NOVA_API_SLOW_LATENCY = 2
+NOVA_SERVER_STATUS_MAX_INTERVAL = 30
+NOVA_RECOVERY_JOURNAL_CONFIGMAP = "stx-openstack-vm-recovery"
+# Notification-driven VM recovery: the exchange nova publishes its
+# notifications to (the control_exchange of the nova chart), the topics
+# listened to (unversioned and versioned), the listener pool, whose queue
+# expires through the rabbitmq policy of the nova chart, and the interval,
+# in seconds, of the fallback status polls
+NOVA_NOTIFICATION_EXCHANGE = "nova"
+NOVA_NOTIFICATION_EXCHANGE_OVERRIDE = "conf.nova.DEFAULT.control_exchange"
+NOVA_NOTIFICATION_TOPICS = ("notifications", "versioned_notifications")
+NOVA_RECOVERY_NOTIFICATION_POOL = "stx-openstack-vm-recovery"
+NOVA_RECOVERY_FALLBACK_POLL_INTERVAL = 30
 NOVA_RECOVERY_ENABLED_OVERRIDE = "conf.vm_recovery.enabled"
 NOVA_RECOVERY_MAX_WORKERS_OVERRIDE = "conf.vm_recovery.max_workers"
+NOVA_RECOVERY_MAX_PER_HOST_OVERRIDE = "conf.vm_recovery.max_per_host"
+NOVA_RECOVERY_MAX_PER_BACKEND_OVERRIDE = "conf.vm_recovery.max_per_backend"
+NOVA_RECOVERY_NOTIFICATIONS_OVERRIDE = "conf.vm_recovery.notifications"
 NOVA_API_K8S_SERVICE = "nova-api"
 NOVA_API_K8S_PORT = 8774
 KEYSTONE_API_K8S_SERVICE = "keystone-api"
 KEYSTONE_API_K8S_PORT = 5000
+CINDER_API_K8S_SERVICE = "cinder-api"
+CINDER_API_K8S_PORT = 8776
 
 # Storage backends overrides
 OVERRIDE_STORAGE_BACKENDS = "storage_conf.storage_backends"
@@ -408,11 +505,14 @@ OPENSTACK_CERT = "openstack-cert"
 OPENSTACK_CERT_KEY = "openstack-cert-key"
 OPENSTACK_CERT_CA = "openstack-cert-ca"
 FORCE_READ_CERT_FILES = False
+KUBE_WATCH_CACHE = False
+PARALLEL_HELMRELEASE_WAVES = False
 SERVICES_FQDN_PATTERN = "{service_name}.{endpoint_domain}"
 OPENSTACK_NETAPP_NAMESPACE = "trident"
 
 # Kubernetes
 POD_SELECTOR_RUNNING = "status.phase==Running"
+HELM_RELEASE_SECRET_TYPE = "helm.sh/release.v1"
 
 # Vswitch type node labels
 OPENVSWITCH_LABEL = "openvswitch=enabled"
@@ -24,6 +24,7 @@ class AodhHelm(openstack.OpenstackBaseHelm):
     SERVICE_NAME = app_constants.HELM_CHART_AODH
     AUTH_USERS = ['aodh']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
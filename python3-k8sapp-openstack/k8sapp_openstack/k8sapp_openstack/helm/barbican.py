@@ -19,6 +19,7 @@ class BarbicanHelm(openstack.OpenstackBaseHelm):
     AUTH_USERS = ['barbican']
     SERVICE_NAME = app_constants.HELM_CHART_BARBICAN
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
@@ -23,6 +23,7 @@ class CeilometerHelm(openstack.OpenstackBaseHelm):
     SERVICE_NAME = app_constants.HELM_CHART_CEILOMETER
     AUTH_USERS = ['ceilometer']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
@@ -121,6 +121,7 @@ class CinderHelm(openstack.OpenstackBaseHelm):
 
         return overrides
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         # Create general Cinder overrides before checking
         # the configuration for the specific backends
@@ -29,6 +29,7 @@ class ClientsHelm(openstack.OpenstackBaseHelm):
     def __init__(self, operator):
         super(ClientsHelm, self).__init__(operator)
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         host_overrides = self._get_per_host_overrides()
 
@@ -90,7 +91,7 @@ class ClientsHelm(openstack.OpenstackBaseHelm):
 
     def _get_per_host_overrides(self):
         host_list = []
-        hosts = self.dbapi.ihost_get_list()
+        hosts = self._get_inventory().hosts
 
         for host in hosts:
             if (host.invprovision in [constants.PROVISIONED,
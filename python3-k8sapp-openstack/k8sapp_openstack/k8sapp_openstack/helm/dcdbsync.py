@@ -58,6 +58,7 @@ class DcdbsyncHelm(openstack.OpenstackBaseHelm):
                                 common.HELM_NS_OPENSTACK):
             operator.helm_release_resource_delete(self.CHART)
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
@@ -24,6 +24,7 @@ class FmRestApiHelm(openstack.OpenstackBaseHelm):
     SERVICE_NAME = app_constants.HELM_CHART_FM_REST_API
     AUTH_USERS = ['fm']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
 
         overrides = {
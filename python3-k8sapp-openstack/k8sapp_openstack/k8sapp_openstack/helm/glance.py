@@ -39,6 +39,7 @@ class GlanceHelm(openstack.OpenstackBaseHelm):
     SERVICE_TYPE = 'image'
     AUTH_USERS = ['glance']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         self._rook_ceph, _ = is_ceph_backend_available(
             ceph_type=constants.SB_TYPE_CEPH_ROOK
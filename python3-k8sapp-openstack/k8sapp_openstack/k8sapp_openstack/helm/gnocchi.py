@@ -23,6 +23,7 @@ class GnocchiHelm(openstack.OpenstackBaseHelm):
     SERVICE_NAME = app_constants.HELM_CHART_GNOCCHI
     AUTH_USERS = ['gnocchi']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         self._rook_ceph, _ = is_ceph_backend_available(ceph_type=constants.SB_TYPE_CEPH_ROOK)
 
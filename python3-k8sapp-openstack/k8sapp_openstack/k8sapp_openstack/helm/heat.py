@@ -20,6 +20,7 @@ class HeatHelm(openstack.OpenstackBaseHelm):
     SERVICE_NAME = app_constants.HELM_CHART_HEAT
     AUTH_USERS = ['heat', 'heat_trustee', 'heat_stack_user']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
@@ -30,6 +30,7 @@ class HorizonHelm(openstack.OpenstackBaseHelm):
 
     AUTH_USERS = ["admin"]
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
@@ -17,6 +17,7 @@ class IngressNginxOpenstackHelm(openstack.OpenstackBaseHelm):
     CHART = app_constants.HELM_CHART_INGRESS
     HELM_RELEASE = app_constants.FLUXCD_HELMRELEASE_INGRESS
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
 
         overrides = {
@@ -45,6 +45,7 @@ class IronicHelm(openstack.OpenstackBaseHelm):
                             common.HELM_NS_OPENSTACK):
             operator.helm_release_resource_delete(self.CHART)
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
@@ -103,7 +104,7 @@ class IronicHelm(openstack.OpenstackBaseHelm):
         Determine the port name of the underlying device.
         """
         assert iface['iftype'] == constants.INTERFACE_TYPE_ETHERNET
-        port = self.dbapi.port_get_by_interface(iface.id)
+        port = self._get_inventory().ports_by_ifaceid.get(iface.id)
         if port:
             return port[0]['name']
 
@@ -112,7 +113,7 @@ class IronicHelm(openstack.OpenstackBaseHelm):
         if self.dbapi is None:
             return ironic_port
         # find the first interface with ironic network type
-        interfaces = self.dbapi.iinterface_get_all()
+        interfaces = self._get_inventory().interfaces
         for iface in interfaces:
             for net_type in iface.networktypelist:
                 if net_type == constants.NETWORK_TYPE_IRONIC:
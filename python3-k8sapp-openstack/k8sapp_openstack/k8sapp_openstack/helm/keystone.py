@@ -35,6 +35,7 @@ class KeystoneHelm(openstack.OpenstackBaseHelm):
 
     DEFAULT_DOMAIN_NAME = 'default'
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
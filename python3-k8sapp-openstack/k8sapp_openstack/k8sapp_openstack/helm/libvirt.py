@@ -29,6 +29,7 @@ class LibvirtHelm(openstack.OpenstackBaseHelm):
     def __init__(self, operator):
         super(LibvirtHelm, self).__init__(operator)
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         nova_shares = self._get_instances_nfs_shares_config()
 
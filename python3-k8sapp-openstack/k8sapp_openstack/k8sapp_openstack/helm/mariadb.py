@@ -31,6 +31,7 @@ class MariadbHelm(openstack.OpenstackBaseHelm):
     def _num_server_replicas(self):
         return self._num_provisioned_controllers()
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
 
         available_backend = get_available_volume_backends(app_constants.HELM_CHART_MARIADB)
@@ -17,6 +17,7 @@ class MemcachedHelm(openstack.OpenstackBaseHelm):
     CHART = app_constants.HELM_CHART_MEMCACHED
     HELM_RELEASE = app_constants.FLUXCD_HELMRELEASE_MEMCACHED
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
@@ -45,6 +45,7 @@ class NeutronHelm(openstack.OpenstackBaseHelm):
             vswitch_labels = {app_constants.VSWITCH_LABEL_NONE}
         return list(vswitch_labels)
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         self.ports_by_ifaceid = self._get_interface_ports()
         self.labels_by_hostid = self._get_host_labels()
@@ -81,9 +82,8 @@ class NeutronHelm(openstack.OpenstackBaseHelm):
             return overrides
 
     def _get_per_host_overrides(self):
-        host_list = []
-        config_map = []
-        hosts = self.dbapi.ihost_get_list()
+        host_overrides = []
+        hosts = self._sorted_hosts(self._get_inventory().hosts)
 
         for host in hosts:
             host_labels = self.labels_by_hostid.get(host.id, [])
@@ -94,43 +94,21 @@ class NeutronHelm(openstack.OpenstackBaseHelm):
                 if (constants.WORKER in utils.get_personalities(host) and
                         utils.has_openstack_compute(host_labels)):
                     hostname = str(host.hostname)
-                    host_neutron = {
-                        'name': hostname,
-                        'conf': {
-                            'plugins': {
-                                'openvswitch_agent': self._get_dynamic_ovs_agent_config(host),
-                                'sriov_agent': self._get_dynamic_sriov_agent_config(host),
-                            }
+                    host_conf = {
+                        'plugins': {
+                            'openvswitch_agent': self._get_dynamic_ovs_agent_config(host),
+                            'sriov_agent': self._get_dynamic_sriov_agent_config(host),
                         }
                     }
                     # if ovs runs on host, auto bridge add is covered by sysinv
                     if (self.is_openvswitch_enabled() or self.is_openvswitch_dpdk_enabled()):
-                        host_neutron['conf'].update({
+                        host_conf.update({
                             'auto_bridge_add': self._get_host_bridges(host)})
 
-                    # add first host to config_map
-                    if not config_map:
-                        config_map.append({
-                            'conf': host_neutron['conf'],
-                            'name': [hostname]
-                        })
-                    else:
-                        # check if an identical configuration already exists in the config_map
-                        for config in config_map:
-                            if config['conf'] == host_neutron['conf']:
-                                config['name'].append(hostname)
-                                break
-                        else:
-                            # add new config to config_map
-                            config_map.append({
-                                'conf': host_neutron['conf'],
-                                'name': [hostname]
-                            })
-
-        for config in config_map:
-            host_list.append(config)
-
-        return host_list
+                    host_overrides.append((hostname, host_conf))
+
+        # group hosts with an identical configuration
+        return self._group_per_host_overrides(host_overrides)
 
     def _interface_sort_key(self, iface):
         """
@@ -261,7 +239,7 @@ class NeutronHelm(openstack.OpenstackBaseHelm):
 
     def _get_ml2_physical_network_mtus(self):
         ml2_physical_network_mtus = []
-        datanetworks = self.dbapi.datanetworks_get_all()
+        datanetworks = self._get_inventory().datanetworks
         for datanetwork in datanetworks:
             dn_str = str(datanetwork.name) + ":" + str(datanetwork.mtu)
             ml2_physical_network_mtus.append(dn_str)
@@ -270,7 +248,7 @@ class NeutronHelm(openstack.OpenstackBaseHelm):
 
     def _get_flat_networks(self):
         flat_nets = []
-        datanetworks = self.dbapi.datanetworks_get_all()
+        datanetworks = self._get_inventory().datanetworks
         for datanetwork in datanetworks:
             if datanetwork.network_type == constants.DATANETWORK_TYPE_FLAT:
                 flat_nets.append(str(datanetwork.name))
@@ -278,7 +256,7 @@ class NeutronHelm(openstack.OpenstackBaseHelm):
 
     def _get_vlan_networks(self):
         vlan_nets = []
-        datanetworks = self.dbapi.datanetworks_get_all()
+        datanetworks = self._get_inventory().datanetworks
         for datanetwork in datanetworks:
             if datanetwork.network_type == constants.DATANETWORK_TYPE_VLAN:
                 vlan_nets.append(str(datanetwork.name))
@@ -309,20 +287,15 @@ class NeutronHelm(openstack.OpenstackBaseHelm):
         """
         Builds a dictionary of ports indexed by interface id
         """
-        ports = {}
-        db_ports = self.dbapi.port_get_list()
-        for port in db_ports:
-            ports.setdefault(port.interface_id, []).append(port)
-        return ports
+        return self._get_inventory().ports_by_ifaceid
 
     def _get_interface_port_name(self, host, iface):
         """
         Determine the port name of the underlying device.
         """
         if (iface['iftype'] == constants.INTERFACE_TYPE_VF and iface['uses']):
-            for i in self.interfaces_by_hostid.get(host.id, []):
-                if i.ifname == iface['uses'][0]:
-                    lower_iface = i
+            lower_iface = self._get_inventory().interfaces_by_ifname.get(
+                (host.id, iface['uses'][0]))
             if lower_iface:
                 return self._get_interface_port_name(host, lower_iface)
         if iface['iftype'] == constants.INTERFACE_TYPE_VLAN:
@@ -415,7 +388,7 @@ class NeutronHelm(openstack.OpenstackBaseHelm):
             return 2
 
         compute_count = 0
-        hosts = self.dbapi.ihost_get_list()
+        hosts = self._get_inventory().hosts
         for host in hosts:
             host_labels = self.labels_by_hostid.get(host.id, [])
             if (host.invprovision in [constants.PROVISIONED,
@@ -18,6 +18,7 @@ class NginxPortsControlHelm(openstack.OpenstackBaseHelm):
     CHART = app_constants.HELM_CHART_NGINX_PORTS_CONTROL
     HELM_RELEASE = app_constants.FLUXCD_HELMRELEASE_NGINX_PORTS_CONTROL
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
@@ -59,6 +59,7 @@ class NovaHelm(openstack.OpenstackBaseHelm):
         self.rbd_config = {}
         self.nova_ephemeral_ceph_enabled = False
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         pvc_resolution = self._resolve_nova_pvc_overrides()
         self.nova_ephemeral_ceph_enabled = is_nova_ephemeral_ceph_enabled()
@@ -658,31 +659,19 @@ class NovaHelm(openstack.OpenstackBaseHelm):
         """
         Builds a dictionary of ethernet ports indexed by host id
         """
-        ethernet_ports = {}
-        db_ethernet_ports = self.dbapi.ethernet_port_get_list()
-        for port in db_ethernet_ports:
-            ethernet_ports.setdefault(port.host_id, []).append(port)
-        return ethernet_ports
+        return self._get_inventory().ethernet_ports_by_hostid
 
     def _get_host_imemory(self):
         """
         Builds a dictionary of memory indexed by host id
         """
-        memory = {}
-        db_memory = self.dbapi.imemory_get_list()
-        for m in db_memory:
-            memory.setdefault(m.forihostid, []).append(m)
-        return memory
+        return self._get_inventory().memory_by_hostid
 
     def _get_host_cpus(self):
         """
         Builds a dictionary of cpus indexed by host id
         """
-        cpus = {}
-        db_cpus = self.dbapi.icpu_get_list()
-        for cpu in db_cpus:
-            cpus.setdefault(cpu.forihostid, []).append(cpu)
-        return cpus
+        return self._get_inventory().cpus_by_hostid
 
     def _get_host_cpu_list(self, host, function=None, threads=False):
         """
@@ -727,16 +716,11 @@ class NovaHelm(openstack.OpenstackBaseHelm):
         """
         Builds a dictionary of datanetworks indexed by datanetwork uuid
         """
-        datanets = {}
-        db_datanets = self.dbapi.datanetworks_get_all()
-        for datanet in db_datanets:
-            datanets.update({datanet.uuid: datanet})
-        return datanets
+        return self._get_inventory().datanets_by_uuid
 
     def _get_per_host_overrides(self):
-        host_list = []
-        config_map = []
-        hosts = self.dbapi.ihost_get_list()
+        host_overrides = []
+        hosts = self._sorted_hosts(self._get_inventory().hosts)
 
         for host in hosts:
             host_labels = self.labels_by_hostid.get(host.id, [])
@@ -756,37 +740,18 @@ class NovaHelm(openstack.OpenstackBaseHelm):
                     self._update_host_storage(host, default_config, libvirt_config)
                     self._update_host_pci_whitelist(host, pci_config)
                     self._update_reserved_memory(host, default_config)
-                    host_nova = {
-                        'name': hostname,
-                        'conf': {
-                            'nova': {
-                                'DEFAULT': default_config,
-                                'compute': compute_config if compute_config else None,
-                                'libvirt': libvirt_config,
-                                'pci': pci_config if pci_config else None,
-                            }
+                    host_conf = {
+                        'nova': {
+                            'DEFAULT': default_config,
+                            'compute': compute_config if compute_config else None,
+                            'libvirt': libvirt_config,
+                            'pci': pci_config if pci_config else None,
                         }
                     }
-                    # add first host to config_map
-                    if not config_map:
-                        config_map.append({
-                            'conf': host_nova['conf'],
-                            'name': [hostname]
-                        })
-                    else:
-                        # check if an identical configuration already exists in the config_map
-                        for config in config_map:
-                            if config['conf'] == host_nova['conf']:
-                                config['name'].append(hostname)
-                                break
-                        else:
-                            # add new config to config_map
-                            config_map.append({
-                                'conf': host_nova['conf'],
-                                'name': [hostname]
-                            })
-        host_list.extend(config_map)
-        return host_list
+                    host_overrides.append((hostname, host_conf))
+
+        # group hosts with an identical configuration
+        return self._group_per_host_overrides(host_overrides)
 
     def get_region_name(self):
         return self._get_service_region_name(self.SERVICE_NAME)
@@ -23,6 +23,7 @@ class NovaApiProxyHelm(openstack.OpenstackBaseHelm):
     AUTH_USERS = ['nova']
     SERVICE_USERS = ['neutron', 'placement']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
 
         overrides = {
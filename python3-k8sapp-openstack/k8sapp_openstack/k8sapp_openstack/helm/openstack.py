@@ -5,6 +5,7 @@
 #
 
 import base64
+import functools
 # Adding a try-import as six 1.12.0 doesn't have this move and we are pinned
 # at the stein upper-requirements on tox.ini
 try:
@@ -29,6 +30,7 @@ from sysinv.helm import common
 
 from k8sapp_openstack import utils as app_utils
 from k8sapp_openstack.common import constants as app_constants
+from k8sapp_openstack.helpers import inventory
 from k8sapp_openstack.utils import get_enabled_storage_backends_from_override
 from k8sapp_openstack.utils import get_nova_nfs_share
 from k8sapp_openstack.utils import get_storage_backends_priority_list
@@ -59,6 +61,33 @@ class FluxCDBaseHelm(base.FluxCDBaseHelm):
     }
 
 
+def apply_scoped(func):
+    """Run a chart plugin method inside the utils apply scope.
+
+    The scope is backed by the per-pass helm context, so the data cached by
+    the utils helpers lives as long as the override generation pass, even
+    when the pass runs inside the apply scope of a lifecycle hook. The
+    passwords generated by the method are stored when it returns, unless it
+    was called by another method of the same scope.
+    """
+    @functools.wraps(func)
+    def _wrapper(self, *args, **kwargs):
+        try:
+            cache = self.context.setdefault('_apply_cache', {})
+        except AttributeError:
+            # No helm context outside of an override generation pass
+            cache = None
+        outermost = not app_utils.in_apply_scope(cache)
+        with app_utils.apply_scope(cache):
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                # Persist the passwords generated by the call
+                if outermost:
+                    self._flush_generated_passwords()
+    return _wrapper
+
+
 class OpenstackBaseHelm(FluxCDBaseHelm):
     """Class to encapsulate Openstack service operations for helm"""
 
@@ -204,6 +233,25 @@ class OpenstackBaseHelm(FluxCDBaseHelm):
                 return service_config.capabilities.get(stype)
         return None
 
+    @staticmethod
+    def _get_password_ledger():
+        # Helm override rows with passwords pending to be stored, keyed by
+        # (app id, chart, namespace)
+        with app_utils.apply_scope() as cache:
+            return cache.setdefault('_password_ledger', {})
+
+    def _flush_generated_passwords(self):
+        ledger = self._get_password_ledger()
+        while ledger:
+            (app_id, chart, namespace), override = ledger.popitem()
+            values = {'system_overrides': override.system_overrides}
+            try:
+                self.dbapi.helm_override_update(
+                    app_id=app_id, name=chart, namespace=namespace, values=values)
+            except Exception as e:
+                LOG.exception(e)
+
+    @apply_scoped
     def _get_or_generate_password(self, chart, namespace, field):
         # Get password from the db for the specified chart overrides
         if not self.dbapi:
@@ -211,9 +259,8 @@ class OpenstackBaseHelm(FluxCDBaseHelm):
 
         try:
             app = utils.find_openstack_app(self.dbapi)
-            override = self.dbapi.helm_override_get(app_id=app.id,
-                                                    name=chart,
-                                                    namespace=namespace)
+            override = app_utils.get_app_helm_override(
+                self.dbapi, app.id, chart, namespace)
         except exception.HelmOverrideNotFound:
             # Override for this chart not found, so create one
             try:
@@ -226,6 +273,7 @@ class OpenstackBaseHelm(FluxCDBaseHelm):
             except Exception as e:
                 LOG.exception(e)
                 return None
+            app_utils.get_app_helm_overrides(self.dbapi, app.id)[(chart, namespace)] = override
 
         password = override.system_overrides.get(field, None)
         if password:
@@ -233,28 +281,25 @@ class OpenstackBaseHelm(FluxCDBaseHelm):
 
         # The password is not present, dump from inactive app if available,
         # otherwise generate one and store it to the override
-        try:
-            openstack_app = utils.find_openstack_app(self.dbapi)
-            inactive_apps = self.dbapi.kube_app_get_inactive(openstack_app.name)
-            app_override = self.dbapi.helm_override_get(app_id=inactive_apps[0].id,
-                                                        name=chart,
-                                                        namespace=namespace)
-            password = app_override.system_overrides.get(field, None)
-        except (IndexError, exception.HelmOverrideNotFound):
-            # No inactive app or no overrides for the inactive app
-            pass
+        inactive_app = app_utils.get_inactive_openstack_app(self.dbapi)
+        if inactive_app is not None:
+            try:
+                app_override = app_utils.get_app_helm_override(
+                    self.dbapi, inactive_app.id, chart, namespace)
+                password = app_override.system_overrides.get(field, None)
+            except exception.HelmOverrideNotFound:
+                # No overrides for the inactive app
+                pass
 
         if not password:
             password = self._generate_random_password()
-        values = {'system_overrides': override.system_overrides}
-        values['system_overrides'].update({
+        override.system_overrides.update({
             field: password,
         })
-        try:
-            self.dbapi.helm_override_update(
-                app_id=app.id, name=chart, namespace=namespace, values=values)
-        except Exception as e:
-            LOG.exception(e)
+
+        # The override is stored once per chart, when the outermost plugin
+        # call (e.g. get_overrides) returns.
+        self._get_password_ledger()[(app.id, chart, namespace)] = override
 
         return password.encode('utf8', 'strict')
 
@@ -714,39 +759,45 @@ class OpenstackBaseHelm(FluxCDBaseHelm):
             'user_secret_name': constants.K8S_RBD_PROV_ADMIN_SECRET_NAME
         }
 
+    def _get_inventory(self):
+        """
+        Returns the system inventory snapshot shared by the chart plugins
+        during an override generation pass
+        """
+        # Outside of a plugin call (e.g. get_overrides), read fresh data
+        if not app_utils.in_apply_scope():
+            return inventory.InventorySnapshot(self.dbapi)
+
+        with app_utils.apply_scope() as cache:
+            snapshot = cache.get('_inventory')
+            if snapshot is None or snapshot.dbapi is not self.dbapi:
+                snapshot = inventory.InventorySnapshot(self.dbapi)
+                cache['_inventory'] = snapshot
+        return snapshot
+
     def _get_interface_datanets(self):
         """
         Builds a dictionary of interface datanetworks indexed by interface id
         """
-        ifdatanets = {}
-        db_ifdatanets = self.dbapi.interface_datanetwork_get_all()
-        for ifdatanet in db_ifdatanets:
-            ifdatanets.setdefault(ifdatanet.interface_id, []).append(ifdatanet)
-        return ifdatanets
+        return self._get_inventory().ifdatanets_by_ifaceid
 
     def _get_host_interfaces(self, sort_key=None):
         """
         Builds a dictionary of interfaces indexed by host id
         """
-        interfaces = {}
-        db_interfaces = self.dbapi.iinterface_get_list()
+        interfaces = self._get_inventory().interfaces_by_hostid
         if sort_key:
-            db_interfaces = sorted(db_interfaces, key=sort_key)
-
-        for iface in db_interfaces:
-            interfaces.setdefault(iface.forihostid, []).append(iface)
+            interfaces = {
+                host_id: sorted(ifaces, key=sort_key)
+                for host_id, ifaces in interfaces.items()
+            }
         return interfaces
 
     def _get_interface_networks(self):
         """
         Builds a dictionary of interface networks indexed by interface id
         """
-        interface_networks = {}
-
-        db_interface_networks = self.dbapi.interface_network_get_all()
-        for iface_net in db_interface_networks:
-            interface_networks.setdefault(iface_net.interface_id, []).append(iface_net)
-        return interface_networks
+        return self._get_inventory().interface_networks_by_ifaceid
 
     def _get_interface_network_query(self, interface_id, network_id):
         """
@@ -800,34 +851,49 @@ class OpenstackBaseHelm(FluxCDBaseHelm):
         LOG.debug("Host: {} Host IP: {}".format(host.id, cluster_host_ip))
         return cluster_host_ip
 
+    @staticmethod
+    def _group_per_host_overrides(host_overrides):
+        """
+        Groups the hosts sharing an identical configuration
+
+        Configurations are compared through their canonical serialization,
+        so grouping is a single pass over the hosts. Groups are ordered by
+        the position of their first host, and the hosts of a group keep the
+        order in which they are supplied.
+
+        :param host_overrides: iterable of (hostname, conf) tuples
+        :returns: list of dicts with the 'conf' and the list of host 'name'
+        """
+        config_map = {}
+        for hostname, conf in host_overrides:
+            key = jsonutils.dumps(conf, sort_keys=True)
+            if key in config_map:
+                config_map[key]['name'].append(hostname)
+            else:
+                config_map[key] = {
+                    'conf': conf,
+                    'name': [hostname]
+                }
+        return list(config_map.values())
+
+    @staticmethod
+    def _sorted_hosts(hosts):
+        """
+        Returns the hosts ordered by id, so per host overrides are stable
+        """
+        return sorted(hosts, key=lambda host: host.id)
+
     def _get_host_labels(self):
         """
         Builds a dictionary of labels indexed by host id
         """
-        labels = {}
-        db_labels = self.dbapi.label_get_all()
-        for label in db_labels:
-            labels.setdefault(label.host_id, []).append(label)
-        return labels
+        return self._get_inventory().labels_by_hostid
 
     def _get_host_addresses(self):
         """
         Builds a dictionary of addresses indexed by host id
         """
-        if '_host_addresses' in self.context:
-            return self.context['_host_addresses']
-
-        addresses = {}
-        db_addresses = self.dbapi.addresses_get_all()
-        db_interfaces = self.dbapi.iinterface_get_list()
-        iface_by_id = {iface.id: iface for iface in db_interfaces}
-        for addr in db_addresses:
-            iface = iface_by_id.get(addr.interface_id)
-            if iface:
-                addresses.setdefault(iface.forihostid, []).append(addr)
-
-        self.context['_host_addresses'] = addresses
-        return addresses
+        return self._get_inventory().addresses_by_hostid
 
     def execute_kustomize_updates(self, operator):
         """
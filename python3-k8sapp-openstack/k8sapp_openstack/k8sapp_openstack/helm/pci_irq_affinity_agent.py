@@ -25,6 +25,7 @@ class PciIrqAffinityAgentHelm(openstack.OpenstackBaseHelm):
     def __init__(self, operator):
         super(PciIrqAffinityAgentHelm, self).__init__(operator)
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
@@ -21,6 +21,7 @@ class PlacementHelm(openstack.OpenstackBaseHelm):
     SERVICE_NAME = app_constants.HELM_CHART_PLACEMENT
     AUTH_USERS = ['placement']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
 
         overrides = {
@@ -20,6 +20,7 @@ class PrometheusOpenstackExporterHelm(openstack.OpenstackBaseHelm):
     SERVICE_NAME = app_constants.HELM_CHART_PROMETHEUS_OPENSTACK_EXPORTER
     AUTH_USERS = ['user']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
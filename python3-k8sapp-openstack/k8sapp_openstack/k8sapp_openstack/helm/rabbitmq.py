@@ -24,6 +24,7 @@ class RabbitmqHelm(openstack.OpenstackBaseHelm):
     CHART = app_constants.HELM_CHART_RABBITMQ
     HELM_RELEASE = app_constants.FLUXCD_HELMRELEASE_RABBITMQ
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         limit_enabled, limit_cpus, limit_mem_mib = self._get_platform_res_limit()
 
@@ -23,6 +23,7 @@ class SwiftHelm(openstack.OpenstackBaseHelm):
     SERVICE_TYPE = 'object-store'
     AUTH_USERS = ['swift']
 
+    @openstack.apply_scoped
     def get_overrides(self, namespace=None):
         overrides = {
             common.HELM_NS_OPENSTACK: {
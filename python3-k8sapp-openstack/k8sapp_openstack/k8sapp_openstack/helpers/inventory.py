@@ -0,0 +1,128 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import functools
+import types
+
+
+def _group_by(rows, key) -> types.MappingProxyType:
+    """Group database rows by a key into a read-only mapping of tuples.
+
+    :param rows: The database rows.
+    :param key: Function returning the key of a row.
+    :returns: MappingProxyType -- Tuple of rows indexed by key.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(key(row), []).append(row)
+    return types.MappingProxyType(
+        {k: tuple(v) for k, v in groups.items()})
+
+
+def _index_by(rows, key) -> types.MappingProxyType:
+    """Index database rows by a unique key into a read-only mapping.
+
+    :param rows: The database rows.
+    :param key: Function returning the key of a row.
+    :returns: MappingProxyType -- Row indexed by key.
+    """
+    return types.MappingProxyType({key(row): row for row in rows})
+
+
+class InventorySnapshot(object):
+    """Read-only snapshot of the system inventory.
+
+    Each inventory table is read from the database at most once per
+    snapshot, the first time one of its indexes is used. Indexes are
+    read-only mappings of tuples, so a single snapshot can be shared by all
+    the chart plugins of an override generation pass.
+    """
+
+    def __init__(self, dbapi):
+        self.dbapi = dbapi
+
+    # Hosts
+
+    @functools.cached_property
+    def hosts(self) -> tuple:
+        return tuple(self.dbapi.ihost_get_list())
+
+    @functools.cached_property
+    def hosts_by_id(self) -> types.MappingProxyType:
+        return _index_by(self.hosts, lambda host: host.id)
+
+    @functools.cached_property
+    def labels_by_hostid(self) -> types.MappingProxyType:
+        return _group_by(self.dbapi.label_get_all(),
+                         lambda label: label.host_id)
+
+    @functools.cached_property
+    def cpus_by_hostid(self) -> types.MappingProxyType:
+        return _group_by(self.dbapi.icpu_get_list(),
+                         lambda cpu: cpu.forihostid)
+
+    @functools.cached_property
+    def memory_by_hostid(self) -> types.MappingProxyType:
+        return _group_by(self.dbapi.imemory_get_list(),
+                         lambda memory: memory.forihostid)
+
+    @functools.cached_property
+    def ethernet_ports_by_hostid(self) -> types.MappingProxyType:
+        return _group_by(self.dbapi.ethernet_port_get_list(),
+                         lambda port: port.host_id)
+
+    # Interfaces
+
+    @functools.cached_property
+    def interfaces(self) -> tuple:
+        return tuple(self.dbapi.iinterface_get_list())
+
+    @functools.cached_property
+    def interfaces_by_id(self) -> types.MappingProxyType:
+        return _index_by(self.interfaces, lambda iface: iface.id)
+
+    @functools.cached_property
+    def interfaces_by_hostid(self) -> types.MappingProxyType:
+        return _group_by(self.interfaces, lambda iface: iface.forihostid)
+
+    @functools.cached_property
+    def interfaces_by_ifname(self) -> types.MappingProxyType:
+        """Interfaces indexed by (host id, interface name)."""
+        return _index_by(self.interfaces,
+                         lambda iface: (iface.forihostid, iface.ifname))
+
+    @functools.cached_property
+    def interface_networks_by_ifaceid(self) -> types.MappingProxyType:
+        return _group_by(self.dbapi.interface_network_get_all(),
+                         lambda iface_net: iface_net.interface_id)
+
+    @functools.cached_property
+    def ifdatanets_by_ifaceid(self) -> types.MappingProxyType:
+        return _group_by(self.dbapi.interface_datanetwork_get_all(),
+                         lambda ifdatanet: ifdatanet.interface_id)
+
+    @functools.cached_property
+    def ports_by_ifaceid(self) -> types.MappingProxyType:
+        return _group_by(self.dbapi.port_get_list(),
+                         lambda port: port.interface_id)
+
+    # Addresses and networks
+
+    @functools.cached_property
+    def addresses_by_hostid(self) -> types.MappingProxyType:
+        addresses = [addr for addr in self.dbapi.addresses_get_all()
+                     if self.interfaces_by_id.get(addr.interface_id)]
+        return _group_by(
+            addresses,
+            lambda addr: self.interfaces_by_id[addr.interface_id].forihostid)
+
+    @functools.cached_property
+    def datanetworks(self) -> tuple:
+        return tuple(self.dbapi.datanetworks_get_all())
+
+    @functools.cached_property
+    def datanets_by_uuid(self) -> types.MappingProxyType:
+        return _index_by(self.datanetworks, lambda datanet: datanet.uuid)
@@ -0,0 +1,272 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import copy
+import threading
+
+from kubernetes.client.rest import ApiException
+from oslo_log import log as logging
+
+from k8sapp_openstack.helpers import kube_client
+
+LOG = logging.getLogger(__name__)
+
+# Time, in seconds, to wait before listing the objects again after a failure.
+# It doubles on each consecutive failure, up to the maximum.
+RETRY_INTERVAL = 5
+MAX_RETRY_INTERVAL = 300
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class ResourceWatchCache(object):
+    """In-memory copy of the objects of a Kubernetes resource.
+
+    Like a client-go informer, the objects are listed once and then kept
+    current by a watch started from the resourceVersion of the list. When
+    the watch ends it is resumed from the last resourceVersion seen, and the
+    objects are listed again when that resourceVersion is too old (410 Gone)
+    or the watch fails.
+
+    The objects are only served while the cache is synced, i.e. between a
+    successful list and the next failure.
+    """
+
+    def __init__(self, resource: str, namespace: str = None,
+                 field_selector: str = None):
+        """Constructor
+
+        Args:
+            resource (str): The resource, as named by kube_client (e.g.,
+                            "storageclass" or "secret").
+            namespace (str): The namespace of the objects. All the namespaces
+                             if None, for namespaced resources.
+            field_selector (str): Only keep the objects matching this selector.
+        """
+        self.resource = resource
+        self.namespace = namespace
+        self.field_selector = field_selector
+        self.resource_version = None
+        self._objects = {}
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __repr__(self):
+        where = f" in '{self.namespace}'" if self.namespace else ""
+        return f"<{self.__class__.__name__} {self.resource}{where}>"
+
+    def is_synced(self) -> bool:
+        """Check if the cached objects are current."""
+        return self._synced.is_set()
+
+    def wait_synced(self, timeout: float = None) -> bool:
+        """Wait for the objects to be listed.
+
+        Args:
+            timeout (float): Time, in seconds, to wait. Forever if None.
+
+        Returns:
+            bool: True if the cache is synced; False otherwise.
+        """
+        return self._synced.wait(timeout)
+
+    def start(self):
+        """Start listing and watching the objects, in the background."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name=repr(self),
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop watching the objects. They are no longer served."""
+        self._stopped.set()
+        self._synced.clear()
+
+    def get(self, name: str) -> dict:
+        """Get a cached object.
+
+        Args:
+            name (str): The name of the object.
+
+        Returns:
+            dict: A copy of the object, or None if it does not exist.
+        """
+        with self._lock:
+            obj = self._objects.get(name)
+        return copy.deepcopy(obj)
+
+    def list(self) -> list[dict]:
+        """List the cached objects.
+
+        Returns:
+            list[dict]: A copy of the objects, sorted by name.
+        """
+        with self._lock:
+            items = [self._objects[name] for name in sorted(self._objects)]
+        return copy.deepcopy(items)
+
+    def _run(self):
+        retry_interval = RETRY_INTERVAL
+        while not self._stopped.is_set():
+            try:
+                self._list()
+                retry_interval = RETRY_INTERVAL
+                while not self._stopped.is_set() and self._watch():
+                    pass
+            except Exception as e:
+                self._synced.clear()
+                LOG.warning(f"Failed to watch {self!r}, listing again in "
+                            f"{retry_interval} seconds: {e}")
+                self._stopped.wait(retry_interval)
+                retry_interval = min(retry_interval * 2, MAX_RETRY_INTERVAL)
+        self._synced.clear()
+
+    def _list(self):
+        response = kube_client.list_collection(self.resource,
+                                               namespace=self.namespace,
+                                               field_selector=self.field_selector)
+        objects = {item["metadata"]["name"]: item
+                   for item in response.get("items") or []}
+        with self._lock:
+            self._objects = objects
+            self.resource_version = (response.get("metadata") or {}).get("resourceVersion")
+        if not self._stopped.is_set():
+            self._synced.set()
+
+    def _watch(self) -> bool:
+        """Apply the events of one watch to the cached objects.
+
+        Returns:
+            bool: False if the objects must be listed again; True if the
+            watch can be resumed.
+
+        Raises:
+            Exception: If the watch fails.
+        """
+        try:
+            events = kube_client.watch(self.resource, self.resource_version,
+                                       namespace=self.namespace,
+                                       field_selector=self.field_selector)
+            for event in events:
+                if self._stopped.is_set():
+                    events.close()
+                    return False
+                event_type = event.get("type")
+                obj = event.get("object") or {}
+                metadata = obj.get("metadata") or {}
+                with self._lock:
+                    if event_type in ("ADDED", "MODIFIED"):
+                        self._objects[metadata["name"]] = obj
+                    elif event_type == "DELETED":
+                        self._objects.pop(metadata["name"], None)
+                    if metadata.get("resourceVersion"):
+                        self.resource_version = metadata["resourceVersion"]
+        except ApiException as e:
+            if e.status == 410:
+                LOG.debug(f"The resourceVersion of {self!r} expired")
+                return False
+            raise
+        return True
+
+
+def start(resource: str, namespace: str = None,
+          field_selector: str = None) -> ResourceWatchCache:
+    """Start caching the objects of a resource, once per process.
+
+    Args:
+        resource (str): The resource, as named by kube_client (e.g.,
+                        "storageclass" or "secret").
+        namespace (str): The namespace of the objects. All the namespaces if
+                         None, for namespaced resources.
+        field_selector (str): Only cache the objects matching this selector.
+                              Objects outside of it are reported as missing.
+
+    Returns:
+        ResourceWatchCache: The cache of the resource.
+    """
+    with _caches_lock:
+        cache = _caches.get((resource, namespace))
+        if cache is None:
+            cache = ResourceWatchCache(resource, namespace=namespace,
+                                       field_selector=field_selector)
+            _caches[(resource, namespace)] = cache
+    cache.start()
+    return cache
+
+
+def stop_all():
+    """Stop and forget all the caches."""
+    with _caches_lock:
+        caches = list(_caches.values())
+        _caches.clear()
+    for cache in caches:
+        cache.stop()
+
+
+def get_cache(resource: str, namespace: str = None) -> ResourceWatchCache:
+    """Get the cache of a resource, if it can serve reads.
+
+    Args:
+        resource (str): The resource, as named by kube_client (e.g.,
+                        "storageclass" or "secret").
+        namespace (str): The namespace of the objects.
+
+    Returns:
+        ResourceWatchCache: The cache, or None if the resource is not watched
+        or its cache is not synced.
+    """
+    cache = _caches.get((resource, namespace))
+    if cache is None or not cache.is_synced():
+        return None
+    return cache
+
+
+def get(resource: str, name: str, namespace: str = None) -> dict:
+    """Get a Kubernetes object, from the cache when it is synced.
+
+    Args:
+        resource (str): The resource, as named by kube_client (e.g.,
+                        "storageclass" or "secret").
+        name (str): The name of the object.
+        namespace (str): The namespace of the object.
+
+    Returns:
+        dict: The object, or None if it does not exist.
+
+    Raises:
+        ApiException: If the object cannot be read from the API server.
+    """
+    cache = get_cache(resource, namespace)
+    if cache is None:
+        return kube_client.get(resource, name, namespace=namespace,
+                               ignore_not_found=True)
+    return cache.get(name)
+
+
+def list_items(resource: str, namespace: str = None) -> list[dict]:
+    """List Kubernetes objects, from the cache when it is synced.
+
+    Args:
+        resource (str): The resource, as named by kube_client (e.g.,
+                        "storageclass" or "secret").
+        namespace (str): The namespace of the objects.
+
+    Returns:
+        list[dict]: The objects.
+
+    Raises:
+        ApiException: If the objects cannot be listed from the API server.
+    """
+    cache = get_cache(resource, namespace)
+    if cache is None:
+        return kube_client.list_items(resource, namespace=namespace)
+    return cache.list()
@@ -0,0 +1,404 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import json
+import threading
+import time
+
+from kubernetes import client
+from kubernetes import config as kube_config
+from kubernetes import watch as kube_watch
+from kubernetes.client.rest import ApiException
+from oslo_log import log as logging
+from sysinv.common import kubernetes
+
+LOG = logging.getLogger(__name__)
+
+# Time, in seconds, to wait for a response of the Kubernetes API server
+REQUEST_TIMEOUT = 60
+
+# Time, in seconds, after which the API server ends a watch
+WATCH_TIMEOUT = 300
+
+# Time, in seconds, to wait for a deleted resource to be gone
+DELETE_TIMEOUT = 600
+DELETE_POLL_INTERVAL = 1
+
+# Built-in resources used by the application, by their kubectl name:
+# (API class, model name used in the method names of the API, namespaced)
+BUILTIN_RESOURCES = {
+    "configmap": (client.CoreV1Api, "config_map", True),
+    "job": (client.BatchV1Api, "job", True),
+    "namespace": (client.CoreV1Api, "namespace", False),
+    "node": (client.CoreV1Api, "node", False),
+    "pod": (client.CoreV1Api, "pod", True),
+    "pvc": (client.CoreV1Api, "persistent_volume_claim", True),
+    "secret": (client.CoreV1Api, "secret", True),
+    "statefulset": (client.AppsV1Api, "stateful_set", True),
+    "storageclass": (client.StorageV1Api, "storage_class", False),
+}
+
+# Custom resources used by the application, by their kubectl name:
+# (group, version, plural, namespaced)
+CUSTOM_RESOURCES = {
+    "helmrelease": ("helm.toolkit.fluxcd.io", "v2", "helmreleases", True),
+    "host": ("starlingx.windriver.com", "v1", "hosts", True),
+    "tridentbackend": ("trident.netapp.io", "v1", "tridentbackends", True),
+    "tridentbackendconfig": ("trident.netapp.io", "v1", "tridentbackendconfigs", True),
+    "volumesnapshot": ("snapshot.storage.k8s.io", "v1", "volumesnapshots", True),
+    "volumesnapshotclass": ("snapshot.storage.k8s.io", "v1", "volumesnapshotclasses", False),
+}
+
+_api_client = None
+_api_client_lock = threading.Lock()
+
+
+def get_api_client() -> client.ApiClient:
+    """Get the Kubernetes API client shared by the application.
+
+    The client is created once per process from the admin kubeconfig, the
+    one the KubeOperator of sysinv loads. Its connection pool keeps the
+    connections to the API server open, so requests don't pay the TLS
+    handshake again.
+
+    Returns:
+        client.ApiClient: The shared Kubernetes API client.
+    """
+    global _api_client
+    with _api_client_lock:
+        if _api_client is None:
+            _api_client = kube_config.new_client_from_config(
+                config_file=kubernetes.KUBERNETES_ADMIN_CONF)
+        return _api_client
+
+
+def configure(configuration: client.Configuration = None):
+    """Replace the shared Kubernetes API client.
+
+    Args:
+        configuration (client.Configuration): Configuration of the new client.
+            If None, a client is created from the admin kubeconfig again the
+            next time a request is sent.
+    """
+    global _api_client
+    with _api_client_lock:
+        _api_client = client.ApiClient(configuration) if configuration else None
+
+
+def _get_api_method(resource: str, verb: str, namespace: str = None,
+                    subresource: str = None):
+    """Get the API client method acting on a resource.
+
+    Args:
+        resource (str): The resource, as named by kubectl (e.g., "pvc").
+        verb (str): The verb of the method: get, list, create, patch or
+                    delete.
+        namespace (str): The namespace of the objects. All the namespaces if
+                         None, for the lists of namespaced resources.
+        subresource (str): The subresource to act on (e.g., "scale").
+
+    Returns:
+        tuple: The method and the keyword arguments addressing the resource.
+
+    Raises:
+        ValueError: If the resource is unknown, or the namespace of a
+                    namespaced object is missing.
+    """
+    if resource in BUILTIN_RESOURCES:
+        api_class, model, namespaced = BUILTIN_RESOURCES[resource]
+        api = api_class(get_api_client())
+        kwargs = {}
+        # The typed APIs read objects, rather than get them
+        verb = "read" if verb == "get" else verb
+        if not namespaced:
+            method = f"{verb}_{model}"
+        elif namespace is None and verb == "list":
+            method = f"list_{model}_for_all_namespaces"
+        else:
+            _check_namespace(resource, namespace)
+            method = f"{verb}_namespaced_{model}"
+            kwargs["namespace"] = namespace
+    elif resource in CUSTOM_RESOURCES:
+        group, version, plural, namespaced = CUSTOM_RESOURCES[resource]
+        api = client.CustomObjectsApi(get_api_client())
+        kwargs = {"group": group, "version": version, "plural": plural}
+        if not namespaced or (namespace is None and verb == "list"):
+            method = f"{verb}_cluster_custom_object"
+        else:
+            _check_namespace(resource, namespace)
+            method = f"{verb}_namespaced_custom_object"
+            kwargs["namespace"] = namespace
+    else:
+        raise ValueError(f"Unknown Kubernetes resource '{resource}'")
+
+    if subresource:
+        method = f"{method}_{subresource}"
+    return getattr(api, method), kwargs
+
+
+def _call(method, **kwargs) -> dict:
+    """Call an API client method, keeping the response as plain JSON.
+
+    The response is decoded as is, like kubectl -o json prints it, rather
+    than deserialized into the models of the client.
+
+    Args:
+        method: The API client method.
+        kwargs: The arguments of the method.
+
+    Returns:
+        dict: The decoded response.
+
+    Raises:
+        ApiException: If the API server rejects the request.
+    """
+    response = method(_preload_content=False,
+                      _request_timeout=REQUEST_TIMEOUT, **kwargs)
+    return json.loads(response.data) if response.data else {}
+
+
+def _check_name(resource: str, name: str):
+    """Reject empty object names, which would address the whole collection."""
+    if not name:
+        raise ValueError(f"The name of the {resource} may not be empty")
+
+
+def _check_namespace(resource: str, namespace: str):
+    """Reject empty namespaces, which the objects of namespaced resources need."""
+    if not namespace:
+        raise ValueError(f"The namespace of the {resource} may not be empty")
+
+
+def is_not_found(error: Exception) -> bool:
+    """Check if an error means that the object does not exist.
+
+    Args:
+        error (Exception): The error raised by a request.
+
+    Returns:
+        bool: True if the object was not found; False otherwise.
+    """
+    return isinstance(error, ApiException) and error.status == 404
+
+
+def get(resource: str, name: str, namespace: str = None,
+        ignore_not_found: bool = False) -> dict:
+    """Get a Kubernetes object.
+
+    Args:
+        resource (str): The resource, as named by kubectl (e.g., "pvc").
+        name (str): The name of the object.
+        namespace (str): The namespace of the object.
+        ignore_not_found (bool): Return None instead of raising when the
+                                 object does not exist.
+
+    Returns:
+        dict: The object.
+
+    Raises:
+        ApiException: If the object cannot be read.
+        ValueError: If the name is empty.
+    """
+    _check_name(resource, name)
+    method, kwargs = _get_api_method(resource, "get", namespace)
+    try:
+        return _call(method, name=name, **kwargs)
+    except ApiException as e:
+        if ignore_not_found and is_not_found(e):
+            return None
+        raise
+
+
+def list_collection(resource: str, namespace: str = None, label_selector: str = None,
+                    field_selector: str = None) -> dict:
+    """List Kubernetes objects, keeping the metadata of the list.
+
+    The resourceVersion of the list metadata is where a watch of the same
+    objects starts from.
+
+    Args:
+        resource (str): The resource, as named by kubectl (e.g., "pvc").
+        namespace (str): The namespace of the objects. All the namespaces if
+                         None, for namespaced resources.
+        label_selector (str): Only list the objects matching this selector.
+        field_selector (str): Only list the objects matching this selector.
+
+    Returns:
+        dict: The list, with its "metadata" and "items".
+
+    Raises:
+        ApiException: If the objects cannot be listed.
+    """
+    method, kwargs = _get_api_method(resource, "list", namespace)
+    if label_selector:
+        kwargs["label_selector"] = label_selector
+    if field_selector:
+        kwargs["field_selector"] = field_selector
+    return _call(method, **kwargs)
+
+
+def list_items(resource: str, namespace: str = None, label_selector: str = None,
+               field_selector: str = None) -> list[dict]:
+    """List Kubernetes objects.
+
+    Args:
+        resource (str): The resource, as named by kubectl (e.g., "pvc").
+        namespace (str): The namespace of the objects. All the namespaces if
+                         None, for namespaced resources.
+        label_selector (str): Only list the objects matching this selector.
+        field_selector (str): Only list the objects matching this selector.
+
+    Returns:
+        list[dict]: The objects.
+
+    Raises:
+        ApiException: If the objects cannot be listed.
+    """
+    response = list_collection(resource, namespace=namespace,
+                               label_selector=label_selector,
+                               field_selector=field_selector)
+    return response.get("items") or []
+
+
+def watch(resource: str, resource_version: str, namespace: str = None,
+          field_selector: str = None, timeout: int = WATCH_TIMEOUT):
+    """Watch the changes of Kubernetes objects.
+
+    The events are streamed by the watch of the Kubernetes client, until
+    the API server ends the watch. Bookmark events are requested, so the
+    resourceVersion to resume from keeps moving even when the objects do
+    not change.
+
+    Args:
+        resource (str): The resource, as named by kubectl (e.g., "pvc").
+        resource_version (str): The resourceVersion to watch from, as
+                                returned by list_collection.
+        namespace (str): The namespace of the objects. All the namespaces if
+                         None, for namespaced resources.
+        field_selector (str): Only watch the objects matching this selector.
+        timeout (int): Time, in seconds, after which the watch ends.
+
+    Yields:
+        dict: The events, with their "type" (ADDED, MODIFIED, DELETED or
+        BOOKMARK) and "object", as plain JSON.
+
+    Raises:
+        ApiException: If the API server rejects or ends the watch with an
+                      error (e.g., 410 Gone for an expired resourceVersion).
+    """
+    method, kwargs = _get_api_method(resource, "list", namespace)
+    if field_selector:
+        kwargs["field_selector"] = field_selector
+
+    def _list_objects(**list_kwargs):
+        """List the objects of the resource."""
+        # Without a return type in the docstring, the watch yields the
+        # objects as plain JSON instead of deserializing every event
+        return method(**list_kwargs)
+
+    events = kube_watch.Watch().stream(_list_objects, resource_version=resource_version,
+                                       allow_watch_bookmarks=True,
+                                       timeout_seconds=timeout,
+                                       _request_timeout=timeout + REQUEST_TIMEOUT,
+                                       **kwargs)
+    try:
+        for event in events:
+            yield {"type": event["type"], "object": event["object"]}
+    finally:
+        # The watch may be left before the server ends it, so its connection
+        # is closed rather than returned to the pool with unread events
+        events.close()
+
+
+def create(resource: str, body: dict, namespace: str = None) -> dict:
+    """Create a Kubernetes object.
+
+    Args:
+        resource (str): The resource, as named by kubectl (e.g., "pvc").
+        body (dict): The object.
+        namespace (str): The namespace of the object. Taken from the object
+                         metadata if None.
+
+    Returns:
+        dict: The created object.
+
+    Raises:
+        ApiException: If the object cannot be created.
+    """
+    namespace = namespace or body.get("metadata", {}).get("namespace")
+    method, kwargs = _get_api_method(resource, "create", namespace)
+    return _call(method, body=body, **kwargs)
+
+
+def patch(resource: str, name: str, body: dict, namespace: str = None,
+          subresource: str = None) -> dict:
+    """Patch a Kubernetes object.
+
+    Like kubectl patch, the built-in resources are patched with a strategic
+    merge patch and the custom resources with a merge patch.
+
+    Args:
+        resource (str): The resource, as named by kubectl (e.g., "pvc").
+        name (str): The name of the object.
+        body (dict): The patch.
+        namespace (str): The namespace of the object.
+        subresource (str): The subresource to patch (e.g., "scale").
+
+    Returns:
+        dict: The patched object.
+
+    Raises:
+        ApiException: If the object cannot be patched.
+        ValueError: If the name is empty.
+    """
+    _check_name(resource, name)
+    method, kwargs = _get_api_method(resource, "patch", namespace, subresource)
+    return _call(method, name=name, body=body, **kwargs)
+
+
+def delete(resource: str, name: str, namespace: str = None,
+           ignore_not_found: bool = False, wait: bool = True,
+           timeout: int = DELETE_TIMEOUT, propagation_policy: str = None):
+    """Delete a Kubernetes object.
+
+    Like kubectl, waits until the object is gone (i.e. its finalizers have
+    run) unless told otherwise.
+
+    Args:
+        resource (str): The resource, as named by kubectl (e.g., "pvc").
+        name (str): The name of the object.
+        namespace (str): The namespace of the object.
+        ignore_not_found (bool): Don't raise if the object does not exist.
+        wait (bool): Wait for the object to be gone.
+        timeout (int): Time, in seconds, to wait for the object to be gone.
+        propagation_policy (str): How the dependents of the object are
+                                  deleted (e.g., "Background"). The default
+                                  policy of the resource if None.
+
+    Raises:
+        ApiException: If the object cannot be deleted.
+        TimeoutError: If the object is not gone in time.
+        ValueError: If the name is empty.
+    """
+    _check_name(resource, name)
+    method, kwargs = _get_api_method(resource, "delete", namespace)
+    if propagation_policy:
+        kwargs["propagation_policy"] = propagation_policy
+    try:
+        _call(method, name=name, **kwargs)
+    except ApiException as e:
+        if ignore_not_found and is_not_found(e):
+            return
+        raise
+
+    deadline = time.monotonic() + timeout
+    while wait:
+        if get(resource, name, namespace=namespace, ignore_not_found=True) is None:
+            return
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Timed out waiting for {resource} '{name}' "
+                               "to be deleted")
+        time.sleep(DELETE_POLL_INTERVAL)
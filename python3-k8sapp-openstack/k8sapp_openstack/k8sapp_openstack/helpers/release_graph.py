@@ -0,0 +1,201 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import json
+import os
+
+import yaml
+
+KUSTOMIZATION_FILE = "kustomization.yaml"
+HELMRELEASE_FILE = "helmrelease.yaml"
+
+
+def load_release_graph(manifest_dir: str, wave_patches: bool = False) -> dict:
+    """Read the HelmReleases of the application manifests.
+
+    Args:
+        manifest_dir (str): The directory of the top-level kustomization.
+        wave_patches (bool): Replace the dependencies of the HelmReleases by
+                             the ones of the wave patches of the top-level
+                             kustomization, as Flux deploys them.
+
+    Returns:
+        dict: The "namespace", the "resource" directory and the names of the
+        HelmReleases it "depends_on", of each HelmRelease, by name.
+    """
+    with open(os.path.join(manifest_dir, KUSTOMIZATION_FILE), encoding="utf-8") as f:
+        kustomization = yaml.safe_load(f) or {}
+
+    graph = {}
+    for resource in kustomization.get("resources") or []:
+        path = os.path.join(manifest_dir, resource, HELMRELEASE_FILE)
+        if not os.path.isfile(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for document in yaml.safe_load_all(f):
+                if not document or document.get("kind") != "HelmRelease":
+                    continue
+                spec = document.get("spec") or {}
+                graph[document["metadata"]["name"]] = {
+                    "namespace": (document["metadata"].get("namespace") or
+                                  kustomization.get("namespace")),
+                    "resource": resource,
+                    "depends_on": [dependency["name"]
+                                   for dependency in spec.get("dependsOn") or []],
+                }
+
+    if wave_patches:
+        for patch in kustomization.get("patches") or []:
+            name = patch["target"].get("name") if is_wave_patch(patch) else None
+            if name not in graph:
+                continue
+            for operation in json.loads(patch["patch"]):
+                graph[name]["depends_on"] = [dependency["name"] for dependency in
+                                             operation.get("value") or []]
+    return graph
+
+
+def is_wave_patch(patch: dict) -> bool:
+    """Check if a kustomization patch only replaces the dependsOn of a HelmRelease.
+
+    The wave patches written by the kustomize operator are told apart by
+    their content, as they are saved in the synced kustomization.
+
+    Args:
+        patch (dict): The kustomization patch.
+
+    Returns:
+        bool: True if the patch is a wave patch; False otherwise.
+    """
+    if (patch.get("target") or {}).get("kind") != "HelmRelease":
+        return False
+    try:
+        operations = json.loads(patch.get("patch") or "")
+    except (TypeError, ValueError):
+        return False
+    return (isinstance(operations, list) and bool(operations) and
+            all(isinstance(operation, dict) and
+                operation.get("path") == "/spec/dependsOn"
+                for operation in operations))
+
+
+def get_dependencies(graph: dict) -> dict:
+    """Get the HelmReleases each HelmRelease of a graph depends on."""
+    return {name: list(node["depends_on"]) for name, node in graph.items()}
+
+
+def get_waves(dependencies: dict) -> list:
+    """Group HelmReleases into waves that can be deployed in parallel.
+
+    Each HelmRelease is in the wave following the last of its dependencies.
+    Dependencies on HelmReleases that are not part of the graph are ignored.
+
+    Args:
+        dependencies (dict): The HelmReleases each HelmRelease depends on.
+
+    Returns:
+        list: The waves, as sorted lists of HelmRelease names.
+
+    Raises:
+        ValueError: If the dependencies are circular.
+    """
+    pending = {name: {dependency for dependency in deps if dependency in dependencies}
+               for name, deps in dependencies.items()}
+    waves = []
+    while pending:
+        wave = sorted(name for name, deps in pending.items() if not deps)
+        if not wave:
+            raise ValueError(f"Circular HelmRelease dependencies: {sorted(pending)}")
+        waves.append(wave)
+        for name in wave:
+            del pending[name]
+        for deps in pending.values():
+            deps.difference_update(wave)
+    return waves
+
+
+def get_critical_path(dependencies: dict, durations: dict, default_duration: float) -> tuple:
+    """Find the longest chain of dependent HelmReleases.
+
+    Args:
+        dependencies (dict): The HelmReleases each HelmRelease depends on.
+        durations (dict): Time, in seconds, each HelmRelease takes to deploy.
+        default_duration (float): Time, in seconds, assumed for the
+                                  HelmReleases without a known duration.
+
+    Returns:
+        tuple: The HelmReleases of the critical path, in deployment order,
+        and the time, in seconds, to deploy them.
+
+    Raises:
+        ValueError: If the dependencies are circular.
+    """
+    finish = {}
+    previous = {}
+    for wave in get_waves(dependencies):
+        for name in wave:
+            deps = [dependency for dependency in dependencies[name] if dependency in finish]
+            before = max(deps, key=lambda dependency: finish[dependency], default=None)
+            previous[name] = before
+            finish[name] = ((finish[before] if before else 0) +
+                            durations.get(name, default_duration))
+    if not finish:
+        return [], 0
+
+    name = max(sorted(finish), key=lambda release: finish[release])
+    total = finish[name]
+    path = []
+    while name:
+        path.append(name)
+        name = previous[name]
+    return list(reversed(path)), total
+
+
+def restructure(dependencies: dict, required: dict, releases: list = None) -> dict:
+    """Replace the dependencies of HelmReleases by the ones they require.
+
+    A required HelmRelease that is not deployed, e.g. disabled, is replaced
+    by its own dependencies, so the ordering is kept. Dependencies already
+    implied by another one are dropped.
+
+    Args:
+        dependencies (dict): The HelmReleases each HelmRelease depends on.
+        required (dict): The HelmReleases some HelmReleases actually require.
+                         The ones not listed keep their dependencies.
+        releases (list): The HelmReleases deployed. All of them if None.
+
+    Returns:
+        dict: The new dependencies of each HelmRelease deployed.
+    """
+    releases = set(dependencies) if releases is None else set(releases)
+
+    def _resolve(name, seen):
+        resolved = set()
+        for dependency in required.get(name, dependencies.get(name, [])):
+            if dependency in seen:
+                continue
+            if dependency in releases:
+                resolved.add(dependency)
+            else:
+                resolved |= _resolve(dependency, seen | {dependency})
+        return resolved
+
+    direct = {name: _resolve(name, {name}) for name in dependencies if name in releases}
+
+    def _ancestors(name, seen):
+        found = set()
+        for dependency in direct[name]:
+            if dependency not in seen:
+                found |= {dependency} | _ancestors(dependency, seen | {dependency})
+        return found
+
+    restructured = {}
+    for name, deps in direct.items():
+        implied = set()
+        for dependency in deps:
+            implied |= _ancestors(dependency, {name, dependency})
+        restructured[name] = sorted(deps - implied)
+    return restructured
@@ -0,0 +1,607 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from concurrent import futures
+import datetime
+import json
+import queue
+import time
+
+from kubernetes.client.rest import ApiException
+from oslo_log import log as logging
+
+from k8sapp_openstack.common import constants as app_constants
+from k8sapp_openstack.helpers import kube_client
+
+LOG = logging.getLogger(__name__)
+
+# Recovery steps of a server: (action, action body, status reached once the
+# action is done)
+STEPS = (
+    ("os-resetState", {"state": "active"}, app_constants.NOVA_SERVER_ACTIVE),
+    ("os-stop", None, app_constants.NOVA_SERVER_SHUTOFF),
+    ("shelve", None, app_constants.NOVA_SERVER_SHELVED_OFFLOADED),
+    ("unshelve", None, app_constants.NOVA_SERVER_ACTIVE),
+)
+
+TASK_STATE = "OS-EXT-STS:task_state"
+HOST = "OS-EXT-SRV-ATTR:host"
+VOLUMES_ATTACHED = "os-extended-volumes:volumes_attached"
+VOLUME_HOST = "os-vol-host-attr:host"
+
+# Weight of the latest nova-api latency in its moving average
+LATENCY_WEIGHT = 0.3
+
+# Actions applied by nova-api before it accepts them, so their status needs
+# neither a notification nor a poll
+SYNCHRONOUS_ACTIONS = ("os-resetState",)
+
+# Status of a server once the action of the nova notification is done, by
+# event type. The unversioned notifications have a "compute." prefix.
+NOTIFICATION_EVENTS = {
+    "instance.power_off.end": app_constants.NOVA_SERVER_SHUTOFF,
+    "instance.shelve_offload.end": app_constants.NOVA_SERVER_SHELVED_OFFLOADED,
+    "instance.unshelve.end": app_constants.NOVA_SERVER_ACTIVE,
+}
+
+
+def _format_changes_since(timestamp: float) -> str:
+    """Format a time for the changes-since filter of nova-api."""
+    return datetime.datetime.fromtimestamp(
+        timestamp, tz=datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def get_volume_backends(session, cinder_url: str) -> dict:
+    """Get the Cinder backend of the volumes.
+
+    The backend of a volume is the one of its os-vol-host-attr:host, e.g.
+    "ceph-store" for "controller@ceph-store#ceph-store".
+
+    Args:
+        session: keystoneauth1 Session.
+        cinder_url (str): Cinder block storage endpoint URL, with the
+                          project ID.
+
+    Returns:
+        dict: The backend of each volume, and whether it is bootable, as
+        {"backend": str, "bootable": bool}, by volume UUID. The volumes not
+        scheduled to a backend are left out.
+    """
+    volumes = {}
+    url = f"{cinder_url}/volumes/detail?all_tenants=1"
+    while url:
+        body = session.get(url).json()
+        for volume in body.get("volumes", []):
+            host = volume.get(VOLUME_HOST)
+            if not host or "@" not in host:
+                continue
+            volumes[volume["id"]] = {
+                "backend": host.split("@", 1)[1].split("#", 1)[0],
+                "bootable": str(volume.get("bootable")).lower() == "true",
+            }
+        url = next((link["href"] for link in body.get("volumes_links", [])
+                    if link.get("rel") == "next"), None)
+    return volumes
+
+
+def get_server_backend(server: dict, volumes: dict = None) -> str:
+    """Get the storage backend holding the disk of a server.
+
+    The disk of a server booted from an image is on the ephemeral storage of
+    its compute. The disk of a server booted from volume is on the Cinder
+    backend of its bootable attached volume, as told by get_volume_backends.
+    When the backend of its volumes is unknown, e.g. the volumes could not be
+    listed, the servers booted from volume share one backend.
+
+    Args:
+        server (dict): The server, as listed by nova-api.
+        volumes (dict): The Cinder backend of the volumes, by volume UUID, as
+                        got by get_volume_backends, if known.
+
+    Returns:
+        str: "ephemeral", "volume:<Cinder backend>", or "volume" if unknown.
+    """
+    if server.get("image"):
+        return "ephemeral"
+    attached = [volumes[volume["id"]] for volume in server.get(VOLUMES_ATTACHED) or []
+                if volume.get("id") in (volumes or {})]
+    # The root volume is bootable
+    attached.sort(key=lambda volume: not volume["bootable"])
+    if attached:
+        return f"volume:{attached[0]['backend']}"
+    return "volume"
+
+
+class RecoveryJournal(object):
+    """Progress of the VM recovery, kept in a ConfigMap.
+
+    The ConfigMap holds an entry per server being recovered, with its current
+    step, the attempts of that step, whether its action was accepted and
+    when the entry was written, so a restarted conductor resumes the recovery
+    instead of starting it over.
+    """
+
+    def __init__(self, name: str = app_constants.NOVA_RECOVERY_JOURNAL_CONFIGMAP,
+                 namespace: str = app_constants.HELM_NS_OPENSTACK):
+        self.name = name
+        self.namespace = namespace
+
+    def load(self) -> dict:
+        """Read the journal entries, by server UUID."""
+        configmap = kube_client.get("configmap", self.name, namespace=self.namespace,
+                                    ignore_not_found=True)
+        entries = {}
+        for server_id, value in ((configmap or {}).get("data") or {}).items():
+            try:
+                entries[server_id] = json.loads(value)
+            except ValueError:
+                LOG.warning(f"VM recovery: ignoring malformed journal entry of {server_id}")
+        return entries
+
+    def update(self, entries: dict):
+        """Write or drop journal entries.
+
+        Args:
+            entries (dict): The entries to write, by server UUID. The entries
+                            of the servers mapped to None are dropped.
+        """
+        data = {server_id: json.dumps(entry, sort_keys=True) if entry is not None else None
+                for server_id, entry in entries.items()}
+        try:
+            kube_client.patch("configmap", self.name, {"data": data}, namespace=self.namespace)
+        except ApiException as e:
+            if not kube_client.is_not_found(e):
+                raise
+            kube_client.create("configmap", {
+                "metadata": {"name": self.name, "namespace": self.namespace},
+                "data": {key: value for key, value in data.items() if value is not None},
+            })
+
+    def clear(self):
+        """Drop the journal."""
+        kube_client.delete("configmap", self.name, namespace=self.namespace,
+                           ignore_not_found=True, wait=False)
+
+
+class NotificationListener(object):
+    """Listener of the instance notifications of nova.
+
+    The notifications matching a recovery step are queued as (server UUID,
+    status) pairs, for ServerRecovery to consume. Both the unversioned and
+    the versioned notification topics are listened to, through a pool of its
+    own so the other consumers of the topics still get all the
+    notifications.
+
+    The exchange of nova is shared with its services, so it is left as
+    declared by them. The queue of the pool expires through the rabbitmq
+    policy of the nova chart instead, so it does not keep collecting the
+    notifications once the listener stops.
+    """
+
+    def __init__(self, transport_url: str, events: queue.Queue = None,
+                 exchange: str = app_constants.NOVA_NOTIFICATION_EXCHANGE):
+        """Constructor
+
+        Args:
+            transport_url (str): The oslo.messaging transport URL of the
+                                 nova notifications.
+            events (queue.Queue): Where the notifications are queued.
+            exchange (str): The exchange nova publishes its notifications
+                            to.
+        """
+        self.transport_url = transport_url
+        self.exchange = exchange
+        self.events = events if events is not None else queue.Queue()
+        self._listener = None
+
+    def info(self, ctxt, publisher_id, event_type, payload, metadata):
+        """Queue the notifications of the actions of the recovery."""
+        if event_type.startswith("compute."):
+            event_type = event_type[len("compute."):]
+        status = NOTIFICATION_EVENTS.get(event_type)
+        if status is None or not isinstance(payload, dict):
+            return
+        server_id = (payload.get("nova_object.data") or {}).get("uuid") or payload.get("instance_id")
+        if server_id:
+            self.events.put((server_id, status))
+
+    def start(self) -> bool:
+        """Start listening, in the background.
+
+        Returns:
+            bool: True if listening; False otherwise.
+        """
+        try:
+            # oslo.messaging is only needed by this recovery mode, and
+            # comes with the sysinv conductor
+            from oslo_config import cfg
+            import oslo_messaging
+
+            conf = cfg.ConfigOpts()
+            transport = oslo_messaging.get_notification_transport(
+                conf, url=self.transport_url)
+            targets = [oslo_messaging.Target(exchange=self.exchange, topic=topic)
+                       for topic in app_constants.NOVA_NOTIFICATION_TOPICS]
+            self._listener = oslo_messaging.get_notification_listener(
+                transport, targets, [self], executor="threading",
+                pool=app_constants.NOVA_RECOVERY_NOTIFICATION_POOL)
+            self._listener.start()
+        except Exception as e:
+            LOG.warning(f"VM recovery: unable to listen to the nova notifications, "
+                        f"polling the server status instead: {e}")
+            self._listener = None
+            return False
+        return True
+
+    def stop(self):
+        """Stop listening."""
+        if self._listener is None:
+            return
+        try:
+            self._listener.stop()
+            self._listener.wait()
+        except Exception as e:
+            LOG.warning(f"VM recovery: failed to stop listening to the nova notifications: {e}")
+        self._listener = None
+
+
+class ServerRecovery(object):
+    """Drives servers through the reset-state/stop/shelve/unshelve steps.
+
+    All the servers are recovered together, as a state machine: the action
+    POSTs are sent from a pool of workers, and the progress of the whole
+    batch is observed with a single servers/detail?changes-since poll per
+    interval, instead of one GET per server.
+
+    A server only moves to its next step once a status observed after its
+    action was accepted matches the expected one. A server found ACTIVE and
+    idle while being stopped was resumed by its compute and is recovered.
+
+    Once started, a server holds a slot of its compute host and of its
+    storage backend until it is done, so only a few servers are shelved and
+    unshelved at once on each. The recovery slows down while nova-api is
+    slow, and its progress is kept in the journal, if any.
+
+    Given the queue of a NotificationListener, the servers advance as soon
+    as the notification of their action arrives, and the status polls are
+    only a fallback. The reset-state step, which is not notified, is done
+    once nova-api accepts it, and the status is still polled at the regular
+    interval while servers are being stopped, as their compute resuming them
+    is not notified either.
+    """
+
+    def __init__(self, session, nova_url: str, max_workers: int = None,
+                 interval: float = app_constants.NOVA_SERVER_STATUS_INTERVAL,
+                 timeout: float = app_constants.NOVA_SERVER_STATUS_TIMEOUT,
+                 max_per_host: int = app_constants.NOVA_RECOVERY_MAX_PER_HOST,
+                 max_per_backend: int = app_constants.NOVA_RECOVERY_MAX_PER_BACKEND,
+                 journal: RecoveryJournal = None, events: queue.Queue = None,
+                 volumes: dict = None):
+        """Constructor
+
+        Args:
+            session: keystoneauth1 Session.
+            nova_url (str): Nova compute endpoint URL.
+            max_workers (int): Maximum number of action POSTs sent at once.
+            interval (float): Time, in seconds, between status polls.
+            timeout (float): Time, in seconds, for a server to reach the
+                             status expected after each action.
+            max_per_host (int): Maximum number of servers recovered at once
+                                on a compute host.
+            max_per_backend (int): Maximum number of servers recovered at
+                                   once on a storage backend.
+            journal (RecoveryJournal): Where the progress is kept, if any.
+            events (queue.Queue): The (server UUID, status) pairs of the
+                                  nova notifications, if listened to.
+            volumes (dict): The Cinder backend of the volumes, by volume
+                            UUID, as got by get_volume_backends, if known.
+        """
+        self.session = session
+        self.nova_url = nova_url
+        self.max_workers = max_workers or app_constants.NOVA_RECOVERY_MAX_WORKERS
+        self.interval = interval
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.max_per_backend = max_per_backend
+        self.journal = journal
+        self.events = events
+        self.volumes = volumes
+        self.servers = {}
+        self.latency = None
+        self._concurrency = self.max_workers
+        self._interval = interval
+        self._changes_since = None
+        self._journaled = {}
+
+    def add(self, server: dict, resume: dict = None):
+        """Add a server to recover, as listed by nova-api.
+
+        Args:
+            server (dict): The server.
+            resume (dict): The journal entry of the server, if its recovery
+                           is resumed.
+        """
+        resume = resume or {}
+        state = {
+            "step": resume.get("step", 0),
+            "attempts": resume.get("attempts", 0),
+            "status": server.get("status"),
+            "task_state": server.get(TASK_STATE),
+            "host": server.get(HOST) or resume.get("host"),
+            "backend": resume.get("backend") or get_server_backend(server, self.volumes),
+            "observed_at": None,
+            "accepted_at": None,
+            "deadline": None,
+            "result": None,
+        }
+        if resume.get("accepted"):
+            # The action may have been done while the conductor was down, so
+            # the servers changed since the entry was written are polled
+            state["accepted_at"] = time.monotonic()
+            state["deadline"] = state["accepted_at"] + self.timeout
+            since = resume.get("updated_at", time.time()) - app_constants.NOVA_CHANGES_SINCE_MARGIN
+            self._changes_since = min(since, self._changes_since or since)
+        self.servers[server["id"]] = state
+
+    def observe(self, server_id: str, status: str, task_state: str = None,
+                observed_at: float = None, host: str = None):
+        """Record the status of a server and advance its recovery.
+
+        Args:
+            server_id (str): The server UUID.
+            status (str): The status of the server.
+            task_state (str): The task state of the server.
+            observed_at (float): Monotonic time at which the status was read.
+            host (str): The compute host of the server, if any.
+        """
+        state = self.servers.get(server_id)
+        if state is None or state["result"] is not None:
+            return
+        state.update(status=status, task_state=task_state,
+                     observed_at=observed_at if observed_at is not None else time.monotonic())
+        if host:
+            state["host"] = host
+        self._advance(server_id, state)
+
+    def _advance(self, server_id: str, state: dict):
+        """Move a server to its next step once its action is done."""
+        if state["accepted_at"] is None or state["observed_at"] < state["accepted_at"]:
+            return
+        action, _, expected = STEPS[state["step"]]
+        if state["status"] == expected:
+            state.update(step=state["step"] + 1, attempts=0, accepted_at=None, deadline=None)
+            if state["step"] == len(STEPS):
+                LOG.info(f"VM recovery [{server_id}]: recovered")
+                state["result"] = True
+        elif (action == "os-stop" and state["task_state"] is None and
+              state["status"] == app_constants.NOVA_SERVER_ACTIVE):
+            LOG.info(f"VM recovery [{server_id}]: recovered (compute auto-resumed)")
+            state["result"] = True
+
+    def notify(self, server_id: str, status: str):
+        """Advance a server whose action was notified as done.
+
+        Unlike the polled status, a notification only advances a server when
+        it is the one expected after its current action, so a late
+        notification of a previous step is ignored.
+        """
+        state = self.servers.get(server_id)
+        if (state is None or state["result"] is not None or state["accepted_at"] is None or
+                STEPS[state["step"]][2] != status):
+            return
+        LOG.info(f"VM recovery [{server_id}]: notified {status}")
+        self.observe(server_id, status, observed_at=time.monotonic())
+
+    def _wait_for_events(self, deadline: float) -> bool:
+        """Wait for notifications, and advance the servers they concern.
+
+        Args:
+            deadline (float): Monotonic time until which to wait.
+
+        Returns:
+            bool: True if any notification arrived; False otherwise.
+        """
+        try:
+            event = self.events.get(timeout=max(0, deadline - time.monotonic()))
+        except queue.Empty:
+            return False
+        while True:
+            self.notify(*event)
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return True
+
+    def _poll_interval(self) -> float:
+        """Get the time, in seconds, between status polls.
+
+        In the notification-driven mode, the servers being stopped are
+        polled at the regular interval, to find the ones resumed by their
+        compute.
+        """
+        if self.events is not None and any(
+                state["result"] is None and state["accepted_at"] is not None and
+                STEPS[state["step"]][0] == "os-stop" for state in self.servers.values()):
+            return min(self._interval, app_constants.NOVA_SERVER_STATUS_INTERVAL)
+        return self._interval
+
+    def _record_latency(self, latency: float):
+        """Adapt the pace of the recovery to the latency of nova-api.
+
+        While nova-api is slow, the number of actions sent at once is halved
+        and the polling interval doubled; they recover step by step once it
+        is fast again.
+        """
+        self.latency = (latency if self.latency is None else
+                        LATENCY_WEIGHT * latency + (1 - LATENCY_WEIGHT) * self.latency)
+        if self.latency > app_constants.NOVA_API_SLOW_LATENCY:
+            self._concurrency = max(1, self._concurrency // 2)
+            self._interval = min(max(self.interval, app_constants.NOVA_SERVER_STATUS_MAX_INTERVAL),
+                                 self._interval * 2)
+        else:
+            self._concurrency = min(self.max_workers, self._concurrency + 1)
+            self._interval = max(self.interval, self._interval / 2)
+
+    def _post_action(self, server_id: str, step: int) -> float:
+        """Send the action of a step of a server.
+
+        Returns:
+            float: The latency of nova-api, in seconds.
+        """
+        action, body, _ = STEPS[step]
+        LOG.info(f"VM recovery [{server_id}]: {action}")
+        started = time.monotonic()
+        self.session.post(f"{self.nova_url}/servers/{server_id}/action",
+                          json={action: body})
+        return time.monotonic() - started
+
+    def poll(self):
+        """Read the status of the servers changed since the previous poll."""
+        started = time.monotonic()
+        now = time.time()
+        since = (self._changes_since if self._changes_since is not None
+                 else now - self.timeout)
+        url = (f"{self.nova_url}/servers/detail?all_tenants=1"
+               f"&changes-since={_format_changes_since(since)}")
+        while url:
+            requested = time.monotonic()
+            body = self.session.get(url).json()
+            self._record_latency(time.monotonic() - requested)
+            for server in body.get("servers", []):
+                self.observe(server["id"], server.get("status"), server.get(TASK_STATE),
+                             observed_at=started, host=server.get(HOST))
+            url = next((link["href"] for link in body.get("servers_links", [])
+                        if link.get("rel") == "next"), None)
+        # Servers changing while listed are listed again by the next poll
+        self._changes_since = now - app_constants.NOVA_CHANGES_SINCE_MARGIN
+
+    def _startable(self, in_flight: dict) -> list:
+        """Get the servers whose next action can be sent now."""
+        started = [state for server_id, state in self.servers.items()
+                   if state["result"] is None and
+                   (state["step"] or state["attempts"] or server_id in in_flight.values())]
+        per_host = {}
+        per_backend = {}
+        for state in started:
+            per_host[state["host"]] = per_host.get(state["host"], 0) + 1
+            per_backend[state["backend"]] = per_backend.get(state["backend"], 0) + 1
+
+        startable = []
+        slots = self._concurrency - len(in_flight)
+        for server_id, state in self.servers.items():
+            if slots <= 0:
+                break
+            if (state["result"] is not None or state["accepted_at"] is not None or
+                    server_id in in_flight.values()):
+                continue
+            if not (state["step"] or state["attempts"]):
+                # The servers without a compute host, e.g. never scheduled,
+                # do not share one
+                if ((state["host"] is not None and
+                     per_host.get(state["host"], 0) >= self.max_per_host) or
+                        per_backend.get(state["backend"], 0) >= self.max_per_backend):
+                    continue
+                per_host[state["host"]] = per_host.get(state["host"], 0) + 1
+                per_backend[state["backend"]] = per_backend.get(state["backend"], 0) + 1
+            startable.append(server_id)
+            slots -= 1
+        return startable
+
+    def _update_journal(self):
+        """Write the progress of the servers that changed to the journal."""
+        if self.journal is None:
+            return
+        entries = {}
+        for server_id, state in self.servers.items():
+            entry = None
+            if state["result"] is None and (state["step"] or state["attempts"]):
+                entry = {"step": state["step"], "attempts": state["attempts"],
+                         "accepted": state["accepted_at"] is not None,
+                         "host": state["host"], "backend": state["backend"]}
+            if entry != self._journaled.get(server_id):
+                entries[server_id] = dict(entry, updated_at=time.time()) if entry else None
+                self._journaled[server_id] = entry
+        if entries:
+            try:
+                self.journal.update(entries)
+            except Exception as e:
+                LOG.warning(f"VM recovery: failed to update the journal: {e}")
+
+    def run(self) -> dict:
+        """Recover the servers.
+
+        Returns:
+            dict: True for each recovered server, False otherwise, by server
+            UUID.
+        """
+        executor = futures.ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(self.servers) or 1))
+        in_flight = {}
+        last_poll = time.monotonic()
+        try:
+            while any(state["result"] is None for state in self.servers.values()):
+                for server_id in self._startable(in_flight):
+                    self.servers[server_id]["attempts"] += 1
+                    in_flight[executor.submit(
+                        self._post_action, server_id, self.servers[server_id]["step"])] = server_id
+
+                # The actions sent are usually accepted well within the
+                # interval, so their servers are observed by the next poll
+                next_poll = last_poll + self._poll_interval()
+                futures.wait(in_flight, timeout=max(0, next_poll - time.monotonic()))
+
+                advanced = False
+                for future in [f for f in in_flight if f.done()]:
+                    server_id = in_flight.pop(future)
+                    state = self.servers[server_id]
+                    try:
+                        self._record_latency(future.result())
+                    except Exception as e:
+                        LOG.error(f"VM recovery [{server_id}]: {STEPS[state['step']][0]} "
+                                  f"failed (attempt {state['attempts']}): {e}")
+                        if state["attempts"] >= app_constants.NOVA_RECOVERY_MAX_ATTEMPTS:
+                            state["result"] = False
+                        continue
+                    state["accepted_at"] = time.monotonic()
+                    state["deadline"] = state["accepted_at"] + self.timeout
+                    action, _, expected = STEPS[state["step"]]
+                    if self.events is not None and action in SYNCHRONOUS_ACTIONS:
+                        self.observe(server_id, expected, observed_at=state["accepted_at"])
+                        advanced = True
+
+                # The servers being stopped may have been accepted meanwhile
+                next_poll = last_poll + self._poll_interval()
+
+                # Notified servers, and the servers done with a synchronous
+                # action, move on to their next action right away; the others
+                # wait for the next poll
+                if not advanced and (self.events is None or
+                                     not self._wait_for_events(next_poll) or
+                                     time.monotonic() >= next_poll):
+                    time.sleep(max(0, next_poll - time.monotonic()))
+                    try:
+                        self.poll()
+                    except Exception as e:
+                        LOG.warning(f"VM recovery: failed to poll the server status: {e}")
+                    last_poll = time.monotonic()
+
+                now = time.monotonic()
+                for server_id, state in self.servers.items():
+                    if (state["result"] is None and state["deadline"] is not None and
+                            now >= state["deadline"]):
+                        LOG.error(f"VM recovery [{server_id}]: did not reach "
+                                  f"{STEPS[state['step']][2]} (last: {state['status']})")
+                        state["result"] = False
+                self._update_journal()
+        finally:
+            executor.shutdown(wait=False)
+
+        if self.journal is not None:
+            try:
+                self.journal.clear()
+            except Exception as e:
+                LOG.warning(f"VM recovery: failed to drop the journal: {e}")
+        return {server_id: state["result"] for server_id, state in self.servers.items()}
@@ -9,12 +9,16 @@
 """ System inventory Kustomization resource operator."""
 
 from copy import deepcopy
+import json
+import os
 
 from oslo_log import log as logging
 from sysinv.common import constants
 from sysinv.helm import kustomize_base as base
 
+from k8sapp_openstack import utils as app_utils
 from k8sapp_openstack.common import constants as app_constants
+from k8sapp_openstack.helpers import release_graph
 
 LOG = logging.getLogger(__name__)
 
@@ -170,6 +174,88 @@ class OpenstackFluxCDKustomizeOperator(base.FluxCDKustomizeOperator):
                                        self.resources_before_restore)
                 self.resources_before_restore = []
 
+            self.set_parallel_waves(app_utils._get_value_from_application(
+                default_value=app_constants.PARALLEL_HELMRELEASE_WAVES,
+                chart_name=app_constants.HELM_CHART_CLIENTS,
+                override_name="parallelHelmReleaseWaves"))
+
+    def _get_kustomization(self):
+        """ Get the top-level kustomization, a single YAML document """
+        content = self.kustomization_content
+        return content[0] if isinstance(content, list) else content
+
+    def set_parallel_waves(self, enabled):
+        """ Deploy the independent Helm Releases in parallel waves
+        Replace the dependsOn chain of the Helm Release manifests by the
+        dependencies each Helm Release actually requires, through patches of
+        the top-level kustomization, so the independent Helm Releases are
+        deployed at the same time. The patches of a previous apply are
+        replaced, or removed when disabled.
+
+        :param enabled: whether the parallel waves are used
+        """
+        kustomization = self._get_kustomization()
+        existing = list(kustomization.get("patches") or [])
+        patches = [patch for patch in existing
+                   if not release_graph.is_wave_patch(patch)]
+
+        def _set_patches(wave_patches):
+            if patches + wave_patches != existing:
+                kustomization["patches"] = patches + wave_patches
+
+        if not enabled:
+            _set_patches([])
+            return
+
+        try:
+            graph = release_graph.load_release_graph(
+                os.path.dirname(self.kustomization_fqpn))
+            dependencies = release_graph.get_dependencies(graph)
+            releases = [name for name in graph
+                        if name in self.helmrelease_resource_map]
+            waves = release_graph.restructure(
+                dependencies,
+                app_constants.FLUXCD_HELMRELEASE_WAVE_DEPENDENCIES,
+                releases)
+            release_graph.get_waves(waves)
+        except Exception as e:
+            LOG.warning("Keeping the Helm Release dependencies of the "
+                        "manifests: {}".format(e))
+            _set_patches([])
+            return
+
+        try:
+            durations = app_utils.get_helmrelease_durations(dependencies)
+        except Exception as e:
+            LOG.debug("No Helm Release durations available: {}".format(e))
+            durations = {}
+        current = {name: [dependency for dependency in dependencies[name]
+                          if dependency in releases]
+                   for name in releases}
+        for label, deps in (("manifests", current), ("parallel", waves)):
+            path, total = release_graph.get_critical_path(
+                deps, durations,
+                app_constants.FLUXCD_HELMRELEASE_DEFAULT_DURATION)
+            LOG.info("Helm Release waves ({}): {}, critical path: {} ({}s)"
+                     .format(label, release_graph.get_waves(deps),
+                             " -> ".join(path), int(total)))
+
+        wave_patches = []
+        for name in releases:
+            if waves[name] == sorted(current[name]):
+                continue
+            wave_patches.append({
+                "target": {"kind": "HelmRelease", "name": name},
+                "patch": json.dumps([{
+                    "op": "add",
+                    "path": "/spec/dependsOn",
+                    "value": [{"name": dependency,
+                               "namespace": graph[dependency]["namespace"]}
+                              for dependency in waves[name]],
+                }]),
+            })
+        _set_patches(wave_patches)
+
     def save_kustomize_for_deletion(self):
         # TODO: transcribe the manifest_openstack save_delete_manifest logic
         pass
@@ -8,7 +8,10 @@
 
 """ System inventory App lifecycle operator."""
 
+import hashlib
+import json
 from pathlib import Path
+import time
 
 from oslo_log import log as logging
 from sysinv.api.controllers.v1 import utils
@@ -31,7 +34,7 @@ from k8sapp_openstack.utils import check_storageclass_change
 from k8sapp_openstack.utils import get_available_volume_backends
 from k8sapp_openstack.utils import get_endpoint_domain
 from k8sapp_openstack.utils import get_pvc_storageclass
-from k8sapp_openstack.utils import get_pvc_storageclass_requirements
+from k8sapp_openstack.utils import get_pvc_storageclass_resolution
 from k8sapp_openstack.utils import get_storage_backends_priority_list
 from k8sapp_openstack.utils import is_ceph_backend_available
 from k8sapp_openstack.utils import is_dex_enabled
@@ -47,6 +50,20 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
     APP_OPENSTACK_RESOURCE_CONFIG_MAP = 'ceph-etc'
     WAS_APPLIED = 'was_applied'
     MAX_HOSTS_FOR_DETAILED_MSG = 5
+    # Time, in seconds, each pre-apply semantic check may take
+    SEMANTIC_CHECK_TIMEOUT = 60
+    # Inputs of the pre-apply semantic checks whose pass can be reused by the
+    # automatic reapplies, for as long as the fingerprint of their inputs
+    # does not change. The checks not listed here always run, e.g. the
+    # storage backend availability, which probes the live cluster state.
+    SEMANTIC_CHECK_INPUTS = {
+        "storage_backends": ("overrides", "storage_backends", "storage_classes",
+                             "trident_backends"),
+        "vswitch_config": ("hosts", "labels"),
+        "datanetwork_config": ("hosts", "labels", "datanetworks"),
+        "oidc_config": ("overrides", "service_parameters"),
+        "netapp_san_storageclasses": ("overrides", "storage_classes", "trident_backends"),
+    }
 
     def app_lifecycle_actions(self, context, conductor_obj, app_op, app, hook_info):
         """ Perform lifecycle actions for an operation
@@ -57,6 +74,24 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
         :param app: AppOperator.Application object
         :param hook_info: LifecycleHookInfo object
 
+        """
+        # Read the chart overrides once for the whole hook
+        with app_utils.apply_scope():
+            try:
+                app_utils.start_kube_watch_caches()
+            except Exception as e:
+                LOG.warning(f"Unable to start the Kubernetes watch caches: {e}")
+            return self._app_lifecycle_actions(context, conductor_obj, app_op, app, hook_info)
+
+    def _app_lifecycle_actions(self, context, conductor_obj, app_op, app, hook_info):
+        """ Dispatch the lifecycle action for an operation
+
+        :param context: request context
+        :param conductor_obj: conductor object
+        :param app_op: AppOperator object
+        :param app: AppOperator.Application object
+        :param hook_info: LifecycleHookInfo object
+
         """
         # Operation
         if hook_info.lifecycle_type == LifecycleConstants.APP_LIFECYCLE_TYPE_OPERATION:
@@ -429,25 +464,239 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
                 "while the node {} not in {} state.".format(
                     active_controller.hostname, constants.VIM_SERVICES_ENABLED))
 
-        # Check system type
-        self._semantic_check_dc_system_type(app)
+        checks = self._get_pre_apply_checks(conductor_obj, app)
+        fingerprints = self._get_semantic_check_fingerprints(
+            conductor_obj.dbapi, app, [name for name, _, _ in checks])
+        # Automatic reapplies (e.g. on unlock, swact or label changes) skip the
+        # checks that already passed with the same inputs
+        if hook_info.mode == LifecycleConstants.APP_LIFECYCLE_MODE_AUTO:
+            checks = self._skip_passed_semantic_checks(checks, fingerprints)
+        self._run_semantic_checks(checks, fingerprints)
+
+    def _get_pre_apply_checks(self, conductor_obj, app):
+        """Get the pre-apply semantic checks.
+
+        The checks are independent of each other, so they can run
+        concurrently.
+
+        :param conductor_obj: conductor object
+        :param app: AppOperator.Application object
+        :returns: list of (name, check, timeout) tuples, the check being a
+                  callable without arguments and the timeout being in seconds
+
+        """
+        dbapi = conductor_obj.dbapi
+        return [
+            # Check system type
+            ("dc_system_type",
+             lambda: self._semantic_check_dc_system_type(app),
+             self.SEMANTIC_CHECK_TIMEOUT),
+            # Check storage backends availability and ESB required-field
+            # validation
+            ("storage_backend_availability",
+             self._semantic_check_storage_backend_availability,
+             app_constants.STRICT_BACKEND_PROBE_TIMEOUT + self.SEMANTIC_CHECK_TIMEOUT),
+            # Check storage backends configuration: ESB secretRef
+            # resolvability, ESB backup StorageClass, and StorageClass
+            # resolution/immutability.
+            ("storage_backends",
+             self._semantic_check_storage_backend_config,
+             self.SEMANTIC_CHECK_TIMEOUT),
+            # Check vswitch configuration
+            ("vswitch_config",
+             lambda: self._semantic_check_vswitch_config(dbapi),
+             self.SEMANTIC_CHECK_TIMEOUT),
+            # Check data network configuration
+            ("datanetwork_config",
+             lambda: self._semantic_check_datanetwork_config(dbapi),
+             self.SEMANTIC_CHECK_TIMEOUT),
+            # Check OIDC configuration when the feature is enabled. The Dex
+            # health check may be retried, so it gets the time of its retries.
+            ("oidc_config",
+             lambda: self._semantic_check_oidc_config(dbapi),
+             self._get_oidc_check_timeout()),
+            # Check NetApp dual-SAN StorageClass sanType configuration
+            ("netapp_san_storageclasses",
+             self._semantic_check_netapp_san_storageclasses,
+             self.SEMANTIC_CHECK_TIMEOUT),
+        ]
+
+    def _get_oidc_check_timeout(self):
+        """Get the time, in seconds, the OIDC semantic check may take.
+
+        Each attempt of the Dex health check may wait for the configured
+        timeout both to connect and to read the response.
+
+        :returns: the timeout of the check, in seconds
+        """
+        health_cfg = app_utils.get_dex_health_check_config()
+        try:
+            probe_time = 2 * float(health_cfg["timeout"]) * int(health_cfg["retries"])
+        except (TypeError, ValueError) as e:
+            LOG.warning(f"Invalid Dex health check configuration {health_cfg}: {e}")
+            probe_time = (2 * app_constants.DEX_HEALTH_CHECK_DEFAULT_TIMEOUT *
+                          app_constants.DEX_HEALTH_CHECK_DEFAULT_RETRIES)
+        return max(probe_time, 0) + self.SEMANTIC_CHECK_TIMEOUT
+
+    def _get_semantic_check_input(self, dbapi, app, input_name):
+        """Read one of the inputs of the semantic checks.
+
+        The inputs are reduced to the fields the checks depend on, so that
+        they can be fingerprinted.
+
+        :param dbapi: sysinv database API
+        :param app: AppOperator.Application object
+        :param input_name: name of the input, as in SEMANTIC_CHECK_INPUTS
+        :returns: the JSON serializable input
+
+        """
+        def _fields(rows, *names):
+            return sorted(([getattr(row, name, None) for name in names] for row in rows), key=str)
+
+        if input_name == "overrides":
+            app_id = dbapi.kube_app_get(app.name).id
+            overrides = app_utils.get_app_helm_overrides(dbapi, app_id)
+            return sorted(([name, namespace, override.user_overrides]
+                           for (name, namespace), override in overrides.items()), key=str)
+        elif input_name == "hosts":
+            return _fields(dbapi.ihost_get_list(), "id", "hostname", "personality",
+                           "subfunctions", "invprovision", "ihost_action")
+        elif input_name == "labels":
+            return _fields(dbapi.label_get_all(), "host_id", "label_key", "label_value")
+        elif input_name == "datanetworks":
+            return _fields(app_utils.get_interface_datanets(dbapi), "forihostid",
+                           "interface_id", "ifname", "datanetwork_id",
+                           "datanetwork_name")
+        elif input_name == "service_parameters":
+            return _fields(dbapi.service_parameter_get_all(), "service", "section",
+                           "name", "value")
+        elif input_name == "storage_backends":
+            return _fields(dbapi.storage_backend_get_list(), "backend", "state", "task")
+        elif input_name == "storage_classes":
+            return sorted(([sc["metadata"]["name"], sc["metadata"].get("resourceVersion")]
+                           for sc in app_utils.get_storage_classes()), key=str)
+        elif input_name == "trident_backends":
+            namespace = app_utils.get_user_override(
+                app_constants.HELM_CHART_CLIENTS, "netAppNamespace",
+                default_value=app_constants.OPENSTACK_NETAPP_NAMESPACE)
+            return sorted(([backend["metadata"]["name"], backend["metadata"].get("resourceVersion")]
+                           for backend in app_utils.get_trident_backends(namespace)), key=str)
+        raise ValueError(f"Unknown semantic check input {input_name}")
+
+    def _get_semantic_check_fingerprints(self, dbapi, app, names):
+        """Fingerprint the inputs of semantic checks.
+
+        :param dbapi: sysinv database API
+        :param app: AppOperator.Application object
+        :param names: names of the semantic checks
+        :returns: dict of the fingerprint of each check, by name. Checks
+                  without inputs in SEMANTIC_CHECK_INPUTS, or whose inputs
+                  cannot be read, have no fingerprint.
+
+        """
+        inputs = {}
+        fingerprints = {}
+        for name in names:
+            input_names = self.SEMANTIC_CHECK_INPUTS.get(name)
+            if not input_names:
+                continue
+            try:
+                for input_name in input_names:
+                    if input_name not in inputs:
+                        inputs[input_name] = self._get_semantic_check_input(dbapi, app, input_name)
+            except Exception as e:
+                LOG.warning(f"Unable to fingerprint the inputs of semantic check {name}: {e}")
+                continue
+            data = json.dumps([[input_name, inputs[input_name]] for input_name in input_names],
+                              sort_keys=True, default=str)
+            fingerprints[name] = hashlib.sha256(data.encode()).hexdigest()
+        return fingerprints
+
+    def _skip_passed_semantic_checks(self, checks, fingerprints):
+        """Filter out the semantic checks that already passed with the same inputs.
+
+        A pass is only reused if it was recorded less than
+        SEMANTIC_CHECK_PASS_TTL seconds ago.
+
+        :param checks: list of (name, check, timeout) tuples
+        :param fingerprints: dict of the fingerprint of each check, by name
+        :returns: list of the (name, check, timeout) tuples to run
 
-        # Check storage backends: availability, ESB required-field validation,
-        # ESB secretRef resolvability, ESB backup StorageClass, and StorageClass
-        # resolution/immutability.
-        self._semantic_check_storage_backends()
+        """
+        if not fingerprints:
+            return checks
+        try:
+            passes = app_utils.get_semantic_check_passes()
+        except Exception as e:
+            LOG.warning(f"Unable to read the semantic check passes: {e}")
+            return checks
+
+        now = time.time()
+        remaining = []
+        for name, check, timeout in checks:
+            recorded = passes.get(name) or {}
+            if (name in fingerprints and
+                    recorded.get("fingerprint") == fingerprints[name] and
+                    now - recorded.get("timestamp", 0) < app_constants.SEMANTIC_CHECK_PASS_TTL):
+                LOG.info(f"Semantic check {name} skipped, its inputs did not change "
+                         "since it passed")
+                continue
+            remaining.append((name, check, timeout))
+        return remaining
+
+    def _run_semantic_checks(self, checks, fingerprints=None):
+        """Run semantic checks concurrently and report all their failures.
 
-        # Check vswitch configuration
-        self._semantic_check_vswitch_config(conductor_obj.dbapi)
+        Each check runs under its own timeout, and its duration is logged.
+        A check that raises or does not finish in time is a failure. The
+        passes of the fingerprinted checks are recorded, and their failures
+        drop any pass recorded before.
 
-        # Check data network configuration
-        self._semantic_check_datanetwork_config(conductor_obj.dbapi)
+        :param checks: list of (name, check, timeout) tuples
+        :param fingerprints: dict of the fingerprint of the inputs of some of
+                             the checks, by name
+        :raises LifecycleSemanticCheckException: if any check failed, with
+                the messages of all the failed checks
 
-        # Check OIDC configuration when the feature is enabled
-        self._semantic_check_oidc_config(conductor_obj.dbapi)
+        """
+        results = app_utils.run_concurrently(
+            {name: check for name, check, _ in checks},
+            timeouts={name: timeout for name, _, timeout in checks})
+
+        fingerprints = fingerprints or {}
+        passes = {}
+        failures = []
+        for name, (_, error, duration) in results.items():
+            if name in fingerprints:
+                passes[name] = None
+            if error is None:
+                LOG.info(f"Semantic check {name} passed in {duration:.2f}s")
+                if name in fingerprints:
+                    passes[name] = {"fingerprint": fingerprints[name],
+                                    "timestamp": time.time()}
+                continue
+            LOG.info(f"Semantic check {name} failed in {duration:.2f}s")
+            if isinstance(error, exception.LifecycleSemanticCheckException):
+                failures.append(str(error))
+            elif isinstance(error, TimeoutError):
+                failures.append(f"Semantic check {name} did not finish in time.")
+            else:
+                LOG.error(f"Semantic check {name} raised an unexpected error: {error}")
+                failures.append(f"Semantic check {name} failed: {error}")
+
+        if passes:
+            try:
+                app_utils.update_semantic_check_passes(passes)
+            except Exception as e:
+                LOG.warning(f"Unable to record the semantic check passes: {e}")
 
-        # Check NetApp dual-SAN StorageClass sanType configuration
-        self._semantic_check_netapp_san_storageclasses()
+        if len(failures) == 1:
+            raise exception.LifecycleSemanticCheckException(failures[0])
+        elif failures:
+            raise exception.LifecycleSemanticCheckException(
+                f"{len(failures)} semantic checks failed: " +
+                " ".join(f"({index}) {failure}"
+                         for index, failure in enumerate(failures, start=1)))
 
     def _pre_remove_check(self, conductor_obj, app, hook_info):
         """Semantic check for evaluating app manual remove
@@ -501,12 +750,35 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
           backend availability.
         - StorageClass resolution/immutability failures always block.
 
+        The pre-apply check runs the availability and the configuration
+        sub-checks as separate semantic checks, so that only the latter,
+        which does not depend on the live state of the backends, may reuse a
+        previous pass.
+
         Raises:
             LifecycleSemanticCheckException: If any sub-check fails per the
                 blocking rules above.
         """
+        self._semantic_check_storage_backend_availability()
+        self._semantic_check_storage_backend_config()
+
+    def _semantic_check_storage_backend_availability(self):
+        """Probe the strict storage backends and check that one is available.
+
+        Raises:
+            LifecycleSemanticCheckException: no storage backend available for
+                                             openstack deployment.
+        """
         strict_available, status = self._is_strict_backend_available()
         self._semantic_check_storage_backend_available(strict_available, status)
+
+    def _semantic_check_storage_backend_config(self):
+        """Check the secretRefs and StorageClasses of the storage backends.
+
+        Raises:
+            LifecycleSemanticCheckException: If a secretRef, an ESB backup
+                StorageClass or a PVC StorageClass is invalid.
+        """
         self._semantic_check_secretref()
         self._semantic_check_backend_storageclass()
 
@@ -520,20 +792,33 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
         Returns:
             tuple[bool, str]: ``(available, status)`` where ``available`` is True
             when at least one strict backend is available and ready, and
-            ``status`` is a human-readable summary of the probes (reused in the
-            "no storage backends available" error message).
+            ``status`` is a human-readable summary of the probes, with the
+            latency of each one (reused in the "no storage backends
+            available" error message). Probes that fail or do not finish
+            within STRICT_BACKEND_PROBE_TIMEOUT count as unavailable.
         """
-        status = ""
-        fsid_available = False
-        rook_api_available = False
         backend_available = False
+        # The storage backend rows are read first, as they tell which of the
+        # slow Ceph probes are needed. All the remaining probes then run
+        # concurrently, under one deadline.
         ceph_available, _ = app_utils.is_ceph_backend_available(
             ceph_type=constants.SB_TYPE_CEPH
         )
         rook_ceph_available, _ = app_utils.is_ceph_backend_available(
             ceph_type=constants.SB_TYPE_CEPH_ROOK
         )
-        netapp_backends_available = app_utils.check_netapp_backends()
+        probes = {"netapp": app_utils.check_netapp_backends}
+        if rook_ceph_available or ceph_available:
+            probes["fsid"] = app_utils.get_ceph_fsid
+        if rook_ceph_available:
+            probes["rook_api"] = app_utils.is_rook_ceph_api_available
+        results = app_utils.run_concurrently(
+            probes, timeout=app_constants.STRICT_BACKEND_PROBE_TIMEOUT)
+        for name, (_, error, _) in results.items():
+            if error is not None and not isinstance(error, TimeoutError):
+                LOG.error(f"Storage backend probe {name} failed: {error}")
+
+        netapp_backends_available = results["netapp"][0] or {}
         netapp_nfs_available = netapp_backends_available.get(
             app_constants.NETAPP_NFS_BACKEND_NAME,
             False
@@ -552,13 +837,13 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
                  f"netapp_iscsi_available={netapp_iscsi_available}, " \
                  f"netapp_fc_available={netapp_fc_available}"
         if rook_ceph_available:
-            rook_api_available = app_utils.is_rook_ceph_api_available()
-            fsid_available = app_utils.get_ceph_fsid() is not None
+            rook_api_available = results["rook_api"][0] is True
+            fsid_available = results["fsid"][0] is not None
             backend_available = rook_api_available and fsid_available
             status += f", fsid_available={fsid_available}, " \
                       f"rook_api_available={rook_api_available}"
         elif ceph_available:
-            fsid_available = app_utils.get_ceph_fsid() is not None
+            fsid_available = results["fsid"][0] is not None
             backend_available = fsid_available
             status += f", fsid_available={fsid_available}"
 
@@ -569,6 +854,16 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
         elif netapp_fc_available:
             backend_available = True
 
+        latencies = []
+        for name, (_, error, duration) in results.items():
+            latency = f"{name}={duration:.2f}s"
+            if isinstance(error, TimeoutError):
+                latency += " (timed out)"
+            elif error is not None:
+                latency += " (failed)"
+            latencies.append(latency)
+        status += f", probe_latency=[{', '.join(latencies)}]"
+
         return backend_available, status
 
     def _semantic_check_storage_backend_available(self, strict_available,
@@ -1027,18 +1322,35 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
     def _pre_update_backup_actions(self, app):
         """Perform pre update backup actions.
 
+        The snapshots of the MariaDB PVCs of all the controllers are taken
+        concurrently, and the update only goes on once all of them are ready
+        to use. The PVCs that are not on the RBD storage of the snapshot
+        class are not backed up.
+
         :param app: AppOperator.Application object
+        :raises KubeAppApplyFailure: If any of the snapshots failed
 
         """
         # Create mariadb's PVC snapshots
         nc = app_utils.get_number_of_controllers()
         SNAPSHOT_CLASS_NAME = "rbd-snapshot"
 
+        snapshots = {}
         for i in range(0, nc):
             pvc_name = f"mysql-data-mariadb-server-{i}"
-            snapshot_name = f"snapshot-of-{pvc_name}"
-            LOG.info(f"Trying to take a snapshot from PVC {pvc_name}")
-            app_utils.create_pvc_snapshot(snapshot_name, pvc_name, SNAPSHOT_CLASS_NAME, path=app.inst_path)
+            snapshots[f"snapshot-of-{pvc_name}"] = pvc_name
+        LOG.info(f"Trying to take snapshots from PVCs {sorted(snapshots.values())}")
+
+        failures = app_utils.create_pvc_snapshots(snapshots, SNAPSHOT_CLASS_NAME)
+        if failures:
+            raise exception.KubeAppApplyFailure(
+                name=app.name,
+                version=app.version,
+                reason=(
+                    "Unable to back up the MariaDB data before the update: " +
+                    "; ".join(f"{name}: {reason}" for name, reason in sorted(failures.items()))
+                )
+            )
 
     def _recover_actions(self, app_op, app):
         """Perform all recover actions.
@@ -1141,6 +1453,9 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
     def _post_update_image_actions(self, app):
         """Perform post update actions, deleting residual images.
 
+        The images are removed in the background, so the apply does not wait
+        for them.
+
         :param app: AppOperator.Application object
         """
         images_base_dir = app.sync_imgfile.split(app.name)[0]
@@ -1150,7 +1465,7 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
             residual_images = app_utils.get_residual_images(app.sync_imgfile, app.version, app_version_list)
 
             if len(residual_images) > 0:
-                app_utils.delete_residual_images(residual_images)
+                app_utils.start_residual_image_cleanup(residual_images)
 
     def _recover_backup_snapshot(self, app):
         """Perform pre recover backup actions
@@ -1158,15 +1473,20 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
         :param app: AppOperator.Application object
 
         """
-        # Restore mariadb's PVCs if snapshots were taken
+        # Restore mariadb's PVCs if snapshots were taken, scaling the
+        # statefulset down and up only once
         nc = app_utils.get_number_of_controllers()
         STATEFULSET_NAME = "mariadb-server"
 
+        snapshots = {}
         for i in range(0, nc):
             pvc_name = f"mysql-data-mariadb-server-{i}"
-            snapshot_name = f"snapshot-of-{pvc_name}"
-            LOG.info(f"Trying to restore a snapshot from PVC {pvc_name}")
-            app_utils.restore_pvc_snapshot(snapshot_name, pvc_name, STATEFULSET_NAME, path=app.inst_path)
+            snapshots[f"snapshot-of-{pvc_name}"] = pvc_name
+        LOG.info(f"Trying to restore snapshots from PVCs {sorted(snapshots.values())}")
+
+        failures = app_utils.restore_pvc_snapshots(snapshots, STATEFULSET_NAME)
+        for pvc_name, reason in sorted(failures.items()):
+            LOG.error(f"Unable to restore PVC {pvc_name}: {reason}")
 
     def _semantic_check_dc_system_type(self, app):
         """Check what type of DC system is running.
@@ -1223,7 +1543,10 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
                 - If any required chart's priority list resolves to no
                   available backend with a valid StorageClass.
         """
-        for requirement in get_pvc_storageclass_requirements():
+        resolution = get_pvc_storageclass_resolution()
+        LOG.info("PVC StorageClass resolution: "
+                 f"{json.dumps(resolution, sort_keys=True, default=str)}")
+        for requirement in resolution['requirements']:
             if not requirement['storage_class']:
                 raise exception.LifecycleSemanticCheckException(
                     f"Unable to resolve a Kubernetes StorageClass for the "
@@ -1333,24 +1656,11 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
             # Single-SAN or no SAN — sanType is not required
             return
 
-        # Query all StorageClasses for the ontap-san backendType, emitting
-        # name and sanType per line (empty string when sanType is absent).
+        # Query all StorageClasses for the ontap-san backendType, with their
+        # sanType (empty string when sanType is absent).
         driver = app_constants.BACKEND_TYPE_NETAPP_ISCSI  # "ontap-san" — same for FC
-        jsonpath = (
-            f"{{range .items[?(@.parameters.backendType==\"{driver}\")]}}"
-            r"{.metadata.name}"
-            "{\"\t\"}"
-            r"{.parameters.sanType}"
-            "{\"\\n\"}"
-            r"{end}"
-        )
-        cmd = [
-            "kubectl", "--kubeconfig", kubernetes.KUBERNETES_ADMIN_CONF,
-            "get", "storageclass",
-            "-o", f"jsonpath={jsonpath}",
-        ]
         try:
-            output = app_utils.send_cmd_read_response(cmd, log=False)
+            storage_classes = app_utils.get_storage_classes_by_backend_type(driver)
         except Exception as e:
             LOG.warning(
                 f"Unable to query StorageClasses for sanType check: {e}. "
@@ -1358,15 +1668,11 @@ class OpenstackAppLifecycleOperator(base.AppLifecycleOperator):
             )
             return
 
-        if not output:
+        if not storage_classes:
             # No ontap-san StorageClasses present — nothing to validate
             return
 
-        san_types_found = {
-            line.partition("\t")[2].strip()
-            for line in output.splitlines()
-            if line.strip()
-        }
+        san_types_found = {san_type.strip() for _, san_type in storage_classes}
         required_san_types = {
             app_constants.NETAPP_ISCSI_SAN_TYPE,  # "iscsi"
             app_constants.NETAPP_FC_SAN_TYPE,      # "fcp"
@@ -16,6 +16,7 @@ from sysinv.tests.db import base as dbbase
 from sysinv.tests.db import utils as dbutils
 from sysinv.tests.helm import base
 
+from k8sapp_openstack import utils as app_utils
 from k8sapp_openstack.common import constants as app_constants
 from k8sapp_openstack.helm import openstack
 from k8sapp_openstack.tests import test_plugins
@@ -32,6 +33,20 @@ class MockOpenstackHelm(openstack.OpenstackBaseHelm):
         super(MockOpenstackHelm, self).__init__(operator)
 
 
+class MockPasswordsHelm(MockOpenstackHelm):
+    """
+    Proxy object generating several passwords in a single plugin call.
+    """
+    PASSWORD_FIELDS = ['password_1', 'password_2', 'password_3']
+
+    @openstack.apply_scoped
+    def get_overrides(self, namespace=None):
+        return {
+            field: self._get_or_generate_password('chart', 'ns', field)
+            for field in self.PASSWORD_FIELDS
+        }
+
+
 class OpenstackBaseHelmTestCase(test_plugins.K8SAppOpenstackAppMixin,
                                 base.HelmTestCaseMixin):
     def setUp(self):
@@ -298,32 +313,61 @@ class OpenstackHelmUnitTests(OpenstackBaseHelmTestCase,
         self.helm._region_config = mock.Mock(return_value=False)
         self.assertIsNone(self.helm._get_configured_service_type(app_constants.HELM_CHART_KEYSTONE))
 
-    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi.helm_override_get',
-                return_value=mock.Mock(system_overrides={'test': "name"}))
+    @staticmethod
+    def _get_mock_override(name, namespace, system_overrides):
+        override = mock.Mock(namespace=namespace, system_overrides=system_overrides)
+        override.name = name
+        return override
+
     @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.context', new={})
     @mock.patch('sysinv.common.utils.find_openstack_app', return_value=mock.Mock(id=1))
     def test_get_or_generate_password(self, *_):
         """Tests on general purpose password retrieval or generation."""
-        pw = self.helm._get_or_generate_password('chart', 'ns', 'test')
+        with mock.patch.object(
+                self.helm.dbapi,
+                'helm_override_get_all',
+                return_value=[self._get_mock_override('chart', 'ns', {'test': "name"})]):
+            pw = self.helm._get_or_generate_password('chart', 'ns', 'test')
         self.assertEqual(pw, b'name')
 
     @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.context', new={})
+    @mock.patch('sysinv.common.utils.find_openstack_app', return_value=mock.Mock(id=1))
+    def test_get_or_generate_password_reads_overrides_once(self, *_):
+        """Tests that the chart overrides are read with a single query for the whole pass."""
+        with mock.patch.object(
+                self.helm.dbapi,
+                'helm_override_get_all',
+                return_value=[
+                    self._get_mock_override('chart', 'ns', {'test': "name"}),
+                    self._get_mock_override('other', 'ns', {'test': "other_name"}),
+                ]) as mock_helm_override_get_all, \
+            mock.patch.object(self.helm.dbapi, 'helm_override_get') as mock_helm_override_get:
+            self.assertEqual(self.helm._get_or_generate_password('chart', 'ns', 'test'), b'name')
+            self.assertEqual(self.helm._get_or_generate_password('other', 'ns', 'test'), b'other_name')
+            mock_helm_override_get_all.assert_called_once_with(app_id=1)
+            mock_helm_override_get.assert_not_called()
+
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.context', new={})
     @mock.patch('sysinv.common.utils.find_openstack_app', return_value=mock.Mock(id=1,))
     def test_get_or_generate_password_fails_to_retrieve_and_create_overrides(self, *_):
         """Tests on general purpose password retrieval or generation. When it fails to get chart
         overrides and its password and also fails to create them, this method should return None"""
         with mock.patch.object(
                 self.helm.dbapi,
-                'helm_override_get') as mock_helm_override_get, \
+                'helm_override_get_all') as mock_helm_override_get_all, \
             mock.patch.object(
                 self.helm.dbapi,
                 'helm_override_create') as mock_helm_override_create:
-            mock_helm_override_get.side_effect = exception.HelmOverrideNotFound("test")
+            mock_helm_override_get_all.return_value = []
             mock_helm_override_create.side_effect = Exception("test_case: error creating overrides")
             result = self.helm._get_or_generate_password('chart', 'ns', 'test')
             assert result is None
 
     @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.context', new={})
     @mock.patch('sysinv.common.utils.find_openstack_app', return_value=mock.Mock(id=1))
     @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm._generate_random_password',
                 return_value="generated_password")
@@ -333,8 +377,8 @@ class OpenstackHelmUnitTests(OpenstackBaseHelmTestCase,
         with mock.patch.object(self.helm.dbapi, 'helm_override_update', side_effect=Exception(
                 "test case: failed to store override")) as mock_helm_override_update, \
             mock.patch.object(self.helm.dbapi, 'kube_app_get_inactive', return_value=[]), \
-            mock.patch.object(self.helm.dbapi, 'helm_override_get', return_value=mock.Mock(
-                system_overrides={'key_dummy': 'value_dummy'})):
+            mock.patch.object(self.helm.dbapi, 'helm_override_get_all', return_value=[
+                self._get_mock_override('chart', 'ns', {'key_dummy': 'value_dummy'})]):
             pw = self.helm._get_or_generate_password('chart', 'ns', 'test_password_field')
             mock_helm_override_update.assert_called_once_with(
                 app_id=1,
@@ -350,24 +394,27 @@ class OpenstackHelmUnitTests(OpenstackBaseHelmTestCase,
             self.assertEqual(pw, b'generated_password')
 
     @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.context', new={})
     @mock.patch('sysinv.common.utils.find_openstack_app', return_value=mock.Mock(id=1))
     @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm._generate_random_password',
                 return_value="generated_password")
     def test_get_or_generate_password_gets_from_inactive_app(self, *_):
         """Tests on general purpose password retrieval or generation. In this case it retrieves the
         override values from inactive app."""
+        overrides_by_app = {
+            1: [self._get_mock_override('chart', 'ns', {'key_dummy': 'value_dummy'})],
+            2: [self._get_mock_override('chart', 'ns', {'pw_field': 'pw_from_inactive_app'})],
+        }
         with mock.patch.object(self.helm.dbapi,
                                'helm_override_update'
                                ) as mock_helm_override_update, \
             mock.patch.object(self.helm.dbapi,
                               'kube_app_get_inactive',
-                              return_value=[mock.Mock(id=1)]
+                              return_value=[mock.Mock(id=2)]
                               ), \
             mock.patch.object(self.helm.dbapi,
-                              'helm_override_get',
-                              side_effect=[
-                                  mock.Mock(system_overrides={'key_dummy': 'value_dummy'}),
-                                  mock.Mock(system_overrides={'pw_field': 'pw_from_inactive_app'})]
+                              'helm_override_get_all',
+                              side_effect=lambda app_id: overrides_by_app[app_id]
                               ):
             pw = self.helm._get_or_generate_password('chart', 'ns', 'pw_field')
             mock_helm_override_update.assert_called_once_with(
@@ -383,6 +430,76 @@ class OpenstackHelmUnitTests(OpenstackBaseHelmTestCase,
             )
             self.assertEqual(pw, b'pw_from_inactive_app')
 
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.context', new={})
+    @mock.patch('sysinv.common.utils.find_openstack_app', return_value=mock.Mock(id=1))
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm._generate_random_password',
+                return_value="generated_password")
+    def test_get_or_generate_password_batches_updates(self, *_):
+        """Tests that the passwords generated during a plugin call are stored with a single
+        update per chart, and that the inactive app is looked up only once."""
+        helm = MockPasswordsHelm(self.operator)
+        with mock.patch.object(helm.dbapi,
+                               'helm_override_update'
+                               ) as mock_helm_override_update, \
+            mock.patch.object(helm.dbapi,
+                              'kube_app_get_inactive',
+                              return_value=[]
+                              ) as mock_kube_app_get_inactive, \
+            mock.patch.object(helm.dbapi,
+                              'helm_override_get_all',
+                              return_value=[self._get_mock_override('chart', 'ns', {})]
+                              ):
+            overrides = helm.get_overrides()
+            mock_kube_app_get_inactive.assert_called_once()
+            mock_helm_override_update.assert_called_once_with(
+                app_id=1,
+                name='chart',
+                namespace='ns',
+                values={
+                    'system_overrides': {
+                        'password_1': 'generated_password',
+                        'password_2': 'generated_password',
+                        'password_3': 'generated_password',
+                    }
+                }
+            )
+        self.assertEqual(overrides, {
+            'password_1': b'generated_password',
+            'password_2': b'generated_password',
+            'password_3': b'generated_password',
+        })
+
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    @mock.patch('sysinv.common.utils.find_openstack_app', return_value=mock.Mock(id=1))
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm._generate_random_password',
+                return_value="generated_password")
+    def test_get_overrides_per_pass_in_lifecycle_scope(self, *_):
+        """Tests that a pass run inside a lifecycle hook stores its generated passwords, which the
+        later calls of the pass read, and that the next pass reads the overrides again."""
+        helm = MockPasswordsHelm(self.operator)
+        context = {}
+        with mock.patch.object(openstack.OpenstackBaseHelm, 'context', new=context), \
+            mock.patch.object(helm.dbapi,
+                              'helm_override_update'
+                              ) as mock_helm_override_update, \
+            mock.patch.object(helm.dbapi, 'kube_app_get_inactive', return_value=[]), \
+            mock.patch.object(helm.dbapi,
+                              'helm_override_get_all',
+                              return_value=[self._get_mock_override('chart', 'ns', {})]
+                              ) as mock_helm_override_get_all, \
+                app_utils.apply_scope():
+            first = helm.get_overrides()
+            mock_helm_override_update.assert_called_once()
+            self.assertEqual(helm.get_overrides(), first)
+            mock_helm_override_update.assert_called_once()
+            mock_helm_override_get_all.assert_called_once_with(app_id=1)
+
+            # The next pass gets a new helm context
+            context.clear()
+            helm.get_overrides()
+            self.assertEqual(mock_helm_override_get_all.call_count, 2)
+
     @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=None)
     def test_get_or_generate_password_dbapi_unavailable(self, *_):
         """Tests on general purpose password retrieval or generation. When dbapi not available this
@@ -770,6 +887,81 @@ class OpenstackHelmUnitTests(OpenstackBaseHelmTestCase,
         self.assertEqual(len(result[2]), 1)
         self.assertEqual(len(result[3]), 2)
 
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    def test_get_inventory_shared_in_apply_scope(self, *_):
+        """Tests that inventory tables are read once while an apply scope is active."""
+        with mock.patch.object(self.helm.dbapi, 'label_get_all',
+                               return_value=[mock.Mock(host_id=1), mock.Mock(host_id=1)]
+                               ) as mock_label_get_all, \
+            mock.patch.object(self.helm.dbapi, 'iinterface_get_list',
+                              return_value=[mock.Mock(id=10, forihostid=1),
+                                            mock.Mock(id=20, forihostid=2)]
+                              ) as mock_iinterface_get_list, \
+            mock.patch.object(self.helm.dbapi, 'addresses_get_all',
+                              return_value=[mock.Mock(interface_id=10),
+                                            mock.Mock(interface_id=20),
+                                            mock.Mock(interface_id=30)]):
+            with app_utils.apply_scope():
+                labels = self.helm._get_host_labels()
+                self.assertIs(self.helm._get_host_labels(), labels)
+                interfaces = self.helm._get_host_interfaces()
+                addresses = self.helm._get_host_addresses()
+
+            mock_label_get_all.assert_called_once()
+            mock_iinterface_get_list.assert_called_once()
+
+        self.assertEqual(len(labels[1]), 2)
+        self.assertEqual(len(interfaces[1]), 1)
+        self.assertEqual(len(interfaces[2]), 1)
+        self.assertEqual(sorted(addresses), [1, 2])
+        with self.assertRaises(TypeError):
+            labels[2] = []
+
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    def test_get_inventory_outside_apply_scope(self, *_):
+        """Tests that inventory tables are read again outside of an apply scope."""
+        with mock.patch.object(self.helm.dbapi, 'label_get_all',
+                               return_value=[]) as mock_label_get_all:
+            self.helm._get_host_labels()
+            self.helm._get_host_labels()
+            self.assertEqual(mock_label_get_all.call_count, 2)
+
+    @mock.patch('k8sapp_openstack.helm.openstack.OpenstackBaseHelm.dbapi', new=mock.Mock())
+    def test_get_host_interfaces_sorted(self, *_):
+        """Tests that interfaces are sorted per host when a sort key is supplied."""
+        with mock.patch.object(self.helm.dbapi, 'iinterface_get_list',
+                               return_value=[mock.Mock(id=3, forihostid=1),
+                                             mock.Mock(id=1, forihostid=1),
+                                             mock.Mock(id=2, forihostid=2)]):
+            result = self.helm._get_host_interfaces(sort_key=lambda iface: iface.id)
+        self.assertEqual([iface.id for iface in result[1]], [1, 3])
+        self.assertEqual([iface.id for iface in result[2]], [2])
+
+    def test_group_per_host_overrides(self, *_):
+        """Tests that hosts with an identical configuration are grouped."""
+        result = self.helm._group_per_host_overrides([
+            ('compute-0', {'a': {'x': 1, 'y': 2}}),
+            ('compute-1', {'b': 1}),
+            ('compute-2', {'a': {'y': 2, 'x': 1}}),
+            ('compute-3', {'b': 1}),
+            ('compute-4', {'c': None}),
+        ])
+        self.assertEqual(result, [
+            {'conf': {'a': {'x': 1, 'y': 2}}, 'name': ['compute-0', 'compute-2']},
+            {'conf': {'b': 1}, 'name': ['compute-1', 'compute-3']},
+            {'conf': {'c': None}, 'name': ['compute-4']},
+        ])
+
+    def test_group_per_host_overrides_empty(self, *_):
+        """Tests grouping with no hosts."""
+        self.assertEqual(self.helm._group_per_host_overrides([]), [])
+
+    def test_sorted_hosts(self, *_):
+        """Tests that hosts are ordered by id."""
+        hosts = [mock.Mock(id=3), mock.Mock(id=1), mock.Mock(id=2)]
+        result = self.helm._sorted_hosts(hosts)
+        self.assertEqual([host.id for host in result], [1, 2, 3])
+
     def test_oslo_multistring_override_empty_values_or_name(self, *_):
         """Tests oslo multistring override with empty values or name."""
         result = self.helm._oslo_multistring_override(None, ["test"])
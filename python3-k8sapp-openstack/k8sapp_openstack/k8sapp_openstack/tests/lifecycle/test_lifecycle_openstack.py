@@ -4,6 +4,9 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+import threading
+import time
+
 import mock
 from sysinv.common import constants
 from sysinv.common import exception
@@ -107,6 +110,55 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
         mock_check_netapp_backends.assert_called()
         mock_get_ceph_fsid.assert_called()
 
+    @mock.patch.object(app_constants, 'STRICT_BACKEND_PROBE_TIMEOUT', 0.1)
+    @mock.patch('k8sapp_openstack.utils.check_netapp_backends',
+                return_value={app_constants.NETAPP_NFS_BACKEND_NAME: False,
+                              app_constants.NETAPP_ISCSI_BACKEND_NAME: False,
+                              app_constants.NETAPP_FC_BACKEND_NAME: False})
+    @mock.patch('k8sapp_openstack.utils.is_rook_ceph_api_available',
+                return_value=True)
+    @mock.patch('k8sapp_openstack.utils.get_ceph_fsid')
+    @mock.patch('k8sapp_openstack.utils.is_ceph_backend_available')
+    def test_is_strict_backend_available_probe_timeout(
+        self,
+        mock_is_ceph_backend_available,
+        mock_get_ceph_fsid,
+        *_
+    ):
+        """ Test that a hung probe does not block the check past the deadline
+        and is reported, with the latency of every probe, in the status.
+        """
+        release = threading.Event()
+        self.addCleanup(release.set)
+        mock_get_ceph_fsid.side_effect = release.wait
+        mock_is_ceph_backend_available.side_effect = \
+            self._rook_ceph_backend_available
+        available, status = self.lifecycle._is_strict_backend_available()
+        self.assertFalse(available)
+        self.assertIn("fsid_available=False", status)
+        self.assertIn("rook_api_available=True", status)
+        self.assertRegex(status, r"probe_latency=\[netapp=[0-9.]+s, "
+                                 r"fsid=[0-9.]+s \(timed out\), rook_api=[0-9.]+s\]")
+
+    @mock.patch('k8sapp_openstack.utils.check_netapp_backends',
+                side_effect=Exception("kubectl failed"))
+    @mock.patch('k8sapp_openstack.utils.get_ceph_fsid',
+                return_value='aa8c8da0-47de-4fad-8b5d-2c06be236fc8')
+    @mock.patch('k8sapp_openstack.utils.is_ceph_backend_available')
+    def test_is_strict_backend_available_probe_failure(
+        self,
+        mock_is_ceph_backend_available,
+        *_
+    ):
+        """ Test that a failed NetApp probe does not hide an available Ceph.
+        """
+        mock_is_ceph_backend_available.side_effect = \
+            self._ceph_backend_available
+        available, status = self.lifecycle._is_strict_backend_available()
+        self.assertTrue(available)
+        self.assertIn("netapp_nfs_available=False", status)
+        self.assertRegex(status, r"netapp=[0-9.]+s \(failed\)")
+
     @mock.patch('k8sapp_openstack.utils.get_backends_conf', return_value={})
     @mock.patch('k8sapp_openstack.utils.get_enabled_storage_backends_from_override',
                 return_value=[])
@@ -399,17 +451,29 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
         SNAPSHOT_NAME_PREFIX = 'snapshot-of'
         SNAPSHOT_CLASS_NAME = "rbd-snapshot"
 
-        calls = []
+        snapshots = {}
         for i in range(0, number_of_controllers):
             pvc_name = f"{PVC_PREFIX}-{i}"
             snapshot_name = f"{SNAPSHOT_NAME_PREFIX}-{pvc_name}"
-            calls.append(mock.call(snapshot_name, pvc_name, SNAPSHOT_CLASS_NAME, path=app.inst_path))
+            snapshots[snapshot_name] = pvc_name
 
         mock_app_utils.get_number_of_controllers.return_value = number_of_controllers
+        mock_app_utils.create_pvc_snapshots.return_value = {}
 
         self.lifecycle._pre_update_backup_actions(app)
 
-        mock_app_utils.create_pvc_snapshot.assert_has_calls(calls)
+        mock_app_utils.create_pvc_snapshots.assert_called_once_with(snapshots, SNAPSHOT_CLASS_NAME)
+
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.app_utils')
+    def test__pre_update_backup_actions_failed_snapshot(self, mock_app_utils, *_):
+        """Test that the update fails when a snapshot is not ready to use."""
+        app = mock.Mock(inst_path='test_path')
+        mock_app_utils.get_number_of_controllers.return_value = 2
+        mock_app_utils.create_pvc_snapshots.return_value = {
+            'snapshot-of-mysql-data-mariadb-server-1': 'the snapshot reported an error'}
+
+        self.assertRaises(exception.KubeAppApplyFailure,
+                          self.lifecycle._pre_update_backup_actions, app)
 
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.app_utils')
     def test__recover_backup_snapshot(self, mock_app_utils, *_):
@@ -421,17 +485,18 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
         SNAPSHOT_NAME_PREFIX = 'snapshot-of'
         STATEFULSET_NAME = 'mariadb-server'
 
-        calls = []
+        snapshots = {}
         for i in range(0, number_of_controllers):
             pvc_name = f"{PVC_PREFIX}-{i}"
             snapshot_name = f"{SNAPSHOT_NAME_PREFIX}-{pvc_name}"
-            calls.append(mock.call(snapshot_name, pvc_name, STATEFULSET_NAME, path=app.inst_path))
+            snapshots[snapshot_name] = pvc_name
 
         mock_app_utils.get_number_of_controllers.return_value = number_of_controllers
+        mock_app_utils.restore_pvc_snapshots.return_value = {}
 
         self.lifecycle._recover_backup_snapshot(app)
 
-        mock_app_utils.restore_pvc_snapshot.assert_has_calls(calls)
+        mock_app_utils.restore_pvc_snapshots.assert_called_once_with(snapshots, STATEFULSET_NAME)
 
     def test__recover_actions(self, *_):
         """Test _recover_actions
@@ -448,8 +513,9 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
         self.lifecycle._recover_app_resources_failed_update.\
             assert_called_once_with(app_op, app)
 
+    @mock.patch('k8sapp_openstack.utils.start_kube_watch_caches')
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.lifecycle_utils')
-    def test__app_lifecycle_actions(self, mock_lifecycle_utils, *_):
+    def test__app_lifecycle_actions(self, mock_lifecycle_utils, mock_start_caches, *_):
         app = mock.Mock()
         app.name = 'test'
 
@@ -653,6 +719,7 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
         for case in cases:
             hook_info = case['hook_info']
             self.lifecycle.app_lifecycle_actions(None, 'conductor_obj_test', None, app, hook_info)
+            mock_start_caches.assert_called()
 
             for assertion in case['assertions']:
                 assertion()
@@ -669,7 +736,7 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
 
         mocked_methods = [
             mock_app_utils.get_residual_images,
-            mock_app_utils.delete_residual_images,
+            mock_app_utils.start_residual_image_cleanup,
         ]
 
         cases = [
@@ -678,7 +745,7 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
                 'residual_images': [],
                 'assertions': [
                     mock_app_utils.get_residual_images.assert_not_called,
-                    mock_app_utils.delete_residual_images.assert_not_called,
+                    mock_app_utils.start_residual_image_cleanup.assert_not_called,
                 ]
             },
             {
@@ -686,7 +753,7 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
                 'residual_images': [],
                 'assertions': [
                     mock_app_utils.get_residual_images.assert_called_once,
-                    mock_app_utils.delete_residual_images.assert_not_called,
+                    mock_app_utils.start_residual_image_cleanup.assert_not_called,
                 ]
             },
             {
@@ -694,7 +761,7 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
                 'residual_images': ['test'],
                 'assertions': [
                     mock_app_utils.get_residual_images.assert_called_once,
-                    mock_app_utils.delete_residual_images.assert_called_once
+                    mock_app_utils.start_residual_image_cleanup.assert_called_once
                 ]
             },
         ]
@@ -1388,6 +1455,253 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
             mock.Mock()
         )
 
+    def _mock_pre_apply_checks(self, **side_effects):
+        """Mock all the pre-apply semantic checks, with optional side effects."""
+        checks = {}
+        for name in ('_semantic_check_dc_system_type',
+                     '_semantic_check_storage_backend_availability',
+                     '_semantic_check_storage_backend_config',
+                     '_semantic_check_vswitch_config',
+                     '_semantic_check_datanetwork_config',
+                     '_semantic_check_oidc_config',
+                     '_semantic_check_netapp_san_storageclasses'):
+            checks[name] = mock.Mock(side_effect=side_effects.get(name))
+            setattr(self.lifecycle, name, checks[name])
+        self.lifecycle._get_oidc_check_timeout = mock.Mock(
+            return_value=self.lifecycle.SEMANTIC_CHECK_TIMEOUT)
+        return checks
+
+    @mock.patch('k8sapp_openstack.utils.get_dex_health_check_config')
+    def test_get_oidc_check_timeout(self, mock_health_cfg):
+        """ Test that the OIDC check gets the time of the Dex health check retries. """
+        mock_health_cfg.return_value = {"timeout": 30, "retries": 5}
+        self.assertEqual(self.lifecycle._get_oidc_check_timeout(),
+                         300 + self.lifecycle.SEMANTIC_CHECK_TIMEOUT)
+
+        mock_health_cfg.return_value = {"timeout": "invalid", "retries": 5}
+        self.assertEqual(
+            self.lifecycle._get_oidc_check_timeout(),
+            2 * app_constants.DEX_HEALTH_CHECK_DEFAULT_TIMEOUT *
+            app_constants.DEX_HEALTH_CHECK_DEFAULT_RETRIES +
+            self.lifecycle.SEMANTIC_CHECK_TIMEOUT)
+
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.is_host_simplex_controller',
+                return_value=False)
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.HostHelper.get_active_controller')
+    def test_pre_apply_check_runs_all_checks(self, *_):
+        """ Test that the pre-apply check runs every semantic check. """
+        conductor_obj = mock.Mock()
+        app = mock.Mock()
+        checks = self._mock_pre_apply_checks()
+
+        self.lifecycle._pre_apply_check(conductor_obj, app, mock.Mock())
+
+        checks['_semantic_check_dc_system_type'].assert_called_once_with(app)
+        checks['_semantic_check_storage_backend_availability'].assert_called_once_with()
+        checks['_semantic_check_storage_backend_config'].assert_called_once_with()
+        checks['_semantic_check_vswitch_config'].assert_called_once_with(conductor_obj.dbapi)
+        checks['_semantic_check_datanetwork_config'].assert_called_once_with(conductor_obj.dbapi)
+        checks['_semantic_check_oidc_config'].assert_called_once_with(conductor_obj.dbapi)
+        checks['_semantic_check_netapp_san_storageclasses'].assert_called_once_with()
+
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.is_host_simplex_controller',
+                return_value=False)
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.HostHelper.get_active_controller')
+    def test_pre_apply_check_reports_all_failures(self, *_):
+        """ Test that the failures of all the semantic checks are reported together. """
+        checks = self._mock_pre_apply_checks(
+            _semantic_check_vswitch_config=exception.LifecycleSemanticCheckException(
+                "There are no openstack-enabled compute nodes"),
+            _semantic_check_oidc_config=exception.LifecycleSemanticCheckException(
+                "Dex health check failed."),
+        )
+
+        with self.assertRaises(exception.LifecycleSemanticCheckException) as ctx:
+            self.lifecycle._pre_apply_check(mock.Mock(), mock.Mock(), mock.Mock())
+
+        message = str(ctx.exception)
+        self.assertIn("2 semantic checks failed", message)
+        self.assertIn("(1) There are no openstack-enabled compute nodes", message)
+        self.assertIn("(2) Dex health check failed.", message)
+        for check in checks.values():
+            check.assert_called_once()
+
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.is_host_simplex_controller',
+                return_value=False)
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.HostHelper.get_active_controller')
+    def test_pre_apply_check_single_failure(self, *_):
+        """ Test that a single failure keeps the message of its check. """
+        self._mock_pre_apply_checks(
+            _semantic_check_dc_system_type=exception.LifecycleSemanticCheckException(
+                "Unsupported system type"))
+
+        with self.assertRaises(exception.LifecycleSemanticCheckException) as ctx:
+            self.lifecycle._pre_apply_check(mock.Mock(), mock.Mock(), mock.Mock())
+        self.assertEqual(str(ctx.exception), "Unsupported system type")
+
+    def test_run_semantic_checks_concurrently(self):
+        """ Test that the semantic checks run concurrently, each under its own timeout. """
+        barrier = threading.Barrier(2, timeout=5)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        checks = [
+            ("first", barrier.wait, 10),
+            ("second", barrier.wait, 10),
+            ("hung", release.wait, 0.1),
+        ]
+
+        with self.assertRaises(exception.LifecycleSemanticCheckException) as ctx:
+            self.lifecycle._run_semantic_checks(checks)
+        self.assertEqual(str(ctx.exception),
+                         "Semantic check hung did not finish in time.")
+
+    def _run_pre_apply_check(self, mode, fingerprints, passes=None):
+        """Run the pre-apply check with mocked semantic check fingerprints and passes."""
+        self.lifecycle._get_semantic_check_fingerprints = mock.Mock(return_value=fingerprints)
+        with mock.patch('k8sapp_openstack.utils.get_semantic_check_passes',
+                        return_value=passes or {}) as mock_get_passes, \
+                mock.patch('k8sapp_openstack.utils.update_semantic_check_passes') as mock_update:
+            self.lifecycle._pre_apply_check(mock.Mock(), mock.Mock(), mock.Mock(mode=mode))
+        return mock_get_passes, mock_update
+
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.is_host_simplex_controller',
+                return_value=False)
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.HostHelper.get_active_controller')
+    def test_pre_apply_check_auto_skips_passed_checks(self, *_):
+        """ Test that automatic reapplies skip the checks that passed with the same inputs. """
+        checks = self._mock_pre_apply_checks()
+        passes = {
+            'vswitch_config': {'fingerprint': 'vswitch', 'timestamp': time.time()},
+            'oidc_config': {'fingerprint': 'old-oidc', 'timestamp': time.time()},
+        }
+
+        _, mock_update = self._run_pre_apply_check(
+            LifecycleConstants.APP_LIFECYCLE_MODE_AUTO,
+            {'vswitch_config': 'vswitch', 'oidc_config': 'oidc'}, passes)
+
+        checks['_semantic_check_vswitch_config'].assert_not_called()
+        for name, check in checks.items():
+            if name != '_semantic_check_vswitch_config':
+                check.assert_called_once()
+        mock_update.assert_called_once_with(
+            {'oidc_config': {'fingerprint': 'oidc', 'timestamp': mock.ANY}})
+
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.is_host_simplex_controller',
+                return_value=False)
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.HostHelper.get_active_controller')
+    def test_pre_apply_check_auto_probes_storage_backends(self, *_):
+        """ Test that automatic reapplies probe the storage backends even if their rows did not
+        change since the storage backends check passed. """
+        checks = self._mock_pre_apply_checks()
+        # Run the actual availability check, with a failing probe
+        del self.lifecycle._semantic_check_storage_backend_availability
+        self.lifecycle._is_strict_backend_available = mock.Mock(
+            return_value=(False, "ceph_available=True, fsid_available=False"))
+        self.lifecycle._validate_esb_backend_configs = mock.Mock(return_value=(False, []))
+        passes = {'storage_backends': {'fingerprint': 'storage', 'timestamp': time.time()}}
+
+        with self.assertRaises(exception.LifecycleSemanticCheckException) as ctx:
+            self._run_pre_apply_check(LifecycleConstants.APP_LIFECYCLE_MODE_AUTO,
+                                      {'storage_backends': 'storage'}, passes)
+
+        self.assertIn("No storage backends available", str(ctx.exception))
+        self.lifecycle._is_strict_backend_available.assert_called_once_with()
+        checks['_semantic_check_storage_backend_config'].assert_not_called()
+
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.is_host_simplex_controller',
+                return_value=False)
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.HostHelper.get_active_controller')
+    def test_pre_apply_check_auto_expired_pass(self, *_):
+        """ Test that passes older than their TTL are not reused. """
+        checks = self._mock_pre_apply_checks()
+        expired = time.time() - app_constants.SEMANTIC_CHECK_PASS_TTL - 1
+        passes = {'vswitch_config': {'fingerprint': 'vswitch', 'timestamp': expired}}
+
+        self._run_pre_apply_check(LifecycleConstants.APP_LIFECYCLE_MODE_AUTO,
+                                  {'vswitch_config': 'vswitch'}, passes)
+
+        checks['_semantic_check_vswitch_config'].assert_called_once()
+
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.is_host_simplex_controller',
+                return_value=False)
+    @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.utils.HostHelper.get_active_controller')
+    def test_pre_apply_check_manual_runs_all_checks(self, *_):
+        """ Test that manual applies run every check and record the passes. """
+        checks = self._mock_pre_apply_checks(
+            _semantic_check_oidc_config=exception.LifecycleSemanticCheckException(
+                "Dex health check failed."))
+        passes = {'vswitch_config': {'fingerprint': 'vswitch', 'timestamp': time.time()}}
+
+        with self.assertRaises(exception.LifecycleSemanticCheckException):
+            self._run_pre_apply_check(LifecycleConstants.APP_LIFECYCLE_MODE_MANUAL,
+                                      {'vswitch_config': 'vswitch', 'oidc_config': 'oidc'},
+                                      passes)
+
+        for check in checks.values():
+            check.assert_called_once()
+
+    def test_run_semantic_checks_records_passes(self):
+        """ Test that passes are recorded and failures drop the previous passes. """
+        checks = [
+            ("passed", mock.Mock(), 10),
+            ("failed", mock.Mock(side_effect=exception.LifecycleSemanticCheckException("x")), 10),
+            ("unfingerprinted", mock.Mock(), 10),
+        ]
+
+        with mock.patch('k8sapp_openstack.utils.update_semantic_check_passes') as mock_update:
+            self.assertRaises(exception.LifecycleSemanticCheckException,
+                              self.lifecycle._run_semantic_checks, checks,
+                              {"passed": "a", "failed": "b"})
+
+        mock_update.assert_called_once_with({
+            "passed": {"fingerprint": "a", "timestamp": mock.ANY},
+            "failed": None,
+        })
+
+    @mock.patch('k8sapp_openstack.utils.get_user_override',
+                side_effect=lambda *args, **kwargs: kwargs.get('default_value'))
+    @mock.patch('k8sapp_openstack.utils.get_trident_backends', return_value=[])
+    @mock.patch('k8sapp_openstack.utils.get_storage_classes')
+    @mock.patch('k8sapp_openstack.utils.get_interface_datanets', return_value=[])
+    @mock.patch('k8sapp_openstack.utils.get_app_helm_overrides', return_value={})
+    def test_get_semantic_check_fingerprints(self, _, __, mock_get_storage_classes, *___):
+        """ Test that the fingerprints only change with the inputs of their checks. """
+        dbapi = mock.Mock()
+        dbapi.ihost_get_list.return_value = [
+            mock.Mock(spec=["id", "hostname", "personality"],
+                      id=1, hostname="controller-0", personality="controller")]
+        dbapi.label_get_all.return_value = [
+            mock.Mock(spec=["host_id", "label_key", "label_value"],
+                      host_id=1, label_key="openstack-compute-node", label_value="enabled")]
+        dbapi.service_parameter_get_all.return_value = []
+        dbapi.storage_backend_get_list.return_value = []
+        mock_get_storage_classes.return_value = [
+            {"metadata": {"name": "general", "resourceVersion": "1"}}]
+        names = ["dc_system_type", "vswitch_config", "oidc_config", "storage_backends"]
+
+        fingerprints = self.lifecycle._get_semantic_check_fingerprints(dbapi, mock.Mock(), names)
+        self.assertEqual(set(fingerprints), {"vswitch_config", "oidc_config", "storage_backends"})
+        self.assertEqual(
+            self.lifecycle._get_semantic_check_fingerprints(dbapi, mock.Mock(), names),
+            fingerprints)
+
+        dbapi.label_get_all.return_value[0].label_value = "disabled"
+        mock_get_storage_classes.return_value[0]["metadata"]["resourceVersion"] = "2"
+        changed = self.lifecycle._get_semantic_check_fingerprints(dbapi, mock.Mock(), names)
+        self.assertNotEqual(changed["vswitch_config"], fingerprints["vswitch_config"])
+        self.assertNotEqual(changed["storage_backends"], fingerprints["storage_backends"])
+        self.assertEqual(changed["oidc_config"], fingerprints["oidc_config"])
+
+    def test_get_semantic_check_fingerprints_unreadable_input(self):
+        """ Test that checks whose inputs can't be read are not fingerprinted. """
+        dbapi = mock.Mock()
+        dbapi.ihost_get_list.side_effect = Exception("database unavailable")
+        dbapi.label_get_all.return_value = []
+
+        fingerprints = self.lifecycle._get_semantic_check_fingerprints(
+            dbapi, mock.Mock(), ["vswitch_config"])
+        self.assertEqual(fingerprints, {})
+
     @mock.patch('k8sapp_openstack.helpers.ldap.check_group', return_value=False)
     @mock.patch('k8sapp_openstack.helpers.ldap.add_group', return_value=True)
     @mock.patch('k8sapp_openstack.utils.create_clients_working_directory', return_value=True)
@@ -1939,31 +2253,31 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
         except exception.LifecycleSemanticCheckException as e:
             self.assertIn("rabbitmq", str(e).lower())
 
-    @mock.patch("k8sapp_openstack.lifecycle.lifecycle_openstack.get_pvc_storageclass_requirements")
+    @mock.patch("k8sapp_openstack.lifecycle.lifecycle_openstack.get_pvc_storageclass_resolution")
     def test_check_storageclass_resolution_pass(
         self,
-        mock_get_requirements,
+        mock_get_resolution,
     ):
         """Resolution check passes when every requirement resolves a StorageClass."""
-        mock_get_requirements.return_value = [
+        mock_get_resolution.return_value = {'volume_backends': [], 'requirements': [
             {'chart': 'mariadb', 'priority_list': ['ceph'], 'storage_class': 'general'},
             {'chart': 'rabbitmq', 'priority_list': ['ceph'], 'storage_class': 'general'},
-        ]
+        ]}
         self.assertIsNone(self.lifecycle._check_storageclass_resolution())
 
-    @mock.patch("k8sapp_openstack.lifecycle.lifecycle_openstack.get_pvc_storageclass_requirements")
+    @mock.patch("k8sapp_openstack.lifecycle.lifecycle_openstack.get_pvc_storageclass_resolution")
     def test_check_storageclass_resolution_mariadb_unresolved_raises(
         self,
-        mock_get_requirements,
+        mock_get_resolution,
     ):
         """Resolution check blocks apply and names the chart + priority list."""
-        mock_get_requirements.return_value = [
+        mock_get_resolution.return_value = {'volume_backends': [], 'requirements': [
             {
                 'chart': 'mariadb',
                 'priority_list': ['unknown-backend'],
                 'storage_class': None,
             },
-        ]
+        ]}
         try:
             self.lifecycle._check_storageclass_resolution()
             self.fail("Expected LifecycleSemanticCheckException")
@@ -1972,13 +2286,13 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
             self.assertIn("mariadb", msg)
             self.assertIn("unknown-backend", msg)
 
-    @mock.patch("k8sapp_openstack.lifecycle.lifecycle_openstack.get_pvc_storageclass_requirements")
+    @mock.patch("k8sapp_openstack.lifecycle.lifecycle_openstack.get_pvc_storageclass_resolution")
     def test_check_storageclass_resolution_glance_pvc_unresolved_raises(
         self,
-        mock_get_requirements,
+        mock_get_resolution,
     ):
         """Glance PVC-mode with an unresolvable priority list blocks apply."""
-        mock_get_requirements.return_value = [
+        mock_get_resolution.return_value = {'volume_backends': [], 'requirements': [
             {'chart': 'mariadb', 'priority_list': ['ceph'], 'storage_class': 'general'},
             {'chart': 'rabbitmq', 'priority_list': ['ceph'], 'storage_class': 'general'},
             {
@@ -1986,20 +2300,20 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
                 'priority_list': ['dell-nfs'],
                 'storage_class': None,
             },
-        ]
+        ]}
         try:
             self.lifecycle._check_storageclass_resolution()
             self.fail("Expected LifecycleSemanticCheckException")
         except exception.LifecycleSemanticCheckException as e:
             self.assertIn("glance", str(e).lower())
 
-    @mock.patch("k8sapp_openstack.lifecycle.lifecycle_openstack.get_pvc_storageclass_requirements")
+    @mock.patch("k8sapp_openstack.lifecycle.lifecycle_openstack.get_pvc_storageclass_resolution")
     def test_check_storageclass_resolution_cinder_backup_unresolved_raises(
         self,
-        mock_get_requirements,
+        mock_get_resolution,
     ):
         """Cinder backup requiring a PVC with no resolution blocks apply."""
-        mock_get_requirements.return_value = [
+        mock_get_resolution.return_value = {'volume_backends': [], 'requirements': [
             {'chart': 'mariadb', 'priority_list': ['ceph'], 'storage_class': 'general'},
             {'chart': 'rabbitmq', 'priority_list': ['ceph'], 'storage_class': 'general'},
             {
@@ -2007,7 +2321,7 @@ class OpenstackAppLifecycleOperatorTest(dbbase.BaseHostTestCase):
                 'priority_list': ['dell-iscsi'],
                 'storage_class': None,
             },
-        ]
+        ]}
         try:
             self.lifecycle._check_storageclass_resolution()
             self.fail("Expected LifecycleSemanticCheckException")
@@ -2467,6 +2781,21 @@ class OpenstackAppLifecycleEsbSemanticCheckTest(dbbase.BaseHostTestCase):
         mock_storageclass.assert_called_once_with()
 
 
+def _ontap_san_storage_classes(*storage_classes):
+    """Build a list of ontap-san StorageClasses.
+
+    Args:
+        storage_classes: (name, sanType) tuples, sanType None when absent.
+    """
+    items = []
+    for name, san_type in storage_classes:
+        parameters = {"backendType": app_constants.BACKEND_TYPE_NETAPP_ISCSI}
+        if san_type is not None:
+            parameters["sanType"] = san_type
+        items.append({"metadata": {"name": name}, "parameters": parameters})
+    return items
+
+
 class TestSemanticCheckNetappSanStorageclasses(
         OpenstackAppLifecycleOperatorTest):
     """Tests for _semantic_check_netapp_san_storageclasses."""
@@ -2504,25 +2833,25 @@ class TestSemanticCheckNetappSanStorageclasses(
         }
 
     # ------------------------------------------------------------------
-    # Short-circuit cases (check should pass without kubectl)
+    # Short-circuit cases (check should pass without querying StorageClasses)
     # ------------------------------------------------------------------
 
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.check_netapp_backends')
     def test_only_iscsi_enabled_skips_check(self, mock_backends):
-        """Single iSCSI backend — sanType not required, no kubectl call."""
+        """Single iSCSI backend — sanType not required, no StorageClass query."""
         mock_backends.return_value = self._iscsi_only()
         with mock.patch(
-            'k8sapp_openstack.utils.send_cmd_read_response'
+            'k8sapp_openstack.helpers.kube_client.list_items'
         ) as mock_cmd:
             self.lifecycle._semantic_check_netapp_san_storageclasses()
             mock_cmd.assert_not_called()
 
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.check_netapp_backends')
     def test_only_fc_enabled_skips_check(self, mock_backends):
-        """Single FC backend — sanType not required, no kubectl call."""
+        """Single FC backend — sanType not required, no StorageClass query."""
         mock_backends.return_value = self._fc_only()
         with mock.patch(
-            'k8sapp_openstack.utils.send_cmd_read_response'
+            'k8sapp_openstack.helpers.kube_client.list_items'
         ) as mock_cmd:
             self.lifecycle._semantic_check_netapp_san_storageclasses()
             mock_cmd.assert_not_called()
@@ -2532,17 +2861,17 @@ class TestSemanticCheckNetappSanStorageclasses(
         """No SAN backends enabled — check is skipped entirely."""
         mock_backends.return_value = self._no_san()
         with mock.patch(
-            'k8sapp_openstack.utils.send_cmd_read_response'
+            'k8sapp_openstack.helpers.kube_client.list_items'
         ) as mock_cmd:
             self.lifecycle._semantic_check_netapp_san_storageclasses()
             mock_cmd.assert_not_called()
 
     # ------------------------------------------------------------------
-    # Both SAN enabled — kubectl output variations
+    # Both SAN enabled — StorageClass variations
     # ------------------------------------------------------------------
 
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.check_netapp_backends')
-    @mock.patch('k8sapp_openstack.utils.send_cmd_read_response', return_value='')
+    @mock.patch('k8sapp_openstack.helpers.kube_client.list_items', return_value=[])
     def test_no_ontap_san_storageclasses_passes(self, mock_cmd, mock_backends):
         """Both SAN enabled but no ontap-san StorageClasses — check passes."""
         mock_backends.return_value = self._both_san_enabled()
@@ -2550,8 +2879,9 @@ class TestSemanticCheckNetappSanStorageclasses(
         mock_cmd.assert_called_once()
 
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.check_netapp_backends')
-    @mock.patch('k8sapp_openstack.utils.send_cmd_read_response',
-                return_value='netapp-iscsi\tiscsi\nnetapp-fc\tfcp\n')
+    @mock.patch('k8sapp_openstack.helpers.kube_client.list_items',
+                return_value=_ontap_san_storage_classes(('netapp-iscsi', 'iscsi'),
+                                                        ('netapp-fc', 'fcp')))
     def test_both_san_with_san_type_passes(self, mock_cmd, mock_backends):
         """Both SAN enabled and StorageClasses have sanType — check passes."""
         mock_backends.return_value = self._both_san_enabled()
@@ -2559,8 +2889,8 @@ class TestSemanticCheckNetappSanStorageclasses(
         mock_cmd.assert_called_once()
 
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.check_netapp_backends')
-    @mock.patch('k8sapp_openstack.utils.send_cmd_read_response',
-                return_value='netapp-iscsi\tiscsi\n')
+    @mock.patch('k8sapp_openstack.helpers.kube_client.list_items',
+                return_value=_ontap_san_storage_classes(('netapp-iscsi', 'iscsi')))
     def test_only_iscsi_san_type_missing_fc_raises(self, mock_cmd, mock_backends):
         """FC sanType absent — both must be present, so raises."""
         mock_backends.return_value = self._both_san_enabled()
@@ -2571,8 +2901,8 @@ class TestSemanticCheckNetappSanStorageclasses(
         mock_cmd.assert_called_once()
 
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.check_netapp_backends')
-    @mock.patch('k8sapp_openstack.utils.send_cmd_read_response',
-                return_value='netapp-fc\tfcp\n')
+    @mock.patch('k8sapp_openstack.helpers.kube_client.list_items',
+                return_value=_ontap_san_storage_classes(('netapp-fc', 'fcp')))
     def test_only_fc_san_type_missing_iscsi_raises(self, mock_cmd, mock_backends):
         """iSCSI sanType absent — both must be present, so raises."""
         mock_backends.return_value = self._both_san_enabled()
@@ -2583,8 +2913,8 @@ class TestSemanticCheckNetappSanStorageclasses(
         mock_cmd.assert_called_once()
 
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.check_netapp_backends')
-    @mock.patch('k8sapp_openstack.utils.send_cmd_read_response',
-                return_value='netapp-san\t\n')
+    @mock.patch('k8sapp_openstack.helpers.kube_client.list_items',
+                return_value=_ontap_san_storage_classes(('netapp-san', None)))
     def test_both_san_no_san_type_raises(self, mock_cmd, mock_backends):
         """Both SAN enabled and no StorageClass defines sanType — raises."""
         mock_backends.return_value = self._both_san_enabled()
@@ -2595,14 +2925,14 @@ class TestSemanticCheckNetappSanStorageclasses(
         mock_cmd.assert_called_once()
 
     # ------------------------------------------------------------------
-    # kubectl failure — should warn and pass gracefully
+    # Kubernetes API failure — should warn and pass gracefully
     # ------------------------------------------------------------------
 
     @mock.patch('k8sapp_openstack.lifecycle.lifecycle_openstack.check_netapp_backends')
-    @mock.patch('k8sapp_openstack.utils.send_cmd_read_response',
-                side_effect=Exception("kubectl unavailable"))
-    def test_kubectl_failure_skips_gracefully(self, mock_cmd, mock_backends):
-        """kubectl failure logs a warning and does not raise."""
+    @mock.patch('k8sapp_openstack.helpers.kube_client.list_items',
+                side_effect=Exception("kubernetes api unavailable"))
+    def test_kube_api_failure_skips_gracefully(self, mock_cmd, mock_backends):
+        """Kubernetes API failure logs a warning and does not raise."""
         mock_backends.return_value = self._both_san_enabled()
         # Should not raise
         self.lifecycle._semantic_check_netapp_san_storageclasses()
@@ -0,0 +1,172 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import time
+from unittest import mock
+
+from k8sapp_openstack import utils as app_utils
+from k8sapp_openstack.common import constants as app_constants
+from k8sapp_openstack.helpers import kube_cache
+from k8sapp_openstack.tests.test_kube_client import FakeKubeApiTestCase
+
+NAMESPACE = app_constants.HELM_NS_OPENSTACK
+SC_PATH = "/apis/storage.k8s.io/v1/storageclasses"
+SECRET_PATH = f"/api/v1/namespaces/{NAMESPACE}/secrets"
+
+# Time, in seconds, to wait for a watch event to reach the cache
+SYNC_TIMEOUT = 5
+
+
+class TestKubeCache(FakeKubeApiTestCase):
+    """Tests the watch-backed cache of Kubernetes objects."""
+
+    def setUp(self):
+        super(TestKubeCache, self).setUp()
+        self.server.collections.update({SC_PATH, SECRET_PATH})
+        self.addCleanup(kube_cache.stop_all)
+
+    def _start(self, resource, namespace=None):
+        cache = kube_cache.start(resource, namespace=namespace)
+        self.assertTrue(cache.wait_synced(SYNC_TIMEOUT))
+        return cache
+
+    def _wait_for(self, condition):
+        deadline = time.monotonic() + SYNC_TIMEOUT
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "Timed out waiting for the cache")
+            time.sleep(0.01)
+
+    def _count_lists(self):
+        return sum(1 for method, path in self.server.requests
+                   if method == "GET" and path.partition("?")[0] == SC_PATH and
+                   "watch=" not in path)
+
+    def test_list(self):
+        """Test that the objects are listed once and then served from memory."""
+        self._add_object(SC_PATH, "general", provisioner="rbd")
+        self._add_object(SC_PATH, "cephfs", provisioner="cephfs")
+        self._start("storageclass")
+
+        for _ in range(3):
+            self.assertEqual([item["metadata"]["name"]
+                              for item in kube_cache.list_items("storageclass")],
+                             ["cephfs", "general"])
+            self.assertEqual(kube_cache.get("storageclass", "general")["provisioner"], "rbd")
+        self.assertIsNone(kube_cache.get("storageclass", "missing"))
+        self.assertEqual(self._count_lists(), 1)
+
+    def test_copies(self):
+        """Test that the callers can't modify the cached objects."""
+        self._add_object(SC_PATH, "general", provisioner="rbd")
+        self._start("storageclass")
+        kube_cache.get("storageclass", "general")["provisioner"] = "changed"
+        kube_cache.list_items("storageclass")[0]["provisioner"] = "changed"
+        self.assertEqual(kube_cache.get("storageclass", "general")["provisioner"], "rbd")
+
+    def test_watch(self):
+        """Test that the watch events keep the objects current."""
+        self._add_object(SC_PATH, "general", provisioner="rbd")
+        cache = self._start("storageclass")
+
+        events = self.server.watch_events
+        events.put({"type": "ADDED", "object": {
+            "metadata": {"name": "netapp", "resourceVersion": "2"}}})
+        events.put({"type": "MODIFIED", "object": {
+            "metadata": {"name": "general", "resourceVersion": "3"}, "provisioner": "cephfs"}})
+        events.put({"type": "DELETED", "object": {
+            "metadata": {"name": "netapp", "resourceVersion": "4"}}})
+        self._wait_for(lambda: cache.resource_version == "4")
+
+        self.assertEqual([item["metadata"]["name"] for item in cache.list()], ["general"])
+        self.assertEqual(cache.get("general")["provisioner"], "cephfs")
+        self.assertEqual(self._count_lists(), 1)
+
+    def test_watch_resumed(self):
+        """Test that an ended watch resumes from the last resourceVersion."""
+        cache = self._start("storageclass")
+        self.server.watch_events.put({"type": "BOOKMARK", "object": {
+            "metadata": {"resourceVersion": "7"}}})
+        self.server.watch_events.put(None)
+        self._wait_for(lambda: any("resourceVersion=7" in path
+                                   for _, path in self.server.requests))
+        self.assertTrue(cache.is_synced())
+        self.assertEqual(self._count_lists(), 1)
+
+    def test_relist_on_expired_resource_version(self):
+        """Test that the objects are listed again when the resourceVersion expired."""
+        cache = self._start("storageclass")
+        self._add_object(SC_PATH, "general", provisioner="rbd")
+        self.server.watch_events.put({"type": "ERROR", "object": {
+            "kind": "Status", "code": 410, "reason": "Expired",
+            "message": "too old resource version"}})
+        self._wait_for(lambda: cache.get("general") is not None)
+        self.assertEqual(self._count_lists(), 2)
+
+    def test_fallback(self):
+        """Test that resources are read from the API server when not watched."""
+        self._add_object(SC_PATH, "general", provisioner="rbd")
+        self.assertIsNone(kube_cache.get_cache("storageclass"))
+        self.assertEqual(kube_cache.get("storageclass", "general")["provisioner"], "rbd")
+        self.assertIsNone(kube_cache.get("storageclass", "missing"))
+        self.assertEqual(len(kube_cache.list_items("storageclass")), 1)
+        self.assertEqual(self._count_lists(), 1)
+
+    def test_stop(self):
+        """Test that stopped caches don't serve reads."""
+        cache = self._start("storageclass")
+        kube_cache.stop_all()
+        self.assertFalse(cache.is_synced())
+        self.assertIsNone(kube_cache.get_cache("storageclass"))
+
+    def test_get_secret(self):
+        """Test reading a Secret from the cache, as the KubeOperator returns it."""
+        self._add_object(SECRET_PATH, "keystone-tls-public", type="kubernetes.io/tls",
+                         data={"tls.crt": "Y2VydA=="})
+        self._start("secret", namespace=NAMESPACE)
+
+        with mock.patch("k8sapp_openstack.utils.kubernetes.KubeOperator") as mock_kube_op:
+            secret = app_utils.get_secret("keystone-tls-public", NAMESPACE)
+            self.assertIsNone(app_utils.get_secret("missing", NAMESPACE))
+        mock_kube_op.assert_not_called()
+        self.assertEqual(secret.metadata.name, "keystone-tls-public")
+        self.assertEqual(secret.data, {"tls.crt": "Y2VydA=="})
+
+    @mock.patch("k8sapp_openstack.utils.kubernetes.KubeOperator")
+    def test_get_secret_not_watched(self, mock_kube_op):
+        """Test reading a Secret from the API server when it is not watched."""
+        secret = app_utils.get_secret("keystone-tls-public", NAMESPACE)
+        self.assertIs(secret, mock_kube_op.return_value.kube_get_secret.return_value)
+        mock_kube_op.return_value.kube_get_secret.assert_called_once_with(
+            name="keystone-tls-public", namespace=NAMESPACE)
+
+
+class TestStartKubeWatchCaches(FakeKubeApiTestCase):
+    """Tests starting the watch caches from the application overrides."""
+
+    @mock.patch("k8sapp_openstack.helpers.kube_cache.stop_all")
+    @mock.patch("k8sapp_openstack.helpers.kube_cache.start")
+    @mock.patch("k8sapp_openstack.utils._get_value_from_application",
+                side_effect=lambda default_value, **_: default_value)
+    def test_disabled_by_default(self, _, mock_start, mock_stop_all):
+        """Test that nothing is watched unless enabled."""
+        app_utils.start_kube_watch_caches()
+        mock_start.assert_not_called()
+        mock_stop_all.assert_called_once_with()
+
+    @mock.patch("k8sapp_openstack.helpers.kube_cache.start")
+    @mock.patch("k8sapp_openstack.utils._get_value_from_application")
+    def test_enabled(self, mock_get_value, mock_start):
+        """Test the resources watched when enabled."""
+        mock_get_value.side_effect = lambda default_value, override_name, **_: (
+            True if override_name == "kubeWatchCache" else default_value)
+        app_utils.start_kube_watch_caches()
+        self.assertEqual(mock_start.call_args_list, [
+            mock.call("storageclass"),
+            mock.call("tridentbackend", namespace=app_constants.OPENSTACK_NETAPP_NAMESPACE),
+            mock.call("tridentbackendconfig", namespace=app_constants.OPENSTACK_NETAPP_NAMESPACE),
+            mock.call("secret", namespace=NAMESPACE,
+                      field_selector=f"type!={app_constants.HELM_RELEASE_SECRET_TYPE}"),
+        ])
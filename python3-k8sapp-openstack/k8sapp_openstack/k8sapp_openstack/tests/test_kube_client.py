@@ -0,0 +1,354 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from http import server
+import json
+import queue
+import threading
+import unittest
+from unittest import mock
+from urllib import parse
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from k8sapp_openstack import utils as app_utils
+from k8sapp_openstack.common import constants as app_constants
+from k8sapp_openstack.helpers import kube_client
+
+NAMESPACE = app_constants.HELM_NS_OPENSTACK
+PVC_PATH = f"/api/v1/namespaces/{NAMESPACE}/persistentvolumeclaims"
+STS_PATH = f"/apis/apps/v1/namespaces/{NAMESPACE}/statefulsets"
+SNAPSHOT_PATH = f"/apis/snapshot.storage.k8s.io/v1/namespaces/{NAMESPACE}/volumesnapshots"
+
+
+class FakeKubeApiHandler(server.BaseHTTPRequestHandler):
+    """Minimal Kubernetes API server, backed by a dict of objects by path.
+
+    Watches stream the events put in the watch_events queue of the server,
+    until None is put.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _not_found(self):
+        self._reply(404, {"kind": "Status", "reason": "NotFound", "code": 404})
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _watch(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        while True:
+            event = self.server.watch_events.get()
+            if event is None:
+                break
+            data = json.dumps(event).encode() + b"\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+        self.close_connection = True
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path))
+        path, _, query = self.path.partition("?")
+        if parse.parse_qs(query).get("watch", [""])[0].lower() in ("1", "true"):
+            return self._watch()
+        objects = self.server.objects
+        if path in objects:
+            return self._reply(200, objects[path])
+        items = [obj for obj_path, obj in sorted(objects.items())
+                 if obj_path.rpartition("/")[0] == path]
+        if "labelSelector=" in query:
+            key, _, value = query.split("labelSelector=")[1].partition("%3D")
+            items = [obj for obj in items
+                     if obj["metadata"].get("labels", {}).get(key) == value]
+        if items or path in self.server.collections:
+            return self._reply(200, {"metadata": {"resourceVersion": self.server.resource_version},
+                                     "items": items})
+        self._not_found()
+
+    def do_POST(self):
+        self.server.requests.append(("POST", self.path))
+        body = self._read_body()
+        self.server.objects[f"{self.path}/{body['metadata']['name']}"] = body
+        self._reply(201, body)
+
+    def do_PATCH(self):
+        self.server.requests.append(("PATCH", self.path))
+        self.server.patches.append(
+            (self.path, self.headers["Content-Type"], self._read_body()))
+        self._reply(200, {})
+
+    def do_DELETE(self):
+        self.server.requests.append(("DELETE", self.path))
+        if self.server.objects.pop(self.path, None) is None:
+            return self._not_found()
+        self._reply(200, {"kind": "Status", "status": "Success"})
+
+
+class FakeKubeApiTestCase(unittest.TestCase):
+    """Runs the tests against a local fake Kubernetes API server."""
+
+    def setUp(self):
+        super(FakeKubeApiTestCase, self).setUp()
+        self.server = server.ThreadingHTTPServer(("127.0.0.1", 0), FakeKubeApiHandler)
+        self.server.objects = {}
+        self.server.collections = {PVC_PATH}
+        self.server.requests = []
+        self.server.patches = []
+        self.server.resource_version = "1"
+        self.server.watch_events = queue.Queue()
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(self._end_watches)
+
+        configuration = client.Configuration()
+        configuration.host = f"http://127.0.0.1:{self.server.server_address[1]}"
+        kube_client.configure(configuration)
+        self.addCleanup(kube_client.configure)
+
+    def _end_watches(self):
+        for _ in range(8):
+            self.server.watch_events.put(None)
+
+    def _add_object(self, path, name, **fields):
+        obj = {"metadata": {"name": name}}
+        obj.update(fields)
+        self.server.objects[f"{path}/{name}"] = obj
+        return obj
+
+
+class TestKubeClient(FakeKubeApiTestCase):
+    """Tests the pooled Kubernetes API client."""
+
+    def test_get(self):
+        """Test getting an object."""
+        pvc = self._add_object(PVC_PATH, "mysql-data")
+        self.assertEqual(kube_client.get("pvc", "mysql-data", namespace=NAMESPACE), pvc)
+
+    def test_get_not_found(self):
+        """Test getting a missing object."""
+        with self.assertRaises(ApiException) as ctx:
+            kube_client.get("pvc", "missing", namespace=NAMESPACE)
+        self.assertTrue(kube_client.is_not_found(ctx.exception))
+        self.assertIsNone(kube_client.get("pvc", "missing", namespace=NAMESPACE,
+                                          ignore_not_found=True))
+
+    def test_get_empty_name(self):
+        """Test that an empty name does not read the whole collection."""
+        self.assertRaises(ValueError, kube_client.get, "namespace", "")
+        self.assertEqual(self.server.requests, [])
+
+    def test_get_empty_namespace(self):
+        """Test that a namespaced object is not read without its namespace."""
+        self.assertRaises(ValueError, kube_client.get, "pvc", "mysql-data")
+        self.assertRaises(ValueError, kube_client.get, "volumesnapshot", "snapshot")
+        self.assertEqual(self.server.requests, [])
+
+    def test_unknown_resource(self):
+        """Test that unknown resources are rejected."""
+        self.assertRaises(ValueError, kube_client.list_items, "unknown")
+        self.assertRaises(ValueError, kube_client.list_items, "pvcs")
+
+    def test_list_items(self):
+        """Test listing objects."""
+        self._add_object(PVC_PATH, "pvc-0")
+        self._add_object(PVC_PATH, "pvc-1")
+        items = kube_client.list_items("pvc", namespace=NAMESPACE)
+        self.assertEqual([item["metadata"]["name"] for item in items],
+                         ["pvc-0", "pvc-1"])
+
+    def test_list_items_label_selector(self):
+        """Test listing objects with a label selector."""
+        self._add_object(PVC_PATH, "pvc-0")
+        self._add_object(PVC_PATH, "pvc-1")
+        self.server.objects[f"{PVC_PATH}/pvc-1"]["metadata"]["labels"] = {"app": "db"}
+        items = kube_client.list_items("pvc", namespace=NAMESPACE,
+                                       label_selector="app=db")
+        self.assertEqual([item["metadata"]["name"] for item in items], ["pvc-1"])
+
+    def test_create(self):
+        """Test creating an object in the namespace of its metadata."""
+        body = {"metadata": {"name": "snapshot", "namespace": NAMESPACE}}
+        kube_client.create("volumesnapshot", body)
+        self.assertEqual(self.server.objects[f"{SNAPSHOT_PATH}/snapshot"], body)
+
+    def test_patch_subresource(self):
+        """Test patching a subresource."""
+        kube_client.patch("statefulset", "mariadb-server", {"spec": {"replicas": 0}},
+                          namespace=NAMESPACE, subresource="scale")
+        self.assertEqual([(path, body) for path, _, body in self.server.patches], [(
+            f"{STS_PATH}/mariadb-server/scale",
+            {"spec": {"replicas": 0}},
+        )])
+
+    def test_patch_custom_resource(self):
+        """Test merge patching a custom resource."""
+        kube_client.patch("volumesnapshot", "snapshot", {"metadata": {"labels": {"a": "b"}}},
+                          namespace=NAMESPACE)
+        self.assertEqual(self.server.patches, [(
+            f"{SNAPSHOT_PATH}/snapshot",
+            "application/merge-patch+json",
+            {"metadata": {"labels": {"a": "b"}}},
+        )])
+
+    def test_delete(self):
+        """Test deleting an object and waiting for it to be gone."""
+        self._add_object(PVC_PATH, "mysql-data")
+        kube_client.delete("pvc", "mysql-data", namespace=NAMESPACE)
+        self.assertEqual(self.server.requests, [
+            ("DELETE", f"{PVC_PATH}/mysql-data"),
+            ("GET", f"{PVC_PATH}/mysql-data"),
+        ])
+
+    def test_delete_waits_for_finalizers(self):
+        """Test that delete polls until the object is gone."""
+        self._add_object(PVC_PATH, "mysql-data")
+
+        def _delete_with_finalizer(handler):
+            # The object is only gone after the first poll
+            handler.server.requests.append(("DELETE", handler.path))
+            handler._reply(200, {})
+            threading.Timer(0.2, handler.server.objects.pop,
+                            args=(handler.path, None)).start()
+
+        with mock.patch.object(FakeKubeApiHandler, "do_DELETE", _delete_with_finalizer), \
+                mock.patch.object(kube_client, "DELETE_POLL_INTERVAL", 0.1):
+            kube_client.delete("pvc", "mysql-data", namespace=NAMESPACE)
+        self.assertGreater(self.server.requests.count(("GET", f"{PVC_PATH}/mysql-data")), 1)
+        self.assertNotIn(f"{PVC_PATH}/mysql-data", self.server.objects)
+
+    def test_delete_timeout(self):
+        """Test that delete gives up when the object is never gone."""
+        self._add_object(PVC_PATH, "mysql-data")
+
+        def _delete_never_gone(handler):
+            handler._reply(200, {})
+
+        with mock.patch.object(FakeKubeApiHandler, "do_DELETE", _delete_never_gone):
+            self.assertRaises(TimeoutError, kube_client.delete, "pvc", "mysql-data",
+                              namespace=NAMESPACE, timeout=0)
+
+    def test_delete_ignore_not_found(self):
+        """Test deleting a missing object."""
+        self.assertRaises(ApiException, kube_client.delete, "pvc", "missing",
+                          namespace=NAMESPACE)
+        kube_client.delete("pvc", "missing", namespace=NAMESPACE, ignore_not_found=True)
+
+    def test_delete_propagation_policy(self):
+        """Test deleting an object along with its dependents."""
+        kube_client.delete("pvc", "mysql-data", namespace=NAMESPACE, ignore_not_found=True,
+                           wait=False, propagation_policy="Background")
+        self.assertEqual(self.server.requests, [
+            ("DELETE", f"{PVC_PATH}/mysql-data?propagationPolicy=Background"),
+        ])
+
+    def test_list_collection(self):
+        """Test listing objects with the resourceVersion of the list."""
+        self._add_object(PVC_PATH, "mysql-data")
+        response = kube_client.list_collection("pvc", namespace=NAMESPACE)
+        self.assertEqual(response["metadata"]["resourceVersion"], "1")
+        self.assertEqual([item["metadata"]["name"] for item in response["items"]],
+                         ["mysql-data"])
+
+    def test_watch(self):
+        """Test streaming the events of a watch."""
+        events = [
+            {"type": "ADDED", "object": {"metadata": {"name": "pvc-0"}}},
+            {"type": "DELETED", "object": {"metadata": {"name": "pvc-0"}}},
+        ]
+        for event in events:
+            self.server.watch_events.put(event)
+        self.server.watch_events.put(None)
+        self.assertEqual(list(kube_client.watch("pvc", "1", namespace=NAMESPACE)), events)
+        self.assertIn("resourceVersion=1", self.server.requests[0][1])
+
+    def test_connection_reused(self):
+        """Test that requests share the pooled API client."""
+        self.server.collections.add(SNAPSHOT_PATH)
+        api_client = kube_client.get_api_client()
+        with mock.patch.object(api_client, "call_api",
+                               wraps=api_client.call_api) as mock_call_api:
+            kube_client.list_items("pvc", namespace=NAMESPACE)
+            kube_client.list_items("volumesnapshot", namespace=NAMESPACE)
+        self.assertEqual(mock_call_api.call_count, 2)
+        self.assertIs(kube_client.get_api_client(), api_client)
+
+    @mock.patch("k8sapp_openstack.helpers.kube_client.kube_config.new_client_from_config")
+    def test_api_client_of_admin_kubeconfig(self, mock_new_client):
+        """Test that an API client of the admin kubeconfig is shared by default."""
+        kube_client.configure()
+        self.assertIs(kube_client.get_api_client(), mock_new_client.return_value)
+        self.assertIs(kube_client.get_api_client(), mock_new_client.return_value)
+        mock_new_client.assert_called_once_with(
+            config_file=kube_client.kubernetes.KUBERNETES_ADMIN_CONF)
+
+
+class TestKubeClientUtils(FakeKubeApiTestCase):
+    """Tests the utils helpers built on the pooled client against the fake API server."""
+
+    def test_get_pvc_storageclass(self):
+        """Test reading the StorageClass of a PVC."""
+        self._add_object(PVC_PATH, app_constants.MARIADB_PVC_NAME,
+                         spec={"storageClassName": "general"})
+        self.assertEqual(app_utils.get_pvc_storageclass(app_constants.MARIADB_PVC_NAME),
+                         "general")
+        self.assertEqual(app_utils.get_pvc_storageclass("missing"), "")
+
+    def test_check_if_namespace_exists(self):
+        """Test checking if a namespace exists."""
+        self._add_object("/api/v1/namespaces", NAMESPACE)
+        self.assertTrue(app_utils.check_if_namespace_exists(NAMESPACE))
+        self.assertFalse(app_utils.check_if_namespace_exists("missing"))
+
+    def test_check_if_pvc_exists_in_a_namespace(self):
+        """Test checking if a namespace has PVCs."""
+        self.assertFalse(app_utils.check_if_pvc_exists_in_a_namespace(NAMESPACE))
+        self._add_object(PVC_PATH, "mysql-data")
+        self.assertTrue(app_utils.check_if_pvc_exists_in_a_namespace(NAMESPACE))
+
+    def test_get_number_of_controllers(self):
+        """Test counting the controllers among the hosts of all the namespaces."""
+        hosts_path = "/apis/starlingx.windriver.com/v1/namespaces/deployment/hosts"
+        for name in ("controller-0", "controller-1", "compute-0"):
+            self._add_object(hosts_path, name)
+        with mock.patch.object(FakeKubeApiHandler, "do_GET", _get_all_namespaces):
+            self.assertEqual(app_utils.get_number_of_controllers(), 2)
+
+    def test_delete_snapshot(self):
+        """Test deleting a PVC snapshot."""
+        self._add_object(SNAPSHOT_PATH, "snapshot")
+        app_utils.delete_snapshot("snapshot")
+        self.assertNotIn(f"{SNAPSHOT_PATH}/snapshot", self.server.objects)
+        app_utils.delete_snapshot("snapshot", ignore_not_found=True)
+
+
+def _get_all_namespaces(handler):
+    """Serve a list of the objects of a resource across all the namespaces."""
+    group, _, plural = handler.path.rpartition("/")
+    items = [obj for path, obj in sorted(handler.server.objects.items())
+             if path.startswith(f"{group}/namespaces/") and
+             path.rpartition("/")[0].endswith(f"/{plural}")]
+    handler._reply(200, {"items": items})
@@ -4,10 +4,16 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+from copy import deepcopy
+import json
+import os
+import shutil
+import tempfile
 import unittest
 from unittest import mock
 
 from sysinv.common import constants
+import yaml
 
 from k8sapp_openstack.common import constants as app_constants
 from k8sapp_openstack.kustomize.kustomize_openstack import OpenstackFluxCDKustomizeOperator
@@ -18,6 +24,11 @@ class TestOpenstackFluxCDKustomizeOperator(unittest.TestCase):
     def setUp(self):
         super(TestOpenstackFluxCDKustomizeOperator, self).setUp()
         self.fluxCDKustomizeOperator = OpenstackFluxCDKustomizeOperator()
+        # The top-level kustomization, loaded as a list of YAML documents
+        self.fluxCDKustomizeOperator.kustomization_content = [{
+            'namespace': app_constants.HELM_NS_OPENSTACK,
+            'resources': [],
+        }]
 
     def test_chart_remove(self, *_):
         """ Tests chart_remove method, just checks if the expected
@@ -105,6 +116,8 @@ class TestOpenstackFluxCDKustomizeOperator(unittest.TestCase):
 
         self.fluxCDKustomizeOperator.enable_helmrelease_resource.assert_called_once_with(resources[2]['name'])
 
+    @mock.patch('k8sapp_openstack.utils._get_value_from_application',
+                return_value=False)
     def test_platform_mode_kustomize_updates__mode_none(self, *_):
         """ Tests the platform_mode_kustomize_updates with mode being None
         Also considers the resources_before_restore being empty and not empty.
@@ -223,3 +236,128 @@ class TestOpenstackFluxCDKustomizeOperator(unittest.TestCase):
                 dbapi, app_constants.HELM_NS_OPENSTACK, release_list)
 
             self.fluxCDKustomizeOperator.set_helm_releases.reset_mock()
+
+    def _write_manifests(self, releases):
+        manifest_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, manifest_dir)
+        with open(os.path.join(manifest_dir, 'kustomization.yaml'), 'w') as f:
+            yaml.safe_dump({'namespace': app_constants.HELM_NS_OPENSTACK,
+                            'resources': list(releases)}, f)
+        for name, depends_on in releases.items():
+            os.makedirs(os.path.join(manifest_dir, name))
+            with open(os.path.join(manifest_dir, name, 'helmrelease.yaml'), 'w') as f:
+                yaml.safe_dump({
+                    'kind': 'HelmRelease',
+                    'metadata': {'name': name},
+                    'spec': {'dependsOn': [{'name': d} for d in depends_on]},
+                }, f)
+        self.fluxCDKustomizeOperator.kustomization_fqpn = os.path.join(
+            manifest_dir, 'kustomization.yaml')
+        self.fluxCDKustomizeOperator.helmrelease_resource_map = {
+            name: {} for name in releases}
+        self.fluxCDKustomizeOperator.kustomization_content = [{
+            'namespace': app_constants.HELM_NS_OPENSTACK,
+            'resources': list(releases),
+            'patches': [
+                {'target': {'kind': 'Secret'}, 'patch': '[]'},
+                {'target': {'kind': 'HelmRelease', 'name': 'heat'},
+                 'patch': json.dumps([{'op': 'add', 'path': '/spec/values/pod',
+                                       'value': {}}])},
+            ],
+        }]
+
+    def _write_chain_manifests(self):
+        keystone = app_constants.FLUXCD_HELMRELEASE_KEYSTONE
+        self._write_manifests({
+            app_constants.FLUXCD_HELMRELEASE_MARIADB: [],
+            app_constants.FLUXCD_HELMRELEASE_MEMCACHED: [app_constants.FLUXCD_HELMRELEASE_MARIADB],
+            app_constants.FLUXCD_HELMRELEASE_RABBITMQ: [app_constants.FLUXCD_HELMRELEASE_MEMCACHED],
+            keystone: [app_constants.FLUXCD_HELMRELEASE_RABBITMQ],
+            app_constants.FLUXCD_HELMRELEASE_GLANCE: [keystone],
+            app_constants.FLUXCD_HELMRELEASE_HEAT: [app_constants.FLUXCD_HELMRELEASE_GLANCE],
+        })
+        return self.fluxCDKustomizeOperator.kustomization_content[0]
+
+    def _assert_heat_wave_patch(self, patch):
+        self.assertEqual(patch['target'],
+                         {'kind': 'HelmRelease', 'name': app_constants.FLUXCD_HELMRELEASE_HEAT})
+        self.assertEqual(json.loads(patch['patch']), [{
+            'op': 'add',
+            'path': '/spec/dependsOn',
+            'value': [{'name': app_constants.FLUXCD_HELMRELEASE_KEYSTONE,
+                       'namespace': app_constants.HELM_NS_OPENSTACK}],
+        }])
+
+    @mock.patch('k8sapp_openstack.utils.get_helmrelease_durations',
+                return_value={})
+    @mock.patch('k8sapp_openstack.utils._get_value_from_application',
+                return_value=True)
+    def test_platform_mode_kustomize_updates__parallel_waves(self, *_):
+        """ Tests that the parallel waves patch the dependsOn of the Helm
+        Releases that do not require the whole manifest chain, and that the
+        patches are removed once the parallel waves are disabled
+        """
+        content = self._write_chain_manifests()
+        original_patches = list(content['patches'])
+
+        self.fluxCDKustomizeOperator.platform_mode_kustomize_updates(mock.Mock(), None)
+        self.fluxCDKustomizeOperator.platform_mode_kustomize_updates(mock.Mock(), None)
+
+        self.assertEqual(content['patches'][:2], original_patches)
+        self.assertEqual(len(content['patches']), 3)
+        self._assert_heat_wave_patch(content['patches'][2])
+
+        self.fluxCDKustomizeOperator.set_parallel_waves(False)
+        self.assertEqual(content['patches'], original_patches)
+
+    @mock.patch('k8sapp_openstack.utils.get_helmrelease_durations',
+                return_value={})
+    def test_set_parallel_waves__saved_patches(self, *_):
+        """ Tests that the wave patches saved in the synced kustomization by a
+        previous apply, e.g. before a conductor restart, are replaced when
+        enabled and removed when disabled
+        """
+        content = self._write_chain_manifests()
+        original_patches = list(content['patches'])
+        stale_patch = {
+            'target': {'kind': 'HelmRelease',
+                       'name': app_constants.FLUXCD_HELMRELEASE_GLANCE},
+            'patch': json.dumps([{'op': 'add', 'path': '/spec/dependsOn', 'value': []}]),
+        }
+        self.fluxCDKustomizeOperator.set_parallel_waves(True)
+        content['patches'].append(stale_patch)
+        saved_patches = deepcopy(content['patches'])
+
+        restarted = OpenstackFluxCDKustomizeOperator()
+        restarted.kustomization_fqpn = self.fluxCDKustomizeOperator.kustomization_fqpn
+        restarted.helmrelease_resource_map = self.fluxCDKustomizeOperator.helmrelease_resource_map
+        restarted.kustomization_content = [content]
+
+        restarted.set_parallel_waves(True)
+        self.assertEqual(content['patches'][:2], original_patches)
+        self.assertEqual(len(content['patches']), 3)
+        self._assert_heat_wave_patch(content['patches'][2])
+
+        content['patches'] = saved_patches
+        restarted = OpenstackFluxCDKustomizeOperator()
+        restarted.kustomization_content = [content]
+        restarted.set_parallel_waves(False)
+        self.assertEqual(content['patches'], original_patches)
+
+    def test_set_parallel_waves__disabled_without_patches(self):
+        """ Tests that a kustomization without patches is left untouched """
+        self.fluxCDKustomizeOperator.set_parallel_waves(False)
+        self.assertEqual(self.fluxCDKustomizeOperator.kustomization_content,
+                         [{'namespace': app_constants.HELM_NS_OPENSTACK, 'resources': []}])
+
+    @mock.patch('k8sapp_openstack.utils._get_value_from_application',
+                return_value=True)
+    def test_set_parallel_waves__circular(self, *_):
+        """ Tests that circular dependencies keep the manifest dependencies """
+        self._write_manifests({'a': ['b'], 'b': ['a']})
+        content = self.fluxCDKustomizeOperator.kustomization_content[0]
+        original_patches = list(content['patches'])
+
+        self.fluxCDKustomizeOperator.set_parallel_waves(True)
+
+        self.assertEqual(content['patches'], original_patches)
@@ -0,0 +1,182 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from k8sapp_openstack.common import constants as app_constants
+from k8sapp_openstack.helpers import release_graph
+
+NAMESPACE = app_constants.HELM_NS_OPENSTACK
+
+
+def _helmrelease(name, depends_on=()):
+    return {
+        "apiVersion": "helm.toolkit.fluxcd.io/v2",
+        "kind": "HelmRelease",
+        "metadata": {"name": name},
+        "spec": {"dependsOn": [{"name": dependency, "namespace": NAMESPACE}
+                               for dependency in depends_on]},
+    }
+
+
+class TestReleaseGraph(unittest.TestCase):
+    """Tests the HelmRelease dependency graph of the manifests."""
+
+    def setUp(self):
+        super(TestReleaseGraph, self).setUp()
+        self.manifest_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.manifest_dir)
+
+    def _write_manifests(self, releases: dict, resources: list = None,
+                         patches: list = None):
+        resources = list(releases) if resources is None else resources
+        kustomization = {"namespace": NAMESPACE, "resources": resources}
+        if patches:
+            kustomization["patches"] = patches
+        with open(os.path.join(self.manifest_dir, "kustomization.yaml"), "w") as f:
+            yaml.safe_dump(kustomization, f)
+        for name, depends_on in releases.items():
+            os.makedirs(os.path.join(self.manifest_dir, name))
+            with open(os.path.join(self.manifest_dir, name, "helmrelease.yaml"), "w") as f:
+                yaml.safe_dump_all([{"kind": "Namespace"},
+                                    _helmrelease(name, depends_on)], f)
+
+    def test_load_release_graph(self):
+        """Test that the HelmReleases of the kustomization resources are read."""
+        self._write_manifests({"mariadb": [], "keystone": ["mariadb"], "unused": []},
+                              resources=["mariadb", "keystone", "missing"])
+
+        graph = release_graph.load_release_graph(self.manifest_dir)
+
+        self.assertEqual(graph, {
+            "mariadb": {"namespace": NAMESPACE, "resource": "mariadb",
+                        "depends_on": []},
+            "keystone": {"namespace": NAMESPACE, "resource": "keystone",
+                         "depends_on": ["mariadb"]},
+        })
+
+    def test_load_release_graph_wave_patches(self):
+        """Test that the wave patches of the kustomization replace the dependencies."""
+        def _wave_patch(name, depends_on):
+            return {"target": {"kind": "HelmRelease", "name": name},
+                    "patch": json.dumps([{
+                        "op": "add", "path": "/spec/dependsOn",
+                        "value": [{"name": dependency, "namespace": NAMESPACE}
+                                  for dependency in depends_on]}])}
+
+        self._write_manifests(
+            {"mariadb": [], "keystone": ["mariadb"], "glance": ["keystone"],
+             "heat": ["glance"]},
+            patches=[
+                _wave_patch("heat", ["keystone"]),
+                _wave_patch("absent", ["keystone"]),
+                {"target": {"kind": "HelmRelease", "name": "glance"},
+                 "patch": json.dumps([{"op": "add", "path": "/spec/timeout",
+                                       "value": "30m"}])},
+            ])
+
+        graph = release_graph.load_release_graph(self.manifest_dir, wave_patches=True)
+
+        self.assertEqual(release_graph.get_dependencies(graph),
+                         {"mariadb": [], "keystone": ["mariadb"],
+                          "glance": ["keystone"], "heat": ["keystone"]})
+        self.assertEqual(
+            release_graph.get_dependencies(
+                release_graph.load_release_graph(self.manifest_dir))["heat"],
+            ["glance"])
+
+    def test_is_wave_patch(self):
+        """Test that only the patches of the dependsOn of a HelmRelease are wave patches."""
+        patch = json.dumps([{"op": "add", "path": "/spec/dependsOn", "value": []}])
+        self.assertTrue(release_graph.is_wave_patch(
+            {"target": {"kind": "HelmRelease", "name": "heat"}, "patch": patch}))
+        self.assertFalse(release_graph.is_wave_patch(
+            {"target": {"kind": "ConfigMap", "name": "heat"}, "patch": patch}))
+        self.assertFalse(release_graph.is_wave_patch(
+            {"target": {"kind": "HelmRelease", "name": "heat"}, "patch": "spec: {}"}))
+        self.assertFalse(release_graph.is_wave_patch(
+            {"target": {"kind": "HelmRelease", "name": "heat"}, "patch": "[]"}))
+
+    def test_get_waves(self):
+        """Test that each HelmRelease follows the last of its dependencies."""
+        waves = release_graph.get_waves({
+            "a": [], "b": ["a"], "c": ["a"], "d": ["b", "c", "absent"], "e": [],
+        })
+        self.assertEqual(waves, [["a", "e"], ["b", "c"], ["d"]])
+
+    def test_get_waves_circular(self):
+        """Test that circular dependencies are refused."""
+        self.assertRaises(ValueError, release_graph.get_waves,
+                          {"a": ["b"], "b": ["a"], "c": []})
+
+    def test_get_critical_path(self):
+        """Test that the longest chain is found from the durations."""
+        dependencies = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+
+        path, total = release_graph.get_critical_path(
+            dependencies, {"a": 10, "b": 5, "c": 50}, default_duration=1)
+
+        self.assertEqual(path, ["a", "c", "d"])
+        self.assertEqual(total, 61)
+        self.assertEqual(release_graph.get_critical_path({}, {}, 1), ([], 0))
+
+    def test_restructure(self):
+        """Test that the required dependencies replace the manifest chain."""
+        dependencies = {"db": [], "keystone": ["db"], "glance": ["keystone"],
+                        "heat": ["glance"], "horizon": ["heat"]}
+        required = {"heat": ["keystone"], "horizon": ["keystone", "db"]}
+
+        restructured = release_graph.restructure(dependencies, required)
+
+        self.assertEqual(restructured, {"db": [], "keystone": ["db"],
+                                        "glance": ["keystone"], "heat": ["keystone"],
+                                        "horizon": ["keystone"]})
+        self.assertEqual(release_graph.get_waves(restructured),
+                         [["db"], ["keystone"], ["glance", "heat", "horizon"]])
+
+    def test_restructure_absent_dependency(self):
+        """Test that an absent HelmRelease is replaced by its dependencies."""
+        dependencies = {"db": [], "cache": ["db"], "keystone": ["cache"],
+                        "glance": ["keystone"]}
+
+        restructured = release_graph.restructure(
+            dependencies, {"glance": ["cache", "keystone"]},
+            releases=["db", "keystone", "glance"])
+
+        self.assertEqual(restructured, {"db": [], "keystone": ["db"],
+                                        "glance": ["keystone"]})
+
+    def test_application_manifests(self):
+        """Test that the application manifests are deployed in shorter waves."""
+        manifest_dir = os.path.join(
+            os.path.dirname(__file__), *[os.pardir] * 4,
+            "stx-openstack-helm-fluxcd", "stx-openstack-helm-fluxcd", "manifests")
+        if not os.path.isdir(manifest_dir):
+            self.skipTest("Application manifests not available")
+
+        dependencies = release_graph.get_dependencies(
+            release_graph.load_release_graph(manifest_dir))
+        restructured = release_graph.restructure(
+            dependencies, app_constants.FLUXCD_HELMRELEASE_WAVE_DEPENDENCIES)
+
+        self.assertEqual(set(restructured), set(dependencies))
+        waves = release_graph.get_waves(restructured)
+        self.assertLess(len(waves), len(release_graph.get_waves(dependencies)))
+        wave_of = {name: index for index, wave in enumerate(waves) for name in wave}
+        for name in (app_constants.FLUXCD_HELMRELEASE_BARBICAN,
+                     app_constants.FLUXCD_HELMRELEASE_HEAT,
+                     app_constants.FLUXCD_HELMRELEASE_GNOCCHI):
+            self.assertEqual(wave_of[name],
+                             wave_of[app_constants.FLUXCD_HELMRELEASE_KEYSTONE] + 1)
+        self.assertLess(
+            release_graph.get_critical_path(restructured, {}, default_duration=1)[1],
+            release_graph.get_critical_path(dependencies, {}, default_duration=1)[1])
@@ -0,0 +1,355 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import queue
+import sys
+import time
+import unittest
+from unittest import mock
+
+from k8sapp_openstack.common import constants as app_constants
+from k8sapp_openstack.helpers import vm_recovery
+
+NOVA_URL = "http://nova-api.openstack.svc.cluster.local:8774/v2.1"
+
+
+class FakeNovaSession(object):
+    """Session to a fake nova-api, where the server actions complete at once."""
+
+    def __init__(self, statuses: dict, results: dict = None):
+        self.statuses = dict(statuses)
+        self.results = results or {}
+        self.posts = []
+        self.gets = []
+
+    def post(self, url, json=None):
+        server_id = url.split("/")[-2]
+        action = next(iter(json))
+        self.posts.append((server_id, action))
+        result = self.results.get((server_id, action))
+        if isinstance(result, Exception):
+            raise result
+        if result is None:
+            result = next(step[2] for step in vm_recovery.STEPS if step[0] == action)
+        self.statuses[server_id] = result
+
+    def get(self, url):
+        self.gets.append(url)
+        response = mock.MagicMock()
+        response.json.return_value = {"servers": [
+            {"id": server_id, "status": status, vm_recovery.TASK_STATE: None}
+            for server_id, status in self.statuses.items()]}
+        return response
+
+
+class NotifyingNovaSession(FakeNovaSession):
+    """Fake nova-api notifying the actions, except reset-state, instead of updating the status.
+
+    The actions given a result are not notified either, as when a compute
+    resumes a server instead of stopping it.
+    """
+
+    def __init__(self, statuses: dict, events: queue.Queue):
+        super(NotifyingNovaSession, self).__init__(statuses)
+        self.events = events
+
+    def post(self, url, json=None):
+        server_id = url.split("/")[-2]
+        action = next(iter(json))
+        if action == "os-resetState" or (server_id, action) in self.results:
+            return super(NotifyingNovaSession, self).post(url, json=json)
+        self.posts.append((server_id, action))
+        status = next(step[2] for step in vm_recovery.STEPS if step[0] == action)
+        self.events.put((server_id, status))
+
+
+@mock.patch('k8sapp_openstack.helpers.vm_recovery.time.sleep')
+class TestServerRecovery(unittest.TestCase):
+    """Tests the batched VM recovery state machine."""
+
+    def _recover(self, session, timeout=app_constants.NOVA_SERVER_STATUS_TIMEOUT, **kwargs):
+        recovery = vm_recovery.ServerRecovery(session, NOVA_URL, max_workers=2,
+                                              timeout=timeout, **kwargs)
+        for server_id, status in session.statuses.items():
+            recovery.add({"id": server_id, "status": status, vm_recovery.HOST: "compute-0"})
+        return recovery.run()
+
+    def test_recover_servers(self, _):
+        """Test the servers go through all the steps, polled once per interval."""
+        session = FakeNovaSession({"vm-1": app_constants.NOVA_SERVER_ERROR,
+                                   "vm-2": app_constants.NOVA_SERVER_ERROR})
+
+        self.assertEqual(self._recover(session), {"vm-1": True, "vm-2": True})
+        self.assertEqual([action for server_id, action in session.posts if server_id == "vm-1"],
+                         [step[0] for step in vm_recovery.STEPS])
+        self.assertEqual(len(session.posts), 8)
+        self.assertEqual(len(session.gets), len(vm_recovery.STEPS))
+        self.assertIn("changes-since=", session.gets[0])
+
+    def test_recover_servers_post_fails(self, _):
+        """Test a server fails when an action is refused, without blocking the others."""
+        session = FakeNovaSession(
+            {"vm-1": app_constants.NOVA_SERVER_ERROR, "vm-2": app_constants.NOVA_SERVER_ERROR},
+            results={("vm-1", "os-resetState"): Exception("connection refused")})
+
+        self.assertEqual(self._recover(session), {"vm-1": False, "vm-2": True})
+        self.assertEqual([action for server_id, action in session.posts if server_id == "vm-1"],
+                         ["os-resetState"] * app_constants.NOVA_RECOVERY_MAX_ATTEMPTS)
+
+    def test_recover_servers_timeout_waiting_status(self, _):
+        """Test a server fails when it never reaches the expected status."""
+        session = FakeNovaSession(
+            {"vm-1": app_constants.NOVA_SERVER_ERROR},
+            results={("vm-1", "os-resetState"): app_constants.NOVA_SERVER_ERROR})
+
+        self.assertEqual(self._recover(session, timeout=0), {"vm-1": False})
+        self.assertEqual(len(session.posts), 1)
+
+    def test_recover_servers_auto_resumed(self, _):
+        """Test a server resumed by its compute while being stopped is recovered."""
+        session = FakeNovaSession(
+            {"vm-1": app_constants.NOVA_SERVER_ERROR},
+            results={("vm-1", "os-stop"): app_constants.NOVA_SERVER_ACTIVE})
+
+        self.assertEqual(self._recover(session), {"vm-1": True})
+        self.assertEqual(session.posts, [("vm-1", "os-resetState"), ("vm-1", "os-stop")])
+
+    def test_observe_before_action_accepted(self, _):
+        """Test a status read before the action was accepted does not advance the server."""
+        recovery = vm_recovery.ServerRecovery(mock.MagicMock(), NOVA_URL)
+        recovery.add({"id": "vm-1", "status": app_constants.NOVA_SERVER_ERROR})
+        recovery.servers["vm-1"]["accepted_at"] = 10
+
+        recovery.observe("vm-1", app_constants.NOVA_SERVER_ACTIVE, observed_at=5)
+        self.assertEqual(recovery.servers["vm-1"]["step"], 0)
+        recovery.observe("vm-1", app_constants.NOVA_SERVER_ACTIVE, observed_at=15)
+        self.assertEqual(recovery.servers["vm-1"]["step"], 1)
+
+    def test_poll_follows_pages(self, _):
+        """Test the status poll reads all the pages of changed servers."""
+        session = mock.MagicMock()
+        session.get.return_value.json.side_effect = [
+            {"servers": [{"id": "vm-1", "status": app_constants.NOVA_SERVER_ACTIVE}],
+             "servers_links": [{"rel": "next", "href": f"{NOVA_URL}/servers/detail?marker=vm-1"}]},
+            {"servers": [{"id": "vm-2", "status": app_constants.NOVA_SERVER_SHUTOFF}]},
+        ]
+        recovery = vm_recovery.ServerRecovery(session, NOVA_URL)
+        recovery.add({"id": "vm-1"})
+        recovery.add({"id": "vm-2"})
+
+        recovery.poll()
+
+        self.assertEqual(session.get.call_args_list[1], mock.call(
+            f"{NOVA_URL}/servers/detail?marker=vm-1"))
+        self.assertEqual(recovery.servers["vm-2"]["status"], app_constants.NOVA_SERVER_SHUTOFF)
+
+    def test_recover_servers_per_host(self, _):
+        """Test a server is only started once a slot of its compute host is free."""
+        session = FakeNovaSession({"vm-1": app_constants.NOVA_SERVER_ERROR,
+                                   "vm-2": app_constants.NOVA_SERVER_ERROR})
+
+        self.assertEqual(self._recover(session, max_per_host=1), {"vm-1": True, "vm-2": True})
+        self.assertEqual([server_id for server_id, _ in session.posts],
+                         ["vm-1"] * len(vm_recovery.STEPS) + ["vm-2"] * len(vm_recovery.STEPS))
+
+    def test_recover_servers_per_backend(self, _):
+        """Test the servers of a storage backend are capped across compute hosts."""
+        recovery = vm_recovery.ServerRecovery(mock.MagicMock(), NOVA_URL, max_per_backend=1)
+        recovery.add({"id": "vm-1", "image": "", vm_recovery.HOST: "compute-0"})
+        recovery.add({"id": "vm-2", "image": "", vm_recovery.HOST: "compute-1"})
+        recovery.add({"id": "vm-3", "image": {"id": "cirros"}, vm_recovery.HOST: "compute-1"})
+
+        self.assertEqual(recovery._startable({}), ["vm-1", "vm-3"])
+
+    def test_recover_servers_per_volume_backend(self, _):
+        """Test the servers booted from volume are capped per Cinder backend."""
+        volumes = {"vol-1": {"backend": "ceph-store", "bootable": True},
+                   "vol-2": {"backend": "ceph-store", "bootable": True},
+                   "vol-3": {"backend": "netapp", "bootable": True}}
+        recovery = vm_recovery.ServerRecovery(mock.MagicMock(), NOVA_URL, max_per_backend=1,
+                                              volumes=volumes)
+        for server_id, volume_id in (("vm-1", "vol-1"), ("vm-2", "vol-2"), ("vm-3", "vol-3")):
+            recovery.add({"id": server_id, "image": "", vm_recovery.HOST: server_id,
+                          vm_recovery.VOLUMES_ATTACHED: [{"id": volume_id}]})
+
+        self.assertEqual(recovery._startable({}), ["vm-1", "vm-3"])
+
+    def test_recover_servers_without_host(self, _):
+        """Test the servers without a compute host are not capped per host."""
+        recovery = vm_recovery.ServerRecovery(mock.MagicMock(), NOVA_URL, max_workers=4,
+                                              max_per_host=1)
+        for server_id in ("vm-1", "vm-2", "vm-3"):
+            recovery.add({"id": server_id, "image": {"id": "cirros"}})
+        recovery.add({"id": "vm-4"}, resume={"step": 1, "attempts": 1})
+
+        self.assertEqual(recovery._startable({}), ["vm-1", "vm-2", "vm-3", "vm-4"])
+
+    def test_record_latency(self, _):
+        """Test the recovery slows down while nova-api is slow, and speeds up after."""
+        recovery = vm_recovery.ServerRecovery(mock.MagicMock(), NOVA_URL, max_workers=4,
+                                              interval=5)
+
+        recovery._record_latency(app_constants.NOVA_API_SLOW_LATENCY * 4)
+        self.assertEqual((recovery._concurrency, recovery._interval), (2, 10))
+        recovery._record_latency(app_constants.NOVA_API_SLOW_LATENCY * 4)
+        self.assertEqual((recovery._concurrency, recovery._interval), (1, 20))
+        for _ in range(20):
+            recovery._record_latency(0)
+        self.assertEqual((recovery._concurrency, recovery._interval), (4, 5))
+
+    def test_recover_servers_journal(self, _):
+        """Test the progress of the servers is journaled, and the journal dropped at the end."""
+        session = FakeNovaSession({"vm-1": app_constants.NOVA_SERVER_ERROR})
+        journal = mock.MagicMock()
+
+        self.assertEqual(self._recover(session, journal=journal), {"vm-1": True})
+        steps = [call.args[0]["vm-1"] and call.args[0]["vm-1"]["step"]
+                 for call in journal.update.call_args_list]
+        self.assertEqual(steps, [1, 2, 3, None])
+        journal.clear.assert_called_once()
+
+    def test_resume_server(self, _):
+        """Test a journaled server resumes from its step, polling the changes since the entry."""
+        session = FakeNovaSession({"vm-1": app_constants.NOVA_SERVER_SHELVED_OFFLOADED})
+        recovery = vm_recovery.ServerRecovery(session, NOVA_URL)
+        recovery.add({"id": "vm-1"}, resume={"step": 2, "attempts": 1, "accepted": True,
+                                             "host": "compute-0", "updated_at": 1000})
+
+        self.assertEqual(recovery.run(), {"vm-1": True})
+        self.assertEqual(session.posts, [("vm-1", "unshelve")])
+        self.assertIn("changes-since=1970-01-01T00:16:10Z", session.gets[0])
+
+    def test_recover_servers_notified(self, _):
+        """Test the notified servers go through all the steps without waiting for a status poll."""
+        events = queue.Queue()
+        session = NotifyingNovaSession({"vm-1": app_constants.NOVA_SERVER_ERROR,
+                                        "vm-2": app_constants.NOVA_SERVER_ERROR}, events)
+        recovery = vm_recovery.ServerRecovery(
+            session, NOVA_URL, interval=app_constants.NOVA_RECOVERY_FALLBACK_POLL_INTERVAL,
+            events=events)
+        recovery.add({"id": "vm-1", "status": app_constants.NOVA_SERVER_ERROR})
+        recovery.add({"id": "vm-2", "status": app_constants.NOVA_SERVER_ERROR})
+
+        started = time.monotonic()
+        self.assertEqual(recovery.run(), {"vm-1": True, "vm-2": True})
+        self.assertLess(time.monotonic() - started, app_constants.NOVA_RECOVERY_FALLBACK_POLL_INTERVAL)
+        self.assertEqual([action for server_id, action in session.posts if server_id == "vm-1"],
+                         [step[0] for step in vm_recovery.STEPS])
+        # The reset-state step is done once accepted, and the others notified
+        self.assertEqual(session.gets, [])
+
+    @mock.patch.object(app_constants, 'NOVA_SERVER_STATUS_INTERVAL', 0.05)
+    def test_recover_servers_notified_auto_resumed(self, _):
+        """Test a server resumed while being stopped is polled at the regular interval."""
+        events = queue.Queue()
+        session = NotifyingNovaSession({"vm-1": app_constants.NOVA_SERVER_ERROR}, events)
+        session.results[("vm-1", "os-stop")] = app_constants.NOVA_SERVER_ACTIVE
+        recovery = vm_recovery.ServerRecovery(
+            session, NOVA_URL, interval=app_constants.NOVA_RECOVERY_FALLBACK_POLL_INTERVAL,
+            events=events)
+        recovery.add({"id": "vm-1", "status": app_constants.NOVA_SERVER_ERROR})
+
+        started = time.monotonic()
+        self.assertEqual(recovery.run(), {"vm-1": True})
+        self.assertLess(time.monotonic() - started, app_constants.NOVA_RECOVERY_FALLBACK_POLL_INTERVAL)
+        self.assertEqual(session.posts, [("vm-1", "os-resetState"), ("vm-1", "os-stop")])
+        self.assertEqual(len(session.gets), 1)
+
+    def test_notify_other_step(self, _):
+        """Test the notification of another step than the current one is ignored."""
+        recovery = vm_recovery.ServerRecovery(mock.MagicMock(), NOVA_URL)
+        recovery.add({"id": "vm-1"}, resume={"step": 1, "attempts": 1, "accepted": True})
+
+        recovery.notify("vm-1", app_constants.NOVA_SERVER_ACTIVE)
+        self.assertEqual(recovery.servers["vm-1"]["step"], 1)
+        self.assertIsNone(recovery.servers["vm-1"]["result"])
+        recovery.notify("vm-1", app_constants.NOVA_SERVER_SHUTOFF)
+        self.assertEqual(recovery.servers["vm-1"]["step"], 2)
+
+
+class TestStorageBackend(unittest.TestCase):
+
+    def test_get_volume_backends(self):
+        """Test the backend of the volumes is the one of their Cinder host, across pages."""
+        session = mock.MagicMock()
+        session.get.return_value.json.side_effect = [
+            {"volumes": [{"id": "vol-1", vm_recovery.VOLUME_HOST: "controller@ceph-store#ceph-store",
+                          "bootable": "true"},
+                         {"id": "vol-2", vm_recovery.VOLUME_HOST: None, "bootable": "false"}],
+             "volumes_links": [{"rel": "next", "href": "next-page"}]},
+            {"volumes": [{"id": "vol-3", vm_recovery.VOLUME_HOST: "controller@netapp#pool-1",
+                          "bootable": "false"}]},
+        ]
+
+        self.assertEqual(vm_recovery.get_volume_backends(session, "cinder"),
+                         {"vol-1": {"backend": "ceph-store", "bootable": True},
+                          "vol-3": {"backend": "netapp", "bootable": False}})
+        self.assertEqual([call.args[0] for call in session.get.call_args_list],
+                         ["cinder/volumes/detail?all_tenants=1", "next-page"])
+
+    def test_get_server_backend(self):
+        """Test the backend of a server booted from volume is the one of its root volume."""
+        volumes = {"vol-1": {"backend": "netapp", "bootable": False},
+                   "vol-2": {"backend": "ceph-store", "bootable": True}}
+        server = {"id": "vm-1", "image": "",
+                  vm_recovery.VOLUMES_ATTACHED: [{"id": "vol-1"}, {"id": "vol-2"}]}
+
+        self.assertEqual(vm_recovery.get_server_backend(server, volumes), "volume:ceph-store")
+        self.assertEqual(vm_recovery.get_server_backend(server), "volume")
+        self.assertEqual(vm_recovery.get_server_backend(server, {}), "volume")
+        self.assertEqual(vm_recovery.get_server_backend({"id": "vm-2", "image": {"id": "cirros"}},
+                                                        volumes), "ephemeral")
+
+
+class TestNotificationListener(unittest.TestCase):
+    """Tests the listener of the nova notifications."""
+
+    def test_info(self):
+        """Test the notifications of the recovery actions are queued, in both formats."""
+        listener = vm_recovery.NotificationListener("rabbit://")
+
+        listener.info({}, "compute.compute-0", "compute.instance.power_off.end",
+                      {"instance_id": "vm-1", "state": "stopped"}, {})
+        listener.info({}, "nova-compute:compute-0", "instance.unshelve.end",
+                      {"nova_object.data": {"uuid": "vm-2"}}, {})
+        listener.info({}, "nova-compute:compute-0", "instance.update",
+                      {"nova_object.data": {"uuid": "vm-3"}}, {})
+
+        self.assertEqual([listener.events.get_nowait() for _ in range(listener.events.qsize())],
+                         [("vm-1", app_constants.NOVA_SERVER_SHUTOFF),
+                          ("vm-2", app_constants.NOVA_SERVER_ACTIVE)])
+
+    @mock.patch("oslo_config.cfg.ConfigOpts")
+    def test_start(self, mock_config_opts):
+        """Test the listener joins a pool of its own on the nova notification topics,
+        on the exchange of nova, leaving the exchange declaration alone.
+        """
+        oslo_messaging = mock.MagicMock()
+        listener = vm_recovery.NotificationListener("rabbit://nova")
+
+        with mock.patch.dict(sys.modules, {"oslo_messaging": oslo_messaging}):
+            self.assertTrue(listener.start())
+            listener.stop()
+
+        conf = mock_config_opts.return_value
+        oslo_messaging.get_notification_transport.assert_called_once_with(
+            conf, url="rabbit://nova")
+        conf.set_override.assert_not_called()
+        self.assertEqual(oslo_messaging.Target.call_args_list,
+                         [mock.call(exchange=app_constants.NOVA_NOTIFICATION_EXCHANGE, topic=topic)
+                          for topic in app_constants.NOVA_NOTIFICATION_TOPICS])
+        oslo_messaging.get_notification_listener.assert_called_once_with(
+            oslo_messaging.get_notification_transport.return_value,
+            [oslo_messaging.Target.return_value] * len(app_constants.NOVA_NOTIFICATION_TOPICS),
+            [listener], executor="threading", pool=app_constants.NOVA_RECOVERY_NOTIFICATION_POOL)
+        oslo_messaging.get_notification_listener.return_value.stop.assert_called_once()
+
+    def test_start_unavailable(self):
+        """Test the recovery falls back to polling without oslo.messaging."""
+        listener = vm_recovery.NotificationListener("rabbit://nova")
+
+        with mock.patch.dict(sys.modules, {"oslo_messaging": None}):
+            self.assertFalse(listener.start())